@@ -1,17 +1,16 @@
 import streamlit as st 
-import pandas as pd
-import numpy as np
 from datetime import datetime
-from utils.utils import convertir_tea_a_periodica, formato_moneda, mostrar_ayuda
-from ui.forms.inversiones import show_inversiones
-from ui.forms.bonos import show_bonos
+from utils.utils import formato_moneda, mostrar_ayuda
 from ui.components.sidebar import show_sidebar
 from ui.components.footer import show_footer
-import resend, os
+from utils.precalentamiento import iniciar_precalentamiento, precalentamiento_activado, informar_consola
 from dotenv import load_dotenv
 
 load_dotenv()
-resend.api_key = os.getenv('EMAIL_API_KEY')
+
+# Precalentamiento opcional (PRECALENTAR=1): librerías pesadas y escenarios por defecto en un hilo de fondo
+if precalentamiento_activado():
+    iniciar_precalentamiento(informar_consola)
 
 # --- CONFIGURACIÓN DE LA PÁGINA ---
 st.set_page_config(
@@ -198,9 +197,15 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # --- MÓDULOS ---
+# Cada formulario se importa solo al abrir su módulo; Python lo conserva para los siguientes reruns
 if modulo == "📈 Inversiones":
+    from ui.forms.inversiones import show_inversiones
     show_inversiones(nombre)
+elif modulo == "💼 Cartera de Bonos":
+    from ui.forms.cartera_bonos import show_cartera_bonos
+    show_cartera_bonos(nombre)
 else:
+    from ui.forms.bonos import show_bonos
     st.markdown("""
     """, unsafe_allow_html=True)
     show_bonos(nombre)
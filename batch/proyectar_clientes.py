@@ -0,0 +1,127 @@
+"""Proyección de inversiones por lotes para toda la base de clientes, sin Streamlit.
+
+Uso (desde la raíz del proyecto):
+
+    python -m batch.proyectar_clientes clientes.csv resultados.parquet --tamano-bloque 50000
+
+El archivo de entrada (CSV o Parquet) se lee por bloques y cada bloque se evalúa en forma
+vectorizada; los resultados se escriben de inmediato en el archivo de salida (CSV o Parquet),
+por lo que la memoria usada no depende del número total de filas.
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from core.proyeccion import PERIODOS_POR_ANIO, evaluar_escenarios
+
+COLUMNAS_ENTRADA = ['edad', 'monto_inicial', 'aporte', 'frecuencia', 'tea', 'plazo', 'impuesto']
+COLUMNAS_RESULTADO = ['saldo_final', 'costos_totales', 'ganancia_total', 'monto_impuesto', 'cobro_total']
+# Columnas que se leen siempre como float64: si el primer bloque solo trae enteros, pandas las
+# inferiría como int64 y el esquema Parquet fijado con ese bloque rechazaría decimales posteriores
+COLUMNAS_DECIMALES = ['monto_inicial', 'aporte', 'tea', 'impuesto', 'tea_retiro']
+
+
+def leer_bloques(ruta, tamano_bloque):
+    """Itera el archivo de entrada en DataFrames de a lo más `tamano_bloque` filas, con tipos fijos"""
+    if ruta.lower().endswith('.parquet'):
+        bloques = (lote.to_pandas() for lote in pq.ParquetFile(ruta).iter_batches(batch_size=tamano_bloque))
+    else:
+        bloques = pd.read_csv(ruta, chunksize=tamano_bloque)
+
+    for bloque in bloques:
+        yield bloque.astype({c: 'float64' for c in COLUMNAS_DECIMALES if c in bloque.columns})
+
+
+def evaluar_bloque(bloque):
+    """Evalúa un bloque de clientes: una llamada vectorizada por cada frecuencia presente en el bloque.
+
+    `impuesto` se expresa siempre como fracción entre 0 y 1 (0.05 = 5%). Las filas con una
+    frecuencia desconocida o un impuesto fuera de ese rango no se evalúan: quedan sin resultados y
+    con el motivo en la columna `error`. Si existe la columna opcional `tea_retiro`, se agrega la
+    pensión mensual estimada.
+    """
+    faltantes = [c for c in COLUMNAS_ENTRADA if c not in bloque.columns]
+    if faltantes:
+        raise ValueError(f"Faltan columnas en el archivo de entrada: {', '.join(faltantes)}")
+
+    impuesto = bloque['impuesto'].to_numpy(dtype=float)
+    frecuencias = bloque['frecuencia'].to_numpy()
+    error = np.full(len(bloque), '', dtype=object)
+    error[~((impuesto >= 0) & (impuesto <= 1))] = 'impuesto fuera de [0, 1] (debe ser fracción)'
+    error[~np.isin(frecuencias, list(PERIODOS_POR_ANIO))] = 'frecuencia desconocida'
+
+    con_pension = 'tea_retiro' in bloque.columns
+    columnas = COLUMNAS_RESULTADO + (['pension_mensual'] if con_pension else [])
+    resultados = {columna: np.full(len(bloque), np.nan) for columna in columnas}
+
+    for frecuencia in PERIODOS_POR_ANIO:
+        filas = (frecuencias == frecuencia) & (error == '')
+        if not filas.any():
+            continue
+        edad = bloque['edad'].to_numpy()[filas]
+        escenarios = evaluar_escenarios(
+            bloque['monto_inicial'].to_numpy(dtype=float)[filas],
+            bloque['aporte'].to_numpy(dtype=float)[filas],
+            bloque['tea'].to_numpy(dtype=float)[filas],
+            frecuencia, edad, edad + bloque['plazo'].to_numpy()[filas], impuesto[filas],
+            bloque['tea_retiro'].to_numpy(dtype=float)[filas] if con_pension else None
+        )
+        escenarios['monto_impuesto'] = escenarios.pop('impuesto')
+        for columna in columnas:
+            resultados[columna][filas] = escenarios[columna]
+
+    return bloque.assign(**resultados, error=error)
+
+
+def proyectar_archivo(entrada, salida, tamano_bloque=50_000, informar=None):
+    """Procesa el archivo de entrada bloque a bloque y devuelve (filas, filas rechazadas, segundos)"""
+    inicio = time.perf_counter()
+    filas = rechazadas = 0
+    escritor = None
+    es_parquet = salida.lower().endswith('.parquet')
+
+    try:
+        for numero, bloque in enumerate(leer_bloques(entrada, tamano_bloque)):
+            resultado = evaluar_bloque(bloque)
+            if es_parquet:
+                tabla = pa.Table.from_pandas(resultado, preserve_index=False)
+                if escritor is None:
+                    escritor = pq.ParquetWriter(salida, tabla.schema)
+                escritor.write_table(tabla.cast(escritor.schema))
+            else:
+                resultado.to_csv(salida, mode='w' if numero == 0 else 'a', header=numero == 0, index=False)
+
+            filas += len(resultado)
+            rechazadas += int((resultado['error'] != '').sum())
+            if informar is not None:
+                transcurrido = time.perf_counter() - inicio
+                informar(f"Bloque {numero + 1}: {filas:,} filas, {rechazadas:,} rechazadas ({filas / transcurrido:,.0f} filas/s)")
+    finally:
+        if escritor is not None:
+            escritor.close()
+
+    return filas, rechazadas, time.perf_counter() - inicio
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Proyección de inversiones por lotes sobre un archivo de clientes")
+    parser.add_argument('entrada', help="Archivo CSV o Parquet con las columnas " + ", ".join(COLUMNAS_ENTRADA))
+    parser.add_argument('salida', help="Archivo de resultados (.csv o .parquet)")
+    parser.add_argument('--tamano-bloque', type=int, default=50_000, help="Filas por bloque (por defecto 50000)")
+    parser.add_argument('--silencioso', action='store_true', help="No mostrar el avance por bloque")
+    args = parser.parse_args(argumentos)
+
+    informar = None if args.silencioso else (lambda mensaje: print(mensaje, file=sys.stderr))
+    filas, rechazadas, segundos = proyectar_archivo(args.entrada, args.salida, args.tamano_bloque, informar)
+    print(f"✅ {filas:,} filas procesadas en {segundos:.2f} s ({filas / max(segundos, 1e-9):,.0f} filas/s) -> {args.salida}")
+    if rechazadas:
+        print(f"⚠️ {rechazadas:,} filas rechazadas (ver la columna error del archivo de salida)", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
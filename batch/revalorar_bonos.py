@@ -0,0 +1,188 @@
+"""Revaloración por lotes de un archivo de bonos bajo uno o más escenarios de tasas, sin Streamlit.
+
+Uso (desde la raíz del proyecto):
+
+    python -m batch.revalorar_bonos posiciones.parquet revaloracion.parquet --escenarios-pb -100 0 100 --procesos 4
+
+El archivo se divide en fragmentos que se valoran en paralelo en un pool de procesos. Cada fragmento
+terminado se guarda en una carpeta de trabajo; si el proceso se interrumpe, al volver a ejecutarlo
+con los mismos parámetros solo se valoran los fragmentos pendientes. Al final los fragmentos se
+unen en el orden original del archivo.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from core.cartera_bonos import COLUMNAS_CARTERA, validar_cartera, valorar_cartera
+from core.valoracion_bonos import periodos_por_anio, precio_bono
+
+
+def leer_posiciones(ruta):
+    """Lee el archivo de posiciones (CSV o Parquet)"""
+    if ruta.lower().endswith('.parquet'):
+        return pd.read_parquet(ruta)
+    return pd.read_csv(ruta)
+
+
+def valorar_fragmento(posiciones, escenarios_pb):
+    """Valora un fragmento: métricas base en una pasada vectorizada y el precio en cada escenario
+    como una matriz (bonos x escenarios) con la fórmula cerrada del bono"""
+    valor_nominal = posiciones['valor_nominal'].to_numpy(dtype=float)
+    tasa_cupon = posiciones['tasa_cupon'].to_numpy(dtype=float)
+    frecuencia = posiciones['frecuencia'].to_numpy()
+    plazo = posiciones['plazo'].to_numpy()
+    tea = posiciones['tea'].to_numpy(dtype=float)
+    cantidad = posiciones['cantidad'].to_numpy(dtype=float) if 'cantidad' in posiciones.columns else None
+
+    bonos = valorar_cartera(valor_nominal, tasa_cupon, frecuencia, plazo, tea, cantidad)['bonos']
+    resultado = posiciones.assign(
+        precio=bonos['precio'],
+        valor_posicion=bonos['valor_posicion'],
+        duracion_macaulay=bonos['duracion_macaulay'],
+        duracion_modificada=bonos['duracion_modificada'],
+        convexidad=bonos['convexidad'],
+        dv01=bonos['dv01']
+    )
+
+    num_periodos = periodos_por_anio(frecuencia)
+    cupon = valor_nominal * ((1 + tasa_cupon / 100) ** (1 / num_periodos) - 1)
+    tea_escenarios = tea[:, None] + np.asarray(escenarios_pb, dtype=float)[None, :] / 100
+    precios = precio_bono(valor_nominal[:, None], cupon[:, None], (plazo * num_periodos)[:, None],
+                          (1 + tea_escenarios / 100) ** (1 / num_periodos[:, None]) - 1)
+
+    return resultado.assign(**{f"precio_{pb:+g}pb": precios[:, i] for i, pb in enumerate(escenarios_pb)})
+
+
+def _procesar_fragmento(ruta_fragmento, posiciones, escenarios_pb):
+    """Valora un fragmento y lo guarda de forma atómica (archivo temporal + renombrado)"""
+    resultado = valorar_fragmento(posiciones, escenarios_pb)
+    temporal = ruta_fragmento + '.tmp'
+    resultado.to_parquet(temporal, index=False)
+    os.replace(temporal, ruta_fragmento)
+    return ruta_fragmento, len(resultado)
+
+
+def _preparar_carpeta(carpeta, manifiesto, reiniciar):
+    """Crea la carpeta de fragmentos o verifica que los fragmentos existentes correspondan a esta ejecución"""
+    ruta_manifiesto = os.path.join(carpeta, 'manifiesto.json')
+    if reiniciar and os.path.isdir(carpeta):
+        shutil.rmtree(carpeta)
+
+    if os.path.exists(ruta_manifiesto):
+        with open(ruta_manifiesto, encoding='utf-8') as archivo:
+            if json.load(archivo) != manifiesto:
+                raise SystemExit(f"❌ La carpeta {carpeta} corresponde a otra ejecución; usa --reiniciar para descartarla")
+    else:
+        os.makedirs(carpeta, exist_ok=True)
+        with open(ruta_manifiesto, 'w', encoding='utf-8') as archivo:
+            json.dump(manifiesto, archivo)
+
+
+def unir_fragmentos(rutas, salida):
+    """Une los fragmentos en orden en el archivo de salida (CSV o Parquet) sin cargarlos todos a la vez"""
+    if salida.lower().endswith('.parquet'):
+        escritor = None
+        try:
+            for ruta in rutas:
+                tabla = pq.read_table(ruta)
+                if escritor is None:
+                    escritor = pq.ParquetWriter(salida, tabla.schema)
+                escritor.write_table(tabla.cast(escritor.schema))
+        finally:
+            if escritor is not None:
+                escritor.close()
+    else:
+        for numero, ruta in enumerate(rutas):
+            pd.read_parquet(ruta).to_csv(salida, mode='w' if numero == 0 else 'a', header=numero == 0, index=False)
+
+
+def revalorar_archivo(entrada, salida, escenarios_pb=(0.0,), tamano_fragmento=20_000, procesos=None,
+                      carpeta=None, reiniciar=False, conservar_fragmentos=False, informar=None):
+    """Revalora el archivo por fragmentos en paralelo, retomando los ya terminados. Devuelve (filas, segundos)"""
+    inicio = time.perf_counter()
+    posiciones = leer_posiciones(entrada)
+    faltantes = [c for c in COLUMNAS_CARTERA if c not in posiciones.columns]
+    if faltantes:
+        raise SystemExit(f"❌ Faltan columnas en el archivo: {', '.join(faltantes)}")
+    if posiciones.empty:
+        raise SystemExit("❌ El archivo no tiene posiciones")
+    try:
+        validar_cartera(posiciones['frecuencia'].to_numpy(), posiciones['plazo'].to_numpy())
+    except ValueError as e:
+        raise SystemExit(f"❌ Archivo no válido: {e}")
+
+    carpeta = carpeta or salida + '.fragmentos'
+    estado = os.stat(entrada)
+    _preparar_carpeta(carpeta, {
+        'entrada': os.path.abspath(entrada), 'tamano': estado.st_size, 'modificado': estado.st_mtime,
+        'tamano_fragmento': tamano_fragmento, 'escenarios_pb': list(map(float, escenarios_pb))
+    }, reiniciar)
+
+    num_fragmentos = -(-len(posiciones) // tamano_fragmento)
+    rutas = [os.path.join(carpeta, f"fragmento_{i:06d}.parquet") for i in range(num_fragmentos)]
+    pendientes = [i for i, ruta in enumerate(rutas) if not os.path.exists(ruta)]
+    if informar is not None and len(pendientes) < num_fragmentos:
+        informar(f"Retomando: {num_fragmentos - len(pendientes)} de {num_fragmentos} fragmentos ya terminados")
+
+    def fragmento(i):
+        return posiciones.iloc[i * tamano_fragmento:(i + 1) * tamano_fragmento]
+
+    filas_nuevas = 0
+    procesos = procesos or os.cpu_count() or 1
+    if procesos > 1 and len(pendientes) > 1:
+        with ProcessPoolExecutor(max_workers=procesos, mp_context=multiprocessing.get_context('spawn')) as pool:
+            futuros = [pool.submit(_procesar_fragmento, rutas[i], fragmento(i), escenarios_pb) for i in pendientes]
+            for futuro in as_completed(futuros):
+                _, filas = futuro.result()
+                filas_nuevas += filas
+                if informar is not None:
+                    informar(f"{filas_nuevas:,} filas valoradas ({filas_nuevas / (time.perf_counter() - inicio):,.0f} filas/s)")
+    else:
+        for i in pendientes:
+            _, filas = _procesar_fragmento(rutas[i], fragmento(i), escenarios_pb)
+            filas_nuevas += filas
+            if informar is not None:
+                informar(f"{filas_nuevas:,} filas valoradas ({filas_nuevas / (time.perf_counter() - inicio):,.0f} filas/s)")
+
+    unir_fragmentos(rutas, salida)
+    if not conservar_fragmentos:
+        shutil.rmtree(carpeta)
+
+    return len(posiciones), time.perf_counter() - inicio
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Revaloración por lotes de un archivo de bonos")
+    parser.add_argument('entrada', help="Archivo CSV o Parquet con las columnas " + ", ".join(COLUMNAS_CARTERA)
+                                        + " (y opcionalmente cantidad)")
+    parser.add_argument('salida', help="Archivo de resultados (.csv o .parquet)")
+    parser.add_argument('--escenarios-pb', type=float, nargs='+', default=[0.0],
+                        help="Desplazamientos paralelos de la TEA en puntos básicos (por defecto 0)")
+    parser.add_argument('--tamano-fragmento', type=int, default=20_000, help="Filas por fragmento (por defecto 20000)")
+    parser.add_argument('--procesos', type=int, default=None, help="Procesos del pool (por defecto, todos los núcleos)")
+    parser.add_argument('--carpeta-fragmentos', default=None,
+                        help="Carpeta de trabajo para retomar (por defecto <salida>.fragmentos)")
+    parser.add_argument('--reiniciar', action='store_true', help="Descartar fragmentos de una ejecución anterior")
+    parser.add_argument('--conservar-fragmentos', action='store_true', help="No borrar los fragmentos al terminar")
+    parser.add_argument('--silencioso', action='store_true', help="No mostrar el avance")
+    args = parser.parse_args(argumentos)
+
+    informar = None if args.silencioso else (lambda mensaje: print(mensaje, file=sys.stderr))
+    filas, segundos = revalorar_archivo(
+        args.entrada, args.salida, args.escenarios_pb, args.tamano_fragmento, args.procesos,
+        args.carpeta_fragmentos, args.reiniciar, args.conservar_fragmentos, informar
+    )
+    print(f"✅ {filas:,} posiciones revaloradas en {segundos:.2f} s ({filas / max(segundos, 1e-9):,.0f} filas/s) -> {args.salida}")
+
+
+if __name__ == '__main__':
+    main()
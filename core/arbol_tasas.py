@@ -0,0 +1,144 @@
+import numpy as np
+from core.rendimiento import resolver_raices
+from core.valoracion_bonos import flujos_bono
+
+MODELOS_ARBOL = ('ho_lee', 'bdt')
+
+
+def calibrar_arbol(descuentos, volatilidad, dt, modelo='ho_lee', tolerancia=1e-12, max_iter=50):
+    """Árbol binomial recombinante de tasas cortas calibrado a una estructura de factores de descuento.
+
+    `descuentos[i]` es el factor de descuento a (i + 1) * dt. Las tasas son de composición continua:
+    en Ho-Lee r(i, j) = theta_i + sigma * sqrt(dt) * (2j - i) con volatilidad absoluta, y en BDT
+    r(i, j) = u_i * exp(sigma * sqrt(dt) * (2j - i)) con volatilidad proporcional. La calibración
+    avanza con precios de Arrow-Debreu, un vector por paso de tiempo.
+    Devuelve una matriz (n, n) cuya fila i tiene válidos los nodos j = 0..i.
+    """
+    if modelo not in MODELOS_ARBOL:
+        raise ValueError(f"Modelo de árbol no válido: {modelo}")
+
+    descuentos = np.asarray(descuentos, dtype=float)
+    n = len(descuentos)
+    tasas = np.full((n, n), np.nan)
+    salto = volatilidad * np.sqrt(dt)
+
+    arrow_debreu = np.array([1.0])
+    tasa_previa = -np.log(descuentos[0]) / dt
+    for i in range(n):
+        x = salto * (2 * np.arange(i + 1) - i)
+
+        if modelo == 'ho_lee':
+            # El desplazamiento theta tiene solución cerrada con composición continua
+            theta = np.log((arrow_debreu @ np.exp(-x * dt)) / descuentos[i]) / dt
+            r = theta + x
+        else:
+            escala = np.exp(x)
+            u = tasa_previa
+            for _ in range(max_iter):
+                descuento_nodos = np.exp(-u * escala * dt)
+                error = arrow_debreu @ descuento_nodos - descuentos[i]
+                if abs(error) < tolerancia:
+                    break
+                u += error / (arrow_debreu @ (escala * dt * descuento_nodos))
+            tasa_previa = u
+            r = u * escala
+
+        tasas[i, :i + 1] = r
+        descontados = arrow_debreu * np.exp(-r * dt)
+        arrow_debreu = 0.5 * (np.append(descontados, 0.0) + np.insert(descontados, 0, 0.0))
+
+    return tasas
+
+
+def valorar_en_arbol(tasas, dt, flujos, spread=0.0, ejercicio=None, precio_ejercicio=None, tipo='call'):
+    """Valor de un bono con o sin opción por inducción hacia atrás en el árbol.
+
+    `flujos[k]` se paga en (k + 1) * dt. `ejercicio[i]` indica si la opción puede ejercerse en el
+    paso i (tras pagar el cupón) al `precio_ejercicio`: el emisor rescata si el valor supera ese
+    precio ('call') o el tenedor vende si queda por debajo ('put'). `spread` puede ser un arreglo
+    de spreads (composición continua): todos se valoran a la vez, uno por fila.
+    """
+    spread = np.atleast_1d(np.asarray(spread, dtype=float))[:, None]
+    n = tasas.shape[0]
+    valor = np.full((spread.shape[0], n + 1), float(flujos[-1]))
+
+    for i in range(n - 1, -1, -1):
+        descuento = np.exp(-(tasas[i, :i + 1] + spread) * dt)
+        valor = descuento * 0.5 * (valor[:, :-1] + valor[:, 1:])
+
+        if i > 0:
+            if ejercicio is not None and ejercicio[i]:
+                if tipo == 'call':
+                    valor = np.minimum(valor, precio_ejercicio)
+                else:
+                    valor = np.maximum(valor, precio_ejercicio)
+            valor = valor + flujos[i - 1]
+
+    return valor[:, 0]
+
+
+def calcular_oas(tasas, dt, flujos, precio_mercado, ejercicio=None, precio_ejercicio=None, tipo='call',
+                 tolerancia=1e-8, max_iter=50):
+    """Spread ajustado por opción (composición continua) que iguala el valor del árbol al precio de mercado.
+
+    Cada iteración de Newton valora el spread y un spread desplazado en la misma inducción hacia atrás.
+    """
+    escala = float(flujos[-1])
+    paso = 1e-6
+
+    def funcion(s):
+        valores = valorar_en_arbol(tasas, dt, flujos, np.concatenate([s, s + paso]),
+                                   ejercicio, precio_ejercicio, tipo)
+        valor, desplazado = valores[:len(s)], valores[len(s):]
+        return (valor - precio_mercado) / escala, (desplazado - valor) / (paso * escala)
+
+    oas, _ = resolver_raices(funcion, np.zeros(1), -0.2, 2.0, tolerancia, max_iter)
+    return oas[0]
+
+
+def valorar_bono_con_opcion(valor_nominal, cupon, num_periodos, total_periodos, tea, volatilidad,
+                            tipo='call', precio_ejercicio=None, anios_proteccion=0.0,
+                            precio_mercado=None, modelo='ho_lee', salto_pb=10.0):
+    """Valoración de un bono rescatable (call) o con opción de venta (put) sobre un árbol de tasas.
+
+    El árbol se calibra a la TEA plana del bono. Si se indica el precio de mercado, se calcula el
+    OAS y la duración y convexidad efectivas se obtienen reconstruyendo el árbol con la TEA
+    desplazada ±`salto_pb` puntos básicos y manteniendo el OAS constante.
+    """
+    dt = 1 / num_periodos
+    anios = np.arange(1, total_periodos + 1) * dt
+    flujos = flujos_bono(valor_nominal, cupon, total_periodos)
+
+    precio_ejercicio = valor_nominal if precio_ejercicio is None else precio_ejercicio
+    ejercicio = np.arange(total_periodos + 1) * dt >= anios_proteccion
+
+    def valorar(tea_escenario, spread):
+        tasas = calibrar_arbol((1 + tea_escenario / 100) ** -anios, volatilidad, dt, modelo)
+        return valorar_en_arbol(tasas, dt, flujos, spread, ejercicio, precio_ejercicio, tipo)[0]
+
+    tasas = calibrar_arbol((1 + tea / 100) ** -anios, volatilidad, dt, modelo)
+    precio_sin_opcion = valorar_en_arbol(tasas, dt, flujos)[0]
+    precio_modelo = valorar_en_arbol(tasas, dt, flujos, 0.0, ejercicio, precio_ejercicio, tipo)[0]
+
+    oas = np.nan
+    precio = precio_modelo
+    if precio_mercado is not None:
+        oas = calcular_oas(tasas, dt, flujos, precio_mercado, ejercicio, precio_ejercicio, tipo)
+        precio = valorar_en_arbol(tasas, dt, flujos, oas, ejercicio, precio_ejercicio, tipo)[0]
+
+    # Duración y convexidad efectivas con el OAS constante
+    spread = 0.0 if np.isnan(oas) else oas
+    salto = salto_pb / 100
+    precio_baja = valorar(tea - salto, spread)
+    precio_alza = valorar(tea + salto, spread)
+    variacion = salto / 100
+
+    return {
+        'precio': precio,
+        'precio_modelo': precio_modelo,
+        'precio_sin_opcion': precio_sin_opcion,
+        'valor_opcion': abs(precio_sin_opcion - precio_modelo),
+        'oas_pb': oas * 10000,
+        'duracion_efectiva': (precio_baja - precio_alza) / (2 * precio * variacion),
+        'convexidad_efectiva': (precio_baja + precio_alza - 2 * precio) / (precio * variacion ** 2)
+    }
@@ -0,0 +1,72 @@
+import os
+from functools import lru_cache
+
+import numpy as np
+from core.valoracion_bonos import PERIODOS_BONO, flujos_bono, metricas_riesgo
+
+RUTA_IPC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'ipc.csv')
+
+
+@lru_cache(maxsize=8)
+def _leer_ipc(ruta, modificado):
+    fechas = np.loadtxt(ruta, delimiter=',', skiprows=1, usecols=0, dtype='datetime64[M]', ndmin=1)
+    valores = np.loadtxt(ruta, delimiter=',', skiprows=1, usecols=1, ndmin=1)
+    fechas.setflags(write=False)
+    valores.setflags(write=False)
+    return fechas, valores
+
+
+def cargar_ipc(ruta=RUTA_IPC):
+    """Serie mensual del índice de precios (fechas, valores) leída una sola vez por proceso.
+
+    La caché vive en el proceso del servidor, así que se comparte entre reruns y sesiones; se
+    vuelve a leer solo si el archivo cambia.
+    """
+    return _leer_ipc(ruta, os.path.getmtime(ruta))
+
+
+def inflacion_anual(valores, meses=12):
+    """Inflación de los últimos `meses` meses expresada como tasa anual (%)"""
+    return ((valores[-1] / valores[-1 - meses]) ** (12 / meses) - 1) * 100
+
+
+def indice_proyectado(anios, ipc_actual, inflacion_esperada):
+    """Trayectoria proyectada del índice en cada plazo (años desde hoy) con inflación constante (%)"""
+    return ipc_actual * (1 + inflacion_esperada / 100) ** np.asarray(anios, dtype=float)
+
+
+def valorar_bono_indexado(valor_nominal, tasa_cupon_real, frecuencia, plazo, tea_real, inflacion_esperada,
+                          ipc_base, ipc_actual):
+    """Valoración de un bono indexado a inflación (VAC): principal y cupones escalados por el índice.
+
+    Los flujos reales se escalan por el cociente entre el índice proyectado a cada fecha de pago y el
+    índice base de emisión. Como la proyección crece a la misma inflación con la que se deflacta, el
+    valor presente equivale a descontar los flujos reales con la tasa real y escalarlos por el
+    cociente de indexación actual; todo se calcula como arreglos de una pasada.
+    """
+    num_periodos = PERIODOS_BONO[frecuencia]
+    total_periodos = int(plazo * num_periodos)
+    anios = np.arange(1, total_periodos + 1) / num_periodos
+
+    cupon_real = valor_nominal * ((1 + tasa_cupon_real / 100) ** (1 / num_periodos) - 1)
+    flujos_reales = flujos_bono(valor_nominal, cupon_real, total_periodos)
+
+    indice = indice_proyectado(anios, ipc_actual, inflacion_esperada)
+    factor_indexacion = indice / ipc_base
+    flujos_indexados = flujos_reales * factor_indexacion
+
+    descuento_real = (1 + tea_real / 100) ** -anios
+    valores_presentes = flujos_reales * (ipc_actual / ipc_base) * descuento_real
+    riesgo = metricas_riesgo(valores_presentes, anios, tea_real)
+
+    return {
+        'anios': anios,
+        'indice_proyectado': indice,
+        'factor_indexacion': factor_indexacion,
+        'flujos_reales': flujos_reales,
+        'flujos_indexados': flujos_indexados,
+        'valores_presentes': valores_presentes,
+        'factor_actual': ipc_actual / ipc_base,
+        'tea_nominal_equivalente': ((1 + tea_real / 100) * (1 + inflacion_esperada / 100) - 1) * 100,
+        **riesgo
+    }
@@ -0,0 +1,159 @@
+import numpy as np
+from core.valoracion_bonos import PERIODOS_BONO, periodos_por_anio
+from core.curva import PLAZOS_CLAVE, duraciones_clave
+
+COLUMNAS_CARTERA = ['valor_nominal', 'tasa_cupon', 'frecuencia', 'plazo', 'tea']
+
+# Todas las frecuencias de pago dividen al año en meses enteros
+MESES_POR_ANIO = 12
+
+
+def _filas(mascara, maximo=5):
+    """Primeras filas (base 1) marcadas en la máscara, para los mensajes de error"""
+    filas = np.flatnonzero(mascara)[:maximo] + 1
+    return ", ".join(map(str, filas)) + (" ..." if mascara.sum() > maximo else "")
+
+
+def validar_cartera(frecuencia, plazo):
+    """Verifica frecuencias y plazos de la cartera y devuelve el número total de períodos de cada bono.
+
+    Lanza ValueError si hay frecuencias desconocidas, plazos no positivos o plazos que no dan un
+    número entero de períodos (p. ej. 2.3 años con pagos semestrales).
+    """
+    frecuencia = np.atleast_1d(np.asarray(frecuencia))
+    plazo = np.atleast_1d(np.asarray(plazo, dtype=float))
+
+    desconocidas = ~np.isin(frecuencia, list(PERIODOS_BONO))
+    if desconocidas.any():
+        nombres = ", ".join(sorted({str(f) for f in frecuencia[desconocidas]}))
+        raise ValueError(f"Frecuencia desconocida ({nombres}) en las filas {_filas(desconocidas)}")
+
+    no_positivos = ~(plazo > 0)
+    if no_positivos.any():
+        raise ValueError(f"El plazo debe ser mayor que cero (filas {_filas(no_positivos)})")
+
+    periodos = plazo * periodos_por_anio(frecuencia)
+    no_enteros = np.abs(periodos - np.round(periodos)) > 1e-9
+    if no_enteros.any():
+        raise ValueError(f"El plazo no corresponde a un número entero de pagos con su frecuencia "
+                         f"(filas {_filas(no_enteros)})")
+
+    return np.round(periodos).astype(int)
+
+
+def expandir_flujos(valor_nominal, tasa_cupon, frecuencia, plazo):
+    """Genera los flujos de todos los bonos como arreglos planos (un elemento por flujo).
+
+    Devuelve un diccionario con el índice del bono, el período, el plazo en años, el mes del
+    calendario común y el flujo de cada pago, sin recorrer los bonos uno a uno.
+    """
+    total_periodos = validar_cartera(frecuencia, plazo)
+    valor_nominal = np.asarray(valor_nominal, dtype=float)
+    num_periodos = periodos_por_anio(frecuencia)
+    cupon = valor_nominal * ((1 + np.asarray(tasa_cupon, dtype=float) / 100) ** (1 / num_periodos) - 1)
+
+    indice = np.repeat(np.arange(len(total_periodos)), total_periodos)
+    inicio = np.repeat(np.cumsum(total_periodos) - total_periodos, total_periodos)
+    periodo = np.arange(len(indice)) - inicio + 1
+
+    flujo = cupon[indice]
+    vencimiento = periodo == total_periodos[indice]
+    flujo[vencimiento] += valor_nominal[indice[vencimiento]]
+
+    return {
+        'indice': indice,
+        'periodo': periodo,
+        'anios': periodo / num_periodos[indice],
+        'mes': periodo * (MESES_POR_ANIO // num_periodos[indice]),
+        'flujo': flujo
+    }
+
+
+def valorar_cartera(valor_nominal, tasa_cupon, frecuencia, plazo, tea, cantidad=None):
+    """Valora todos los bonos de una cartera en una sola pasada vectorizada.
+
+    Devuelve las métricas por bono, los totales de la cartera (VP, duración, convexidad, DV01
+    ponderados por valor presente) y el calendario agregado de flujos por mes.
+    """
+    flujos = expandir_flujos(valor_nominal, tasa_cupon, frecuencia, plazo)
+    indice, anios = flujos['indice'], flujos['anios']
+    num_bonos = len(np.atleast_1d(valor_nominal))
+    cantidad = np.ones(num_bonos) if cantidad is None else np.asarray(cantidad, dtype=float)
+
+    uno_mas_tea = 1 + np.asarray(tea, dtype=float) / 100
+    valores_presentes = flujos['flujo'] * uno_mas_tea[indice] ** -anios
+
+    # Sumas por bono sobre los arreglos planos
+    precio = np.bincount(indice, weights=valores_presentes, minlength=num_bonos)
+    macaulay = np.bincount(indice, weights=anios * valores_presentes, minlength=num_bonos) / precio
+    modificada = macaulay / uno_mas_tea
+    convexidad = np.bincount(indice, weights=anios * (anios + 1) * valores_presentes,
+                             minlength=num_bonos) / (precio * uno_mas_tea ** 2)
+    dv01 = modificada * precio * 0.0001
+
+    valor_posicion = cantidad * precio
+    valor_total = valor_posicion.sum()
+    pesos = valor_posicion / valor_total
+
+    # Calendario agregado: flujo y valor presente de toda la cartera por mes
+    peso_flujo = cantidad[indice]
+    flujo_mes = np.bincount(flujos['mes'], weights=flujos['flujo'] * peso_flujo)
+    vp_mes = np.bincount(flujos['mes'], weights=valores_presentes * peso_flujo)
+    meses = np.flatnonzero(flujo_mes)
+
+    return {
+        'bonos': {
+            'precio': precio,
+            'valor_posicion': valor_posicion,
+            'duracion_macaulay': macaulay,
+            'duracion_modificada': modificada,
+            'convexidad': convexidad,
+            'dv01': dv01
+        },
+        'cartera': {
+            'valor_presente': valor_total,
+            'valor_nominal': (cantidad * np.asarray(valor_nominal, dtype=float)).sum(),
+            'duracion_macaulay': (pesos * macaulay).sum(),
+            'duracion_modificada': (pesos * modificada).sum(),
+            'convexidad': (pesos * convexidad).sum(),
+            'dv01': (cantidad * dv01).sum()
+        },
+        'calendario': {
+            'mes': meses,
+            'anio': meses / MESES_POR_ANIO,
+            'flujo': flujo_mes[meses],
+            'valor_presente': vp_mes[meses]
+        }
+    }
+
+
+def duraciones_clave_cartera(curva, valor_nominal, tasa_cupon, frecuencia, plazo, cantidad=None,
+                             plazos_clave=PLAZOS_CLAVE):
+    """Duraciones clave por bono y de la cartera (ponderadas por valor) descontando con la curva"""
+    flujos = expandir_flujos(valor_nominal, tasa_cupon, frecuencia, plazo)
+    num_bonos = len(np.atleast_1d(valor_nominal))
+    cantidad = np.ones(num_bonos) if cantidad is None else np.asarray(cantidad, dtype=float)
+
+    resultado = duraciones_clave(curva, flujos['indice'], flujos['anios'], flujos['flujo'],
+                                 num_bonos, plazos_clave)
+    valor_posicion = cantidad * resultado['precio']
+
+    return {
+        'precio': resultado['precio'],
+        'duraciones': resultado['duraciones'],
+        'cartera': valor_posicion @ resultado['duraciones'] / valor_posicion.sum()
+    }
+
+
+def cartera_ejemplo(num_bonos=500, semilla=0):
+    """Cartera aleatoria reproducible para explorar el módulo sin cargar un archivo"""
+    rng = np.random.default_rng(semilla)
+    frecuencias = np.array(['Mensual', 'Trimestral', 'Semestral', 'Anual'])
+    return {
+        'valor_nominal': rng.choice([1000.0, 5000.0, 10000.0], num_bonos),
+        'tasa_cupon': np.round(rng.uniform(2, 12, num_bonos), 2),
+        'frecuencia': rng.choice(frecuencias, num_bonos),
+        'plazo': rng.integers(1, 31, num_bonos),
+        'tea': np.round(rng.uniform(3, 14, num_bonos), 2),
+        'cantidad': rng.integers(1, 50, num_bonos)
+    }
@@ -0,0 +1,201 @@
+import os
+from functools import lru_cache
+
+import numpy as np
+from core.valoracion_bonos import PERIODOS_BONO, flujos_bono
+
+RUTA_TABLA_TASAS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'curva_tasas.csv')
+
+METODOS_INTERPOLACION = ('lineal', 'cubica_monotona')
+
+PLAZOS_CLAVE = (1, 2, 5, 10, 20, 30)
+
+
+def _pendientes_monotonas(x, y):
+    """Pendientes de Fritsch-Carlson para un spline cúbico de Hermite que preserva la monotonía"""
+    h = np.diff(x)
+    delta = np.diff(y) / h
+    if len(x) == 2:
+        return np.array([delta[0], delta[0]])
+
+    d = np.zeros_like(y)
+    w1 = 2 * h[1:] + h[:-1]
+    w2 = h[1:] + 2 * h[:-1]
+    mismo_signo = delta[:-1] * delta[1:] > 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        media = (w1 + w2) / (w1 / delta[:-1] + w2 / delta[1:])
+    d[1:-1] = np.where(mismo_signo, media, 0.0)
+
+    def extremo(h0, h1, d0, d1):
+        pendiente = ((2 * h0 + h1) * d0 - h0 * d1) / (h0 + h1)
+        if np.sign(pendiente) != np.sign(d0):
+            return 0.0
+        if np.sign(d0) != np.sign(d1) and abs(pendiente) > abs(3 * d0):
+            return 3 * d0
+        return pendiente
+
+    d[0] = extremo(h[0], h[1], delta[0], delta[1])
+    d[-1] = extremo(h[-1], h[-2], delta[-1], delta[-2])
+    return d
+
+
+def interpolar(x, y, xq, metodo='lineal'):
+    """Interpola (lineal o cúbica monótona) con extrapolación plana fuera de los nodos"""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    xq = np.clip(np.asarray(xq, dtype=float), x[0], x[-1])
+
+    if metodo == 'lineal' or len(x) < 2:
+        return np.interp(xq, x, y)
+
+    d = _pendientes_monotonas(x, y)
+    i = np.clip(np.searchsorted(x, xq, side='right') - 1, 0, len(x) - 2)
+    h = x[i + 1] - x[i]
+    t = (xq - x[i]) / h
+    t2, t3 = t ** 2, t ** 3
+    return ((2 * t3 - 3 * t2 + 1) * y[i] + (t3 - 2 * t2 + t) * h * d[i]
+            + (-2 * t3 + 3 * t2) * y[i + 1] + (t3 - t2) * h * d[i + 1])
+
+
+class CurvaTasas:
+    """Curva cero inmutable definida por nodos (plazo en años, tasa cero TEA %).
+
+    Es hashable, por lo que sirve como llave de caché: los factores de descuento por frecuencia
+    se calculan una sola vez por curva y se reutilizan en cada valoración posterior.
+    """
+    __slots__ = ('plazos', 'tasas_cero', 'metodo', '_hash')
+
+    def __init__(self, plazos, tasas_cero, metodo='lineal'):
+        if metodo not in METODOS_INTERPOLACION:
+            raise ValueError(f"Método de interpolación no válido: {metodo}")
+        orden = np.argsort(plazos)
+        object.__setattr__(self, 'plazos', tuple(float(p) for p in np.asarray(plazos)[orden]))
+        object.__setattr__(self, 'tasas_cero', tuple(float(t) for t in np.asarray(tasas_cero)[orden]))
+        object.__setattr__(self, 'metodo', metodo)
+        object.__setattr__(self, '_hash', hash((self.plazos, self.tasas_cero, metodo)))
+
+    def __setattr__(self, nombre, valor):
+        raise AttributeError("CurvaTasas es inmutable")
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, otra):
+        return (isinstance(otra, CurvaTasas) and self.plazos == otra.plazos
+                and self.tasas_cero == otra.tasas_cero and self.metodo == otra.metodo)
+
+    def __repr__(self):
+        return f"CurvaTasas({len(self.plazos)} nodos, metodo='{self.metodo}')"
+
+    def con_metodo(self, metodo):
+        """Misma curva con otro método de interpolación"""
+        return CurvaTasas(self.plazos, self.tasas_cero, metodo)
+
+    def tasa_cero(self, anios):
+        """Tasa cero (TEA %) interpolada para uno o varios plazos en años"""
+        return interpolar(self.plazos, self.tasas_cero, anios, self.metodo)
+
+    def descuento(self, anios):
+        """Factores de descuento (1 + z(t))^-t para uno o varios plazos en años"""
+        anios = np.asarray(anios, dtype=float)
+        return (1 + self.tasa_cero(anios) / 100) ** -anios
+
+    def factores(self, frecuencia, total_periodos):
+        """Factores de descuento para t = 1..n períodos de la frecuencia dada (cacheados, solo lectura)"""
+        return _factores_cacheados(self, PERIODOS_BONO[frecuencia], int(total_periodos))
+
+
+@lru_cache(maxsize=256)
+def _factores_cacheados(curva, num_periodos, total_periodos):
+    factores = curva.descuento(np.arange(1, total_periodos + 1) / num_periodos)
+    factores.setflags(write=False)
+    return factores
+
+
+@lru_cache(maxsize=8)
+def cargar_tabla_tasas(ruta=RUTA_TABLA_TASAS):
+    """Lee la tabla local de tasas de depósito y tasas par (TEA %); se lee una sola vez por ruta"""
+    tabla = np.genfromtxt(ruta, delimiter=',', names=True, dtype=None, encoding='utf-8')
+    return tuple((str(fila['tipo']), float(fila['plazo_anios']), float(fila['tasa'])) for fila in tabla)
+
+
+def bootstrap_curva(tabla, metodo='lineal'):
+    """Construye la curva cero a partir de tasas de depósito y tasas par con cupón anual.
+
+    Los depósitos (plazo < 1 año) dan directamente la tasa cero. Las tasas par se interpolan
+    linealmente a cada año entero y se despejan los factores de descuento año por año:
+    DF(T) = (1 - c * sum(DF(1..T-1))) / (1 + c).
+    """
+    depositos = [(plazo, tasa) for tipo, plazo, tasa in tabla if tipo == 'deposito' and plazo < 1]
+    par = sorted((plazo, tasa) for tipo, plazo, tasa in tabla if tipo == 'par')
+
+    plazos = [plazo for plazo, _ in depositos]
+    tasas_cero = [tasa for _, tasa in depositos]
+
+    if par:
+        plazos_par, tasas_par = np.array(par).T
+        anios = np.arange(1, int(np.ceil(plazos_par[-1])) + 1)
+        cupones = np.interp(anios, plazos_par, tasas_par) / 100
+
+        descuentos = np.empty(len(anios))
+        acumulado = 0.0
+        for k, c in enumerate(cupones):
+            descuentos[k] = (1 - c * acumulado) / (1 + c)
+            acumulado += descuentos[k]
+
+        plazos += list(anios)
+        tasas_cero += list((descuentos ** (-1 / anios) - 1) * 100)
+
+    return CurvaTasas(plazos, tasas_cero, metodo)
+
+
+def curva_local(metodo='lineal', ruta=RUTA_TABLA_TASAS):
+    """Curva cero construida desde la tabla local de tasas"""
+    return bootstrap_curva(cargar_tabla_tasas(ruta), metodo)
+
+
+def precio_con_curva(curva, valor_nominal, cupon, frecuencia, total_periodos):
+    """Precio de un bono bullet como producto punto entre sus flujos y los factores de la curva"""
+    return flujos_bono(valor_nominal, cupon, int(total_periodos)) @ curva.factores(frecuencia, total_periodos)
+
+
+def pesos_clave(anios, plazos_clave=PLAZOS_CLAVE):
+    """Pesos triangulares de cada plazo clave sobre los plazos dados; suman 1 en cada plazo.
+
+    Antes del primer plazo clave y después del último el peso es plano, de modo que la suma de
+    las duraciones clave coincide con la duración efectiva ante un desplazamiento paralelo.
+    """
+    anios = np.asarray(anios, dtype=float)
+    plazos_clave = np.asarray(plazos_clave, dtype=float)
+    identidad = np.eye(len(plazos_clave))
+    return np.stack([np.interp(anios, plazos_clave, fila) for fila in identidad])
+
+
+def duraciones_clave(curva, indice, anios, flujos, num_bonos=None, plazos_clave=PLAZOS_CLAVE, salto_pb=1.0):
+    """Precio y duraciones clave de uno o muchos bonos descontados con la curva.
+
+    Recibe los flujos como arreglos planos (índice del bono, plazo en años, flujo). Todos los
+    desplazamientos (±salto en cada plazo clave) se evalúan en una sola operación difundida de
+    forma (2, plazos clave, flujos) y se suman por bono con un único bincount.
+    Devuelve {'precio': (bonos,), 'duraciones': (bonos, plazos clave)}.
+    """
+    indice = np.asarray(indice)
+    anios = np.asarray(anios, dtype=float)
+    flujos = np.asarray(flujos, dtype=float)
+    num_bonos = int(indice.max()) + 1 if num_bonos is None else num_bonos
+    num_claves = len(plazos_clave)
+
+    tasas = curva.tasa_cero(anios) / 100
+    salto = salto_pb / 10000
+    desplazamientos = np.array([salto, -salto])[:, None, None] * pesos_clave(anios, plazos_clave)
+    valores = flujos * (1 + tasas + desplazamientos) ** -anios
+
+    precio = np.bincount(indice, weights=flujos * (1 + tasas) ** -anios, minlength=num_bonos)
+    llaves = np.arange(num_claves)[:, None] * num_bonos + indice
+    variacion = np.bincount(llaves.ravel(), weights=(valores[1] - valores[0]).ravel(),
+                            minlength=num_claves * num_bonos).reshape(num_claves, num_bonos)
+
+    return {
+        'precio': precio,
+        'duraciones': (variacion / (2 * salto * precio)).T
+    }
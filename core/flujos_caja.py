@@ -0,0 +1,121 @@
+import os
+from functools import lru_cache
+
+import numpy as np
+from core.tasas import convertir_tea_a_periodica
+from core.valoracion_bonos import PERIODOS_BONO
+
+RUTA_TABLA_INDICE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'indice_tasas.csv')
+
+ESTRUCTURAS_AMORTIZACION = ('bullet', 'cuota_constante', 'amortizacion_constante', 'fondo_amortizacion')
+
+
+@lru_cache(maxsize=8)
+def cargar_tabla_indice(ruta=RUTA_TABLA_INDICE):
+    """Lee la proyección local del índice de referencia (plazo en años, tasa TEA %)"""
+    tabla = np.genfromtxt(ruta, delimiter=',', names=True)
+    return tuple(tabla['plazo_anios']), tuple(tabla['tasa'])
+
+
+def tasas_fijas(tasa_cupon, frecuencia, total_periodos):
+    """Tasa cupón periódica constante para todos los períodos"""
+    return np.full(total_periodos, convertir_tea_a_periodica(tasa_cupon, frecuencia))
+
+
+def tasas_step_up(escalones, frecuencia, total_periodos):
+    """Tasas cupón periódicas de un bono step-up.
+
+    `escalones` es una lista de (desde_anio, tea_cupon); cada período usa el último escalón cuyo
+    año de inicio es anterior o igual al inicio del período.
+    """
+    desde, teas = np.array(sorted(escalones), dtype=float).T
+    inicio_periodo = np.arange(total_periodos) / PERIODOS_BONO[frecuencia]
+    escalon = np.clip(np.searchsorted(desde, inicio_periodo, side='right') - 1, 0, len(teas) - 1)
+    return convertir_tea_a_periodica(teas[escalon], frecuencia)
+
+
+def tasas_flotante(spread_pb, frecuencia, total_periodos, tabla_indice=None):
+    """Tasas cupón periódicas de un bono flotante: índice proyectado al inicio de cada período + spread"""
+    plazos, tasas = cargar_tabla_indice() if tabla_indice is None else tabla_indice
+    fijacion = np.arange(total_periodos) / PERIODOS_BONO[frecuencia]
+    indice = np.interp(fijacion, plazos, tasas)
+    return convertir_tea_a_periodica(indice + spread_pb / 100, frecuencia)
+
+
+def amortizaciones(estructura, total_periodos, num_periodos, tasas=None, anio_inicio_fondo=None, porcentaje_fondo=None):
+    """Fracción del nominal que se amortiza en cada período (suma 1).
+
+    - 'bullet': todo al vencimiento.
+    - 'cuota_constante': cuota nivelada (sistema francés) con la tasa del primer período.
+    - 'amortizacion_constante': la misma fracción en cada período (sistema alemán).
+    - 'fondo_amortizacion': se retira `porcentaje_fondo` % del nominal en cada aniversario desde
+      `anio_inicio_fondo`; el saldo restante se paga al vencimiento.
+    """
+    if estructura not in ESTRUCTURAS_AMORTIZACION:
+        raise ValueError(f"Estructura de amortización no válida: {estructura}")
+
+    fracciones = np.zeros(total_periodos)
+    periodos = np.arange(1, total_periodos + 1)
+
+    if estructura == 'bullet':
+        fracciones[-1] = 1.0
+    elif estructura == 'amortizacion_constante':
+        fracciones[:] = 1 / total_periodos
+    elif estructura == 'cuota_constante':
+        y = tasas[0]
+        if y == 0:
+            fracciones[:] = 1 / total_periodos
+        else:
+            cuota = y / (1 - (1 + y) ** -total_periodos)
+            fracciones = cuota * (1 + y) ** -(total_periodos - periodos + 1)
+    else:
+        aniversario = (periodos % num_periodos == 0) & (periodos / num_periodos >= anio_inicio_fondo)
+        fracciones[aniversario] = porcentaje_fondo / 100
+        fracciones = np.diff(np.minimum(np.cumsum(fracciones), 1.0), prepend=0.0)
+        fracciones[-1] += 1.0 - fracciones.sum()
+
+    return fracciones
+
+
+def cronograma_flujos(valor_nominal, tasas, fracciones_amortizacion, num_periodos):
+    """Cronograma de flujos en columnas a partir de las tasas periódicas y las fracciones amortizadas.
+
+    Todas las columnas se obtienen con operaciones sobre arreglos completos (sin recorrer filas)
+    y 'anios' / 'flujo' se pueden pasar directamente a `duracion_convexidad` o `duraciones_clave`.
+    """
+    amortizacion = valor_nominal * np.asarray(fracciones_amortizacion, dtype=float)
+    saldo_final = valor_nominal - np.cumsum(amortizacion)
+    saldo_inicial = saldo_final + amortizacion
+    interes = saldo_inicial * tasas
+    periodos = np.arange(1, len(amortizacion) + 1)
+
+    return {
+        'periodo': periodos,
+        'anios': periodos / num_periodos,
+        'saldo_inicial': saldo_inicial,
+        'tasa_periodica': np.asarray(tasas, dtype=float),
+        'interes': interes,
+        'amortizacion': amortizacion,
+        'flujo': interes + amortizacion,
+        'saldo_final': np.maximum(saldo_final, 0.0)
+    }
+
+
+def generar_cronograma(valor_nominal, frecuencia, plazo, tasa_cupon=None, amortizacion='bullet',
+                       escalones=None, spread_pb=None, anio_inicio_fondo=1, porcentaje_fondo=10.0):
+    """Genera el cronograma de un bono combinando el tipo de cupón y la estructura de amortización.
+
+    El cupón es fijo (`tasa_cupon`), step-up (`escalones`) o flotante (`spread_pb` sobre el índice local).
+    """
+    num_periodos = PERIODOS_BONO[frecuencia]
+    total_periodos = int(plazo * num_periodos)
+
+    if escalones is not None:
+        tasas = tasas_step_up(escalones, frecuencia, total_periodos)
+    elif spread_pb is not None:
+        tasas = tasas_flotante(spread_pb, frecuencia, total_periodos)
+    else:
+        tasas = tasas_fijas(tasa_cupon, frecuencia, total_periodos)
+
+    fracciones = amortizaciones(amortizacion, total_periodos, num_periodos, tasas, anio_inicio_fondo, porcentaje_fondo)
+    return cronograma_flujos(valor_nominal, tasas, fracciones, num_periodos)
@@ -0,0 +1,99 @@
+import numpy as np
+from core.valoracion_bonos import duracion_convexidad
+
+
+def analitica_pasivos(montos, anios, tea):
+    """Valor presente, duración modificada y convexidad de un flujo de pasivos (montos en sus plazos en años)"""
+    orden = np.argsort(anios)
+    return duracion_convexidad(np.asarray(montos, dtype=float)[orden], np.asarray(anios, dtype=float)[orden], tea)
+
+
+def resolver_qp(restricciones, objetivos, cota_superior=np.inf, sesgo=0.0, tolerancia=1e-10, max_iter=100):
+    """Programa cuadrático min ½‖z‖² − sesgo·z  sujeto a  A z = b,  0 ≤ z ≤ cota, resuelto por su dual.
+
+    Para multiplicadores λ la solución primal es z(λ) = clip(Aᵀλ + sesgo, 0, cota), así que basta
+    resolver el sistema de k ecuaciones A z(λ) = b (k = número de restricciones) con Newton
+    semisuave y búsqueda lineal. Cada iteración cuesta unas pocas operaciones sobre los n activos,
+    por lo que escala a miles de candidatos. Devuelve (z, convergió, iteraciones).
+    """
+    A = np.asarray(restricciones, dtype=float)
+    b = np.asarray(objetivos, dtype=float)
+    sesgo = np.broadcast_to(np.asarray(sesgo, dtype=float), A.shape[1])
+
+    def primal(multiplicadores):
+        nivel = A.T @ multiplicadores + sesgo
+        return nivel, np.clip(nivel, 0.0, cota_superior)
+
+    multiplicadores = np.linalg.lstsq(A @ A.T, b - A @ np.clip(sesgo, 0.0, cota_superior), rcond=None)[0]
+    nivel, z = primal(multiplicadores)
+    residuo = A @ z - b
+
+    for iteracion in range(1, max_iter + 1):
+        norma = np.linalg.norm(residuo)
+        if norma < tolerancia:
+            return z, True, iteracion
+
+        libres = (nivel > 0) & (nivel < cota_superior)
+        jacobiano = A[:, libres] @ A[:, libres].T
+        paso = np.linalg.lstsq(jacobiano + 1e-12 * np.eye(len(b)), -residuo, rcond=None)[0]
+
+        t = 1.0
+        while t > 1e-10:
+            candidato = multiplicadores + t * paso
+            nivel_nuevo, z_nuevo = primal(candidato)
+            residuo_nuevo = A @ z_nuevo - b
+            if np.linalg.norm(residuo_nuevo) < (1 - 1e-4 * t) * norma:
+                break
+            t *= 0.5
+        else:
+            return z, False, iteracion
+
+        multiplicadores, nivel, z, residuo = candidato, nivel_nuevo, z_nuevo, residuo_nuevo
+
+    return z, np.linalg.norm(residuo) < tolerancia, max_iter
+
+
+def inmunizar(precio, duracion_modificada, convexidad, pasivos, rendimiento=None, peso_maximo=None,
+              preferencia_rendimiento=0.0, igualar_convexidad=False):
+    """Pesos de una cartera de bonos candidatos que inmunizan un flujo de pasivos.
+
+    Iguala el valor presente y la duración de los pasivos; la convexidad se exige al menos igual a la
+    de los pasivos (condición de Redington) o exactamente igual si `igualar_convexidad`. Entre todas
+    las soluciones elige la más diversificada (mínima suma de pesos al cuadrado), opcionalmente
+    inclinada hacia los bonos de mayor `rendimiento`, con un peso máximo por bono.
+    Devuelve los montos a invertir y las unidades por bono, y las métricas logradas.
+    """
+    precio = np.asarray(precio, dtype=float)
+    duracion_modificada = np.asarray(duracion_modificada, dtype=float)
+    convexidad = np.asarray(convexidad, dtype=float)
+    num_bonos = len(precio)
+    cota = np.inf if peso_maximo is None else peso_maximo
+
+    # Sesgo escalado al orden de magnitud de un peso uniforme
+    sesgo = 0.0
+    if rendimiento is not None and preferencia_rendimiento:
+        rendimiento = np.asarray(rendimiento, dtype=float)
+        sesgo = preferencia_rendimiento * (rendimiento - rendimiento.mean()) / (rendimiento.std() or 1.0) / num_bonos
+
+    restricciones = np.vstack([np.ones(num_bonos), duracion_modificada])
+    objetivos = np.array([1.0, pasivos['duracion_modificada']])
+    pesos, convergio, iteraciones = resolver_qp(restricciones, objetivos, cota, sesgo)
+
+    # Si la convexidad no alcanza (o se pide igualarla), la restricción queda activa como igualdad
+    if igualar_convexidad or not convergio or pesos @ convexidad < pasivos['convexidad']:
+        restricciones = np.vstack([restricciones, convexidad])
+        objetivos = np.append(objetivos, pasivos['convexidad'])
+        pesos, convergio, iteraciones = resolver_qp(restricciones, objetivos, cota, sesgo)
+
+    montos = pesos * pasivos['precio']
+    return {
+        'convergio': bool(convergio),
+        'iteraciones': iteraciones,
+        'pesos': pesos,
+        'montos': montos,
+        'unidades': montos / precio,
+        'valor_presente': montos.sum(),
+        'duracion_modificada': pesos @ duracion_modificada,
+        'convexidad': pesos @ convexidad,
+        'num_bonos': int((pesos > 1e-9).sum())
+    }
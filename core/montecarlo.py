@@ -0,0 +1,75 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from core.proyeccion import PERIODOS_POR_ANIO
+
+PERCENTILES = (5, 50, 95)
+
+_pool = None
+_pool_procesos = None
+
+
+def _obtener_pool(procesos):
+    """Reutiliza el mismo pool de procesos entre ejecuciones de Streamlit"""
+    global _pool, _pool_procesos
+    if _pool is None or _pool_procesos != procesos:
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+        _pool = ProcessPoolExecutor(max_workers=procesos, mp_context=multiprocessing.get_context('spawn'))
+        _pool_procesos = procesos
+    return _pool
+
+
+def _simular_bloque(semilla, num_trayectorias, monto_inicial, aporte_periodico, tea_media, volatilidad,
+                    num_periodos, plazo_anios):
+    """Simula un bloque de trayectorias y devuelve el saldo al cierre de cada año (trayectorias x años+1)"""
+    rng = np.random.default_rng(semilla)
+    total_periodos = plazo_anios * num_periodos
+
+    # Rendimientos log-normales: E[1 + r] por período coincide con la TEA media
+    sigma = (volatilidad / 100) / np.sqrt(num_periodos)
+    mu = np.log1p(tea_media / 100) / num_periodos - 0.5 * sigma ** 2
+    log_rend = rng.normal(mu, sigma, size=(num_trayectorias, total_periodos))
+
+    # S_k = G_k * (M + A * sum_{j<=k} 1/G_j), con G_k = prod_{j<=k} (1 + r_j)
+    log_crecimiento = np.cumsum(log_rend, axis=1)
+    descuento = np.exp(-log_crecimiento)
+    saldos = np.exp(log_crecimiento) * (monto_inicial + aporte_periodico * np.cumsum(descuento, axis=1))
+
+    cierres = saldos[:, num_periodos - 1::num_periodos]
+    inicio = np.full((num_trayectorias, 1), float(monto_inicial))
+    return np.hstack([inicio, cierres])
+
+
+def simular_montecarlo(monto_inicial, aporte_periodico, tea_media, volatilidad, frecuencia, plazo_anios,
+                       num_trayectorias=10_000, semilla=None, meta=None, procesos=None, tamano_bloque=2_500):
+    """Simulación Monte Carlo del saldo de la cartera con rendimientos estocásticos.
+
+    Las trayectorias se simulan por bloques; cada bloque recibe una semilla independiente derivada
+    de `semilla`, de modo que el resultado es reproducible sin importar cuántos procesos se usen.
+    """
+    num_periodos = PERIODOS_POR_ANIO[frecuencia]
+    num_bloques = -(-num_trayectorias // tamano_bloque)
+    semillas = np.random.SeedSequence(semilla).spawn(num_bloques)
+    tamanos = [min(tamano_bloque, num_trayectorias - b * tamano_bloque) for b in range(num_bloques)]
+    parametros = (monto_inicial, aporte_periodico, tea_media, volatilidad, num_periodos, plazo_anios)
+
+    procesos = procesos or min(os.cpu_count() or 1, num_bloques)
+    if procesos > 1 and num_bloques > 1:
+        pool = _obtener_pool(procesos)
+        futuros = [pool.submit(_simular_bloque, s, n, *parametros) for s, n in zip(semillas, tamanos)]
+        bloques = [f.result() for f in futuros]
+    else:
+        bloques = [_simular_bloque(s, n, *parametros) for s, n in zip(semillas, tamanos)]
+
+    saldos_anuales = np.vstack(bloques)
+    saldos_finales = saldos_anuales[:, -1]
+
+    return {
+        'anios': np.arange(plazo_anios + 1),
+        'percentiles': dict(zip(PERCENTILES, np.percentile(saldos_anuales, PERCENTILES, axis=0))),
+        'saldos_finales': saldos_finales,
+        'prob_meta': float(np.mean(saldos_finales >= meta)) if meta is not None else None
+    }
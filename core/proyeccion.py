@@ -0,0 +1,104 @@
+import numpy as np
+from core.tasas import convertir_tea_a_periodica
+
+PERIODOS_POR_ANIO = {'Mensual': 12, 'Bimestral': 6, 'Trimestral': 4, 'Cuatrimestral': 3, 'Semestral': 2, 'Anual': 1}
+
+
+def factor_acumulacion(crecimiento, tasa_periodica, periodos):
+    """Factor de valor futuro de una anualidad ((1+i)^n - 1) / i, con i = 0 -> n"""
+    tasa_periodica = np.asarray(tasa_periodica, dtype=float)
+    sin_tasa = tasa_periodica == 0
+    divisor = np.where(sin_tasa, 1.0, tasa_periodica)
+    return np.where(sin_tasa, periodos, (crecimiento - 1) / divisor)
+
+
+def proyectar_cartera(monto_inicial, aporte_periodico, tea_cartera, frecuencia, plazo_anios, edad_actual):
+    """Calcula la proyección completa de la cartera período a período como arreglos de NumPy"""
+    num_periodos = PERIODOS_POR_ANIO[frecuencia]
+    total_periodos = plazo_anios * num_periodos
+    tasa_periodica = convertir_tea_a_periodica(tea_cartera, frecuencia)
+
+    periodos = np.arange(total_periodos + 1)
+    crecimiento = (1 + tasa_periodica) ** periodos
+
+    # valor futuro del monto inicial + valor futuro de los aportes periodicos
+    saldo_final = monto_inicial * crecimiento + aporte_periodico * factor_acumulacion(crecimiento, tasa_periodica, periodos)
+    aportes_acumulados = monto_inicial + aporte_periodico * periodos
+
+    aporte = np.full(total_periodos + 1, float(aporte_periodico))
+    aporte[0] = 0.0
+
+    return {
+        'Periodo': periodos,
+        'Edad': edad_actual + periodos // num_periodos,
+        'Saldo Inicial': np.full(total_periodos + 1, float(monto_inicial)),
+        'Intereses': saldo_final - aportes_acumulados,
+        'Aporte': aporte,
+        'Saldo Final': saldo_final,
+        'Aportes Acumulados': aportes_acumulados
+    }
+
+
+def evaluar_escenarios(monto_inicial, aporte_periodico, tea_cartera, frecuencia, edad_actual, edad_jubilacion,
+                       valor_impuesto, tea_retiro=None):
+    """Evalúa en forma cerrada el saldo final, impuesto, cobro total y pensión mensual.
+
+    `edad_jubilacion`, `tea_cartera` y `tea_retiro` pueden ser escalares o arreglos de NumPy;
+    los resultados se difunden (broadcasting) entre ellos.
+    """
+    num_periodos = PERIODOS_POR_ANIO[frecuencia]
+    total_periodos = (np.asarray(edad_jubilacion) - edad_actual) * num_periodos
+    tasa_periodica = convertir_tea_a_periodica(np.asarray(tea_cartera, dtype=float), frecuencia)
+
+    crecimiento = (1 + tasa_periodica) ** total_periodos
+    saldo_final = monto_inicial * crecimiento + aporte_periodico * factor_acumulacion(crecimiento, tasa_periodica, total_periodos)
+
+    costos_totales = monto_inicial + aporte_periodico * total_periodos
+    ganancia_total = saldo_final - costos_totales
+    impuesto = ganancia_total * valor_impuesto
+
+    resultado = {
+        'saldo_final': saldo_final,
+        'costos_totales': costos_totales,
+        'ganancia_total': ganancia_total,
+        'impuesto': impuesto,
+        'cobro_total': ganancia_total - impuesto
+    }
+
+    if tea_retiro is not None:
+        tasa_cobro_mensual = 0.5 * (np.asarray(tea_retiro, dtype=float) / 100)
+        dividendo_bruto_anual = saldo_final * tasa_cobro_mensual
+        dividendos_neto_anual = dividendo_bruto_anual - dividendo_bruto_anual * valor_impuesto
+        resultado['pension_mensual'] = dividendos_neto_anual / 12
+
+    return resultado
+
+
+def barrido_edad_jubilacion(monto_inicial, aporte_periodico, tea_cartera, frecuencia, edad_actual,
+                            valor_impuesto, tea_retiro=None, edad_maxima=100):
+    """Evalúa todas las edades de jubilación desde edad_actual + 1 hasta edad_maxima en un solo lote"""
+    edades = np.arange(edad_actual + 1, edad_maxima + 1)
+    resultado = evaluar_escenarios(monto_inicial, aporte_periodico, tea_cartera, frecuencia, edad_actual,
+                                   edades, valor_impuesto, tea_retiro)
+    resultado['edad_jubilacion'] = edades
+    return resultado
+
+
+def edad_minima_para_meta(edades, valores, meta):
+    """Primera edad cuyo valor alcanza la meta, o None si ninguna la alcanza"""
+    alcanza = np.asarray(valores) >= meta
+    if not alcanza.any():
+        return None
+    return int(np.asarray(edades)[alcanza.argmax()])
+
+
+def grilla_tea_plazo(monto_inicial, aporte_periodico, frecuencia, valor_impuesto, teas=None, plazos=None):
+    """Cobro total neto sobre una grilla TEA x plazo en una sola operación difundida.
+
+    Devuelve (teas, plazos, matriz) con matriz[i, j] = cobro total para teas[i] y plazos[j].
+    """
+    teas = np.arange(1.0, 50.5, 0.5) if teas is None else np.asarray(teas, dtype=float)
+    plazos = np.arange(1, 71) if plazos is None else np.asarray(plazos)
+    escenarios = evaluar_escenarios(monto_inicial, aporte_periodico, teas[:, None], frecuencia, 0,
+                                    plazos[None, :], valor_impuesto)
+    return teas, plazos, escenarios['cobro_total']
@@ -0,0 +1,115 @@
+import numpy as np
+from core.valoracion_bonos import periodos_por_anio
+
+
+def resolver_raices(funcion, x0, minimo, maximo, tolerancia=1e-10, max_iter=100):
+    """Newton-Raphson vectorizado con respaldo por bisección dentro de un intervalo.
+
+    `funcion(x)` devuelve (valor, derivada) para un arreglo de x y debe ser decreciente en x
+    (como el precio de un bono frente a su rendimiento). Las filas sin raíz en [minimo, maximo]
+    devuelven NaN. Devuelve (raices, iteraciones).
+    """
+    x = np.array(x0, dtype=float)
+    minimo = np.broadcast_to(np.asarray(minimo, dtype=float), x.shape).copy()
+    maximo = np.broadcast_to(np.asarray(maximo, dtype=float), x.shape).copy()
+
+    # En los extremos del intervalo el precio puede desbordarse; basta con su signo
+    with np.errstate(over='ignore', invalid='ignore'):
+        valor_min, _ = funcion(minimo)
+        valor_max, _ = funcion(maximo)
+    sin_raiz = ~((valor_min >= 0) & (valor_max <= 0))
+
+    activos = ~sin_raiz
+    iteracion = 0
+    for iteracion in range(1, max_iter + 1):
+        valor, derivada = funcion(x)
+
+        # Actualizar el intervalo: la función es decreciente
+        minimo = np.where(valor > 0, x, minimo)
+        maximo = np.where(valor < 0, x, maximo)
+
+        activos &= np.abs(valor) > tolerancia
+        if not activos.any():
+            break
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x_newton = x - valor / derivada
+        fuera = ~np.isfinite(x_newton) | (x_newton <= minimo) | (x_newton >= maximo)
+        x_nuevo = np.where(fuera, 0.5 * (minimo + maximo), x_newton)
+        x = np.where(activos, x_nuevo, x)
+
+    x[sin_raiz] = np.nan
+    return x, iteracion
+
+
+def precio_y_derivada(valor_nominal, cupon, total_periodos, tasa_periodica):
+    """Precio del bono bullet y su derivada analítica respecto de la tasa periódica"""
+    y = np.asarray(tasa_periodica, dtype=float)
+    descuento_final = (1 + y) ** -total_periodos
+
+    casi_cero = np.abs(y) < 1e-8
+    y_seguro = np.where(casi_cero, 1.0, y)
+    anualidad = np.where(casi_cero, total_periodos, (1 - descuento_final) / y_seguro)
+    d_anualidad = np.where(
+        casi_cero,
+        -total_periodos * (total_periodos + 1) / 2,
+        (total_periodos * descuento_final / (1 + y) - anualidad) / y_seguro
+    )
+
+    precio = cupon * anualidad + valor_nominal * descuento_final
+    derivada = cupon * d_anualidad - total_periodos * valor_nominal * descuento_final / (1 + y)
+    return precio, derivada
+
+
+def calcular_ytm(precio, valor_nominal, tasa_cupon, plazo, frecuencia, tolerancia=1e-10, max_iter=100):
+    """Rendimiento al vencimiento (TEA %) a partir del precio de mercado, para uno o miles de bonos.
+
+    Todos los argumentos pueden ser arreglos de la misma longitud (una fila por bono);
+    `tasa_cupon` es la TEA del cupón en %. Devuelve (ytm_tea, iteraciones).
+    """
+    precio = np.asarray(precio, dtype=float)
+    valor_nominal = np.asarray(valor_nominal, dtype=float)
+    num_periodos = periodos_por_anio(frecuencia)
+    total_periodos = np.asarray(plazo) * num_periodos
+    cupon = valor_nominal * ((1 + np.asarray(tasa_cupon, dtype=float) / 100) ** (1 / num_periodos) - 1)
+
+    def funcion(y):
+        precio_modelo, derivada = precio_y_derivada(valor_nominal, cupon, total_periodos, y)
+        return (precio_modelo - precio) / valor_nominal, derivada / valor_nominal
+
+    # Punto de partida: rendimiento corriente aproximado
+    x0 = np.clip((cupon + (valor_nominal - precio) / total_periodos) / ((valor_nominal + precio) / 2), -0.5, 0.5)
+    tasa_periodica, iteraciones = resolver_raices(
+        funcion, np.broadcast_to(x0, np.broadcast(precio, total_periodos).shape),
+        -0.99, 10.0, tolerancia, max_iter
+    )
+
+    return ((1 + tasa_periodica) ** num_periodos - 1) * 100, iteraciones
+
+
+def rendimiento_horizonte(flujos, anios, precio_compra, horizonte, tasas_reinversion, tea_venta):
+    """Rendimiento compuesto realizado (TEA %) al horizonte para una o muchas tasas de reinversión.
+
+    Los flujos cobrados hasta el horizonte se capitalizan a cada tasa de reinversión (TEA %) y los
+    flujos restantes se venden al horizonte descontados a `tea_venta` (%). Todas las tasas se evalúan
+    a la vez como una matriz (tasas x flujos). Devuelve el valor acumulado al horizonte, sus
+    componentes y el rendimiento realizado.
+    """
+    flujos = np.asarray(flujos, dtype=float)
+    anios = np.asarray(anios, dtype=float)
+    tasas_reinversion = np.asarray(tasas_reinversion, dtype=float)
+
+    cobrados = anios <= horizonte + 1e-12
+    capitalizacion = (1 + tasas_reinversion[..., None] / 100) ** (horizonte - anios[cobrados])
+    cupones_reinvertidos = capitalizacion @ flujos[cobrados]
+    intereses_sobre_intereses = cupones_reinvertidos - flujos[cobrados].sum()
+    precio_venta = flujos[~cobrados] @ (1 + tea_venta / 100) ** -(anios[~cobrados] - horizonte)
+
+    valor_horizonte = cupones_reinvertidos + precio_venta
+    return {
+        'valor_horizonte': valor_horizonte,
+        'cupones': flujos[cobrados].sum(),
+        'intereses_sobre_intereses': intereses_sobre_intereses,
+        'precio_venta': precio_venta,
+        'rendimiento_realizado': ((valor_horizonte / precio_compra) ** (1 / horizonte) - 1) * 100
+    }
@@ -0,0 +1,65 @@
+import numpy as np
+from core.rendimiento import resolver_raices
+
+
+def probabilidades_supervivencia(anios, plazos_hazard, hazards):
+    """Probabilidad de supervivencia S(t) = exp(-integral de la tasa de default) en cada plazo.
+
+    `hazards[i]` (decimal anual) rige desde `plazos_hazard[i - 1]` (o 0) hasta `plazos_hazard[i]`;
+    la última tasa se extiende más allá del último plazo. La tasa acumulada es lineal por tramos,
+    así que se interpola directamente para todos los plazos a la vez.
+    """
+    plazos_hazard = np.asarray(plazos_hazard, dtype=float)
+    hazards = np.asarray(hazards, dtype=float)
+    bordes = np.concatenate([[0.0], plazos_hazard])
+    acumulado = np.concatenate([[0.0], np.cumsum(hazards * np.diff(bordes))])
+
+    anios = np.asarray(anios, dtype=float)
+    exceso = np.maximum(anios - bordes[-1], 0.0)
+    return np.exp(-(np.interp(anios, bordes, acumulado) + hazards[-1] * exceso))
+
+
+def precio_con_riesgo_credito(flujos, anios, descuentos, supervivencia, valor_nominal, recuperacion):
+    """Precio de un bono con riesgo de default en la misma pasada de descuento que el bono sin riesgo.
+
+    Cada flujo se pondera por la probabilidad de sobrevivir hasta su fecha y, si el default ocurre
+    dentro de un período, se recupera `recuperacion` (fracción) del nominal al final de ese período.
+    Los arreglos pueden tener una dimensión inicial de bonos o escenarios.
+    """
+    supervivencia_previa = np.concatenate(
+        [np.ones(supervivencia.shape[:-1] + (1,)), supervivencia[..., :-1]], axis=-1
+    )
+    prob_default = supervivencia_previa - supervivencia
+
+    valor_flujos = (flujos * descuentos * supervivencia).sum(axis=-1)
+    valor_recuperacion = (recuperacion * valor_nominal * descuentos * prob_default).sum(axis=-1)
+
+    return {
+        'precio': valor_flujos + valor_recuperacion,
+        'precio_sin_riesgo': (flujos * descuentos).sum(axis=-1),
+        'valor_recuperacion': valor_recuperacion,
+        'prob_default_total': 1 - supervivencia[..., -1],
+        'prob_default': prob_default
+    }
+
+
+def calcular_z_spread(precio, flujos, anios, tasas_cero, tolerancia=1e-10, max_iter=100):
+    """Spread constante (decimal, sobre la TEA cero de cada plazo) que iguala el valor de los flujos al precio.
+
+    `flujos`, `anios` y `tasas_cero` (decimal) pueden ser matrices (bonos x flujos), rellenando con
+    flujos cero; todos los bonos se resuelven juntos con el buscador de raíces vectorizado.
+    """
+    precio = np.atleast_1d(np.asarray(precio, dtype=float))
+    flujos = np.atleast_2d(flujos)
+    anios = np.broadcast_to(anios, flujos.shape)
+    tasas_cero = np.broadcast_to(tasas_cero, flujos.shape)
+    escala = flujos.sum(axis=-1)
+
+    def funcion(spread):
+        base = 1 + tasas_cero + spread[:, None]
+        valores = flujos * base ** -anios
+        derivada = -(anios * valores / base).sum(axis=-1)
+        return (valores.sum(axis=-1) - precio) / escala, derivada / escala
+
+    spread, _ = resolver_raices(funcion, np.zeros(len(precio)), -0.5, 5.0, tolerancia, max_iter)
+    return spread
@@ -0,0 +1,11 @@
+# Conversión de tasas
+DIAS_POR_FRECUENCIA = {
+    'Mensual': 30, 'Bimestral': 60, 'Trimestral': 90,
+    'Cuatrimestral': 120, 'Semestral': 180, 'Anual': 360
+}
+
+
+def convertir_tea_a_periodica(tea, frecuencia):
+    """Convierte TEA a tasa periódica"""
+    n = DIAS_POR_FRECUENCIA.get(frecuencia, 30)
+    return (1 + tea/100)**(n / 360) - 1
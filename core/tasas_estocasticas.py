@@ -0,0 +1,117 @@
+import os
+
+import numpy as np
+from core.montecarlo import _obtener_pool
+from core.valoracion_bonos import flujos_bono
+
+MODELOS_TASA_CORTA = ('vasicek', 'cir')
+
+
+def factores_afines(modelo, tau, velocidad, media, volatilidad):
+    """Coeficientes (ln A, B) del bono cupón cero P(tau) = A(tau) * exp(-B(tau) * r) en Vasicek o CIR"""
+    tau = np.asarray(tau, dtype=float)
+    if modelo == 'vasicek':
+        b = (1 - np.exp(-velocidad * tau)) / velocidad
+        log_a = (media - volatilidad ** 2 / (2 * velocidad ** 2)) * (b - tau) - volatilidad ** 2 * b ** 2 / (4 * velocidad)
+        return log_a, b
+
+    h = np.sqrt(velocidad ** 2 + 2 * volatilidad ** 2)
+    crecimiento = np.expm1(h * tau)
+    denominador = (h + velocidad) * crecimiento + 2 * h
+    b = 2 * crecimiento / denominador
+    log_a = (2 * velocidad * media / volatilidad ** 2) * (np.log(2 * h / denominador) + (velocidad + h) * tau / 2)
+    return log_a, b
+
+
+def precio_afin(modelo, tasa_corta, tiempos, flujos, velocidad, media, volatilidad):
+    """Precio de los flujos restantes para cada tasa corta: una matriz (tasas x flujos) y un producto"""
+    log_a, b = factores_afines(modelo, tiempos, velocidad, media, volatilidad)
+    return np.exp(log_a - np.multiply.outer(np.asarray(tasa_corta, dtype=float), b)) @ flujos
+
+
+def _simular_bloque_tasas(semilla, num_trayectorias, modelo, tasa_inicial, velocidad, media, volatilidad,
+                          horizonte, pasos_por_anio, tiempos_pago, flujos):
+    """Simula un bloque de tasas cortas hasta el horizonte y devuelve el valor del bono en cada trayectoria.
+
+    Solo se guarda la tasa vigente de cada trayectoria (no la trayectoria completa). Los cupones
+    cobrados antes del horizonte se capitalizan a la tasa corta simulada; al horizonte se suma el
+    precio de los flujos restantes con la fórmula cerrada del modelo.
+    """
+    rng = np.random.default_rng(semilla)
+    num_pasos = max(1, int(round(horizonte * pasos_por_anio)))
+    dt = horizonte / num_pasos
+
+    tasa = np.full(num_trayectorias, float(tasa_inicial))
+    efectivo = np.zeros(num_trayectorias)
+    pagos_por_paso = np.bincount(np.ceil(tiempos_pago[tiempos_pago <= horizonte] / dt - 1e-9).astype(int),
+                                 weights=flujos[tiempos_pago <= horizonte], minlength=num_pasos + 1)
+
+    decaimiento = np.exp(-velocidad * dt)
+    desviacion_vasicek = volatilidad * np.sqrt((1 - decaimiento ** 2) / (2 * velocidad))
+    for paso in range(1, num_pasos + 1):
+        choque = rng.standard_normal(num_trayectorias)
+        tasa_positiva = np.maximum(tasa, 0.0)
+        # En CIR el efectivo también se capitaliza a la tasa truncada (truncamiento completo)
+        efectivo *= np.exp((tasa if modelo == 'vasicek' else tasa_positiva) * dt)
+
+        if modelo == 'vasicek':
+            tasa = tasa * decaimiento + media * (1 - decaimiento) + desviacion_vasicek * choque
+        else:
+            # Euler con truncamiento completo para mantener la raíz cuadrada bien definida
+            tasa = tasa + velocidad * (media - tasa_positiva) * dt + volatilidad * np.sqrt(tasa_positiva * dt) * choque
+
+        efectivo += pagos_por_paso[paso]
+
+    if modelo == 'cir':
+        tasa = np.maximum(tasa, 0.0)
+
+    restantes = tiempos_pago > horizonte
+    precio_horizonte = precio_afin(modelo, tasa, tiempos_pago[restantes] - horizonte, flujos[restantes],
+                                   velocidad, media, volatilidad)
+    return precio_horizonte + efectivo
+
+
+def simular_precios_bono(valor_nominal, cupon, num_periodos, total_periodos, modelo='vasicek',
+                         tasa_inicial=0.05, velocidad=0.2, media=0.05, volatilidad=0.01, horizonte=1.0,
+                         num_trayectorias=100_000, nivel_confianza=0.95, pasos_por_anio=52,
+                         semilla=None, procesos=None, tamano_bloque=10_000):
+    """Distribución del valor del bono al horizonte con tasas cortas Vasicek o CIR.
+
+    Las trayectorias se simulan por bloques en procesos separados con semillas derivadas de `semilla`
+    (resultado reproducible sin importar el número de procesos). Tasas y volatilidad en decimales.
+    Devuelve el precio actual, los valores al horizonte (precio + cupones capitalizados), la
+    ganancia frente al precio actual y el VaR y la pérdida esperada (ES) al nivel de confianza
+    indicado, medidos como pérdida frente al valor esperado al horizonte.
+    """
+    if modelo not in MODELOS_TASA_CORTA:
+        raise ValueError(f"Modelo de tasa corta no válido: {modelo}")
+
+    tiempos_pago = np.arange(1, total_periodos + 1) / num_periodos
+    flujos = flujos_bono(valor_nominal, cupon, total_periodos)
+
+    num_bloques = -(-num_trayectorias // tamano_bloque)
+    semillas = np.random.SeedSequence(semilla).spawn(num_bloques)
+    tamanos = [min(tamano_bloque, num_trayectorias - b * tamano_bloque) for b in range(num_bloques)]
+    parametros = (modelo, tasa_inicial, velocidad, media, volatilidad, horizonte, pasos_por_anio, tiempos_pago, flujos)
+
+    procesos = procesos or min(os.cpu_count() or 1, num_bloques)
+    if procesos > 1 and num_bloques > 1:
+        pool = _obtener_pool(procesos)
+        futuros = [pool.submit(_simular_bloque_tasas, s, n, *parametros) for s, n in zip(semillas, tamanos)]
+        valores = np.concatenate([f.result() for f in futuros])
+    else:
+        valores = np.concatenate([_simular_bloque_tasas(s, n, *parametros) for s, n in zip(semillas, tamanos)])
+
+    precio_actual = float(precio_afin(modelo, tasa_inicial, tiempos_pago, flujos, velocidad, media, volatilidad))
+    valor_esperado = valores.mean()
+    umbral = np.quantile(valores, 1 - nivel_confianza)
+
+    return {
+        'precio_actual': precio_actual,
+        'valor_esperado': valor_esperado,
+        'valores_horizonte': valores,
+        'ganancia': valores - precio_actual,
+        'var': valor_esperado - umbral,
+        'es': valor_esperado - valores[valores <= umbral].mean(),
+        'percentiles': dict(zip((5, 50, 95), np.percentile(valores, (5, 50, 95))))
+    }
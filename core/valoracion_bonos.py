@@ -0,0 +1,131 @@
+import numpy as np
+from core.tasas import convertir_tea_a_periodica
+
+PERIODOS_BONO = {
+    'Mensual': 12, 'Bimestral': 6, 'Trimestral': 4,
+    'Cuatrimestral': 3, 'Semestral': 2, 'Anual': 1
+}
+
+
+def periodos_por_anio(frecuencia):
+    """Convierte una frecuencia o un arreglo de frecuencias ('Mensual', ...) en pagos por año"""
+    unicas, indices = np.unique(np.asarray(frecuencia), return_inverse=True)
+    return np.array([PERIODOS_BONO[f] for f in unicas])[indices].reshape(np.shape(frecuencia))
+
+
+def factores_descuento(tasa_periodica, total_periodos):
+    """Vector de factores de descuento 1 / (1 + y)^t para t = 1..n"""
+    periodos = np.arange(1, total_periodos + 1)
+    return (1 + np.asarray(tasa_periodica, dtype=float)[..., None]) ** -periodos
+
+
+def flujos_bono(valor_nominal, cupon, total_periodos):
+    """Vector de flujos de un bono bullet: cupón en cada período y cupón + principal al final"""
+    flujos = np.full(total_periodos, float(cupon))
+    flujos[-1] += valor_nominal
+    return flujos
+
+
+def precio_bono(valor_nominal, cupon, total_periodos, tasa_periodica):
+    """Precio de un bono bullet por la fórmula cerrada de anualidad.
+
+    Todos los argumentos pueden ser escalares o arreglos de NumPy (varias tasas y/o varios bonos);
+    el resultado se difunde entre ellos.
+    """
+    tasa_periodica = np.asarray(tasa_periodica, dtype=float)
+    total_periodos = np.asarray(total_periodos)
+    descuento_final = (1 + tasa_periodica) ** -total_periodos
+
+    sin_tasa = tasa_periodica == 0
+    divisor = np.where(sin_tasa, 1.0, tasa_periodica)
+    anualidad = np.where(sin_tasa, total_periodos, (1 - descuento_final) / divisor)
+
+    return cupon * anualidad + valor_nominal * descuento_final
+
+
+def precio_bono_tea(valor_nominal, cupon, total_periodos, frecuencia_bono, tea):
+    """Precio del bono para una o varias tasas de descuento expresadas como TEA (%)"""
+    tasa_periodica = convertir_tea_a_periodica(np.asarray(tea, dtype=float), frecuencia_bono)
+    return precio_bono(valor_nominal, cupon, total_periodos, tasa_periodica)
+
+
+def metricas_riesgo(valores_presentes, anios, tea):
+    """Duración de Macaulay, duración modificada, convexidad y DV01 a partir de los flujos ya descontados.
+
+    Las medidas son analíticas y se expresan respecto de la TEA; el DV01 es la variación del
+    precio ante 1 punto básico de la TEA.
+    """
+    uno_mas_tea = 1 + np.asarray(tea, dtype=float) / 100
+    precio = valores_presentes.sum(axis=-1)
+
+    macaulay = (anios * valores_presentes).sum(axis=-1) / precio
+    modificada = macaulay / uno_mas_tea
+    convexidad = (anios * (anios + 1) * valores_presentes).sum(axis=-1) / (precio * uno_mas_tea ** 2)
+
+    return {
+        'precio': precio,
+        'duracion_macaulay': macaulay,
+        'duracion_modificada': modificada,
+        'convexidad': convexidad,
+        'dv01': modificada * precio * 0.0001
+    }
+
+
+def duracion_convexidad(flujos, anios, tea):
+    """Medidas de riesgo de un vector de flujos con plazos en años; `tea` (%) puede ser un arreglo"""
+    tea = np.asarray(tea, dtype=float)
+    valores_presentes = flujos * (1 + tea[..., None] / 100) ** -anios
+    return metricas_riesgo(valores_presentes, anios, tea)
+
+
+def valorar_bono(valor_nominal, tasa_cupon, frecuencia_bono, plazo_bono, tea_bono):
+    """Valoración de un bono bullet: flujos, valores presentes y medidas de riesgo en una sola pasada"""
+    num_periodos_bono = PERIODOS_BONO[frecuencia_bono]
+    total_periodos_bono = plazo_bono * num_periodos_bono
+
+    tasa_cupon_periodica = convertir_tea_a_periodica(tasa_cupon, frecuencia_bono)
+    tasa_descuento_periodica = convertir_tea_a_periodica(tea_bono, frecuencia_bono)
+    cupon = valor_nominal * tasa_cupon_periodica
+
+    flujos = flujos_bono(valor_nominal, cupon, total_periodos_bono)
+    valores_presentes = flujos * factores_descuento(tasa_descuento_periodica, total_periodos_bono)
+
+    # El período i corresponde al año (i + 1) / num_periodos_bono
+    anios = np.arange(1, total_periodos_bono + 1) / num_periodos_bono
+    riesgo = metricas_riesgo(valores_presentes, anios, tea_bono)
+
+    return {
+        'anios': anios,
+        'flujos': flujos,
+        'valores_presentes': valores_presentes,
+        'valor_presente_total': riesgo['precio'],
+        'cupon': cupon,
+        'tasa_cupon_periodica': tasa_cupon_periodica,
+        'tasa_descuento_periodica': tasa_descuento_periodica,
+        'num_periodos_bono': num_periodos_bono,
+        'total_periodos_bono': total_periodos_bono,
+        'duracion_macaulay': riesgo['duracion_macaulay'],
+        'duracion_modificada': riesgo['duracion_modificada'],
+        'convexidad': riesgo['convexidad'],
+        'dv01': riesgo['dv01']
+    }
+
+
+def curva_sensibilidad(valor_nominal, cupon, total_periodos, frecuencia_bono, tea_bono,
+                       tasa_min, tasa_max, num_puntos=2000):
+    """Precio exacto y aproximaciones de duración y duración + convexidad sobre un rango de TEAs"""
+    num_periodos = PERIODOS_BONO[frecuencia_bono]
+    anios = np.arange(1, total_periodos + 1) / num_periodos
+    riesgo = duracion_convexidad(flujos_bono(valor_nominal, cupon, total_periodos), anios, tea_bono)
+
+    tasas = np.linspace(tasa_min, tasa_max, num_puntos)
+    delta = (tasas - tea_bono) / 100
+    precio = riesgo['precio']
+    aprox_duracion = precio * (1 - riesgo['duracion_modificada'] * delta)
+
+    return {
+        'tasas': tasas,
+        'precios': precio_bono_tea(valor_nominal, cupon, total_periodos, frecuencia_bono, tasas),
+        'aprox_duracion': aprox_duracion,
+        'aprox_convexidad': aprox_duracion + precio * 0.5 * riesgo['convexidad'] * delta ** 2
+    }
@@ -0,0 +1,116 @@
+import os
+import threading
+
+import numpy as np
+from core.curva import pesos_clave
+from core.cartera_bonos import MESES_POR_ANIO, expandir_flujos
+
+RUTA_HISTORICO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'historico_tasas.csv')
+
+HORIZONTES_VAR = (1, 10)
+
+# Serializa la conversión CSV -> .npy entre hilos del servidor (sesiones y precalentamiento)
+_candado_conversion = threading.Lock()
+
+
+def _guardar_npy(ruta, arreglo):
+    """Escribe el .npy en un temporal y lo renombra: otra sesión nunca mapea un archivo a medio escribir"""
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    try:
+        with open(temporal, 'wb') as archivo:
+            np.save(archivo, arreglo)
+        os.replace(temporal, ruta)
+    finally:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+
+
+def cargar_historico(ruta=RUTA_HISTORICO):
+    """Cambios diarios históricos de tasas (pb) por plazo, como arreglo mapeado en memoria.
+
+    El CSV (columnas: fecha y un plazo en años por columna) se convierte una sola vez a un archivo
+    .npy junto a él; las siguientes lecturas solo mapean ese archivo, sin volver a interpretar el
+    texto. Si el CSV es más reciente que el .npy, se regenera. Si la carpeta no admite escritura,
+    se usan los datos leídos en memoria. Devuelve (plazos, cambios, fechas).
+    """
+    base = os.path.splitext(ruta)[0]
+    ruta_cambios, ruta_fechas = base + '.npy', base + '_fechas.npy'
+
+    with open(ruta, encoding='utf-8') as archivo:
+        plazos = tuple(float(columna) for columna in archivo.readline().strip().split(',')[1:])
+
+    def desactualizado():
+        return not os.path.exists(ruta_cambios) or os.path.getmtime(ruta_cambios) < os.path.getmtime(ruta)
+
+    if desactualizado():
+        with _candado_conversion:
+            # Se vuelve a comprobar dentro del candado: otro hilo pudo terminar la conversión mientras se esperaba
+            if desactualizado():
+                datos = np.loadtxt(ruta, delimiter=',', skiprows=1, usecols=range(1, len(plazos) + 1), ndmin=2)
+                fechas = np.loadtxt(ruta, delimiter=',', skiprows=1, usecols=0, dtype='datetime64[D]', ndmin=1)
+                try:
+                    # Las fechas primero: el .npy de cambios es el que marca la conversión como vigente
+                    _guardar_npy(ruta_fechas, fechas)
+                    _guardar_npy(ruta_cambios, datos)
+                except OSError:
+                    return plazos, datos, fechas
+
+    return plazos, np.load(ruta_cambios, mmap_mode='r'), np.load(ruta_fechas, mmap_mode='r')
+
+
+def escenarios_horizonte(cambios, dias):
+    """Cambios acumulados en ventanas superpuestas de `dias` días hábiles (escenarios x plazos)"""
+    acumulado = np.cumsum(np.vstack([np.zeros((1, cambios.shape[1])), cambios]), axis=0)
+    return acumulado[dias:] - acumulado[:-dias]
+
+
+def revalorar_escenarios(curva, flujos, num_bonos, escenarios_pb, plazos_escenario):
+    """Precio de cada bono bajo cada escenario de la curva: matriz (escenarios x bonos).
+
+    Los flujos se agrupan en una matriz (fechas de pago x bonos) sobre el calendario mensual común,
+    de modo que todos los escenarios se valoran con un único producto de matrices entre los
+    factores de descuento desplazados (escenarios x fechas) y esa matriz de flujos. El desplazamiento
+    de cada fecha se interpola entre los plazos de la historia con los pesos de las duraciones clave.
+    """
+    meses, posicion = np.unique(flujos['mes'], return_inverse=True)
+    matriz_flujos = np.bincount(posicion * num_bonos + flujos['indice'], weights=flujos['flujo'],
+                                minlength=len(meses) * num_bonos).reshape(len(meses), num_bonos)
+
+    anios = meses / MESES_POR_ANIO
+    desplazamientos = np.asarray(escenarios_pb, dtype=float) @ pesos_clave(anios, plazos_escenario) / 10000
+    descuentos = (1 + curva.tasa_cero(anios) / 100 + desplazamientos) ** -anios
+    return descuentos @ matriz_flujos
+
+
+def var_historico(curva, valor_nominal, tasa_cupon, frecuencia, plazo, cantidad=None,
+                  horizontes=HORIZONTES_VAR, nivel_confianza=0.99, ruta=RUTA_HISTORICO):
+    """VaR y pérdida esperada históricos de la cartera para cada horizonte (días hábiles).
+
+    Devuelve el valor actual de la cartera y, por horizonte, las pérdidas y ganancias de cada
+    escenario histórico, el VaR, el ES y la contribución de cada bono en el escenario del VaR.
+    """
+    plazos, cambios, fechas = cargar_historico(ruta)
+    flujos = expandir_flujos(valor_nominal, tasa_cupon, frecuencia, plazo)
+    num_bonos = len(np.atleast_1d(valor_nominal))
+    cantidad = np.ones(num_bonos) if cantidad is None else np.asarray(cantidad, dtype=float)
+
+    precio_base = revalorar_escenarios(curva, flujos, num_bonos, np.zeros((1, len(plazos))), plazos)[0]
+    valor_actual = cantidad @ precio_base
+
+    resultados = {}
+    for dias in horizontes:
+        escenarios = escenarios_horizonte(cambios, dias)
+        precios = revalorar_escenarios(curva, flujos, num_bonos, escenarios, plazos)
+        ganancias = (precios - precio_base) @ cantidad
+
+        umbral = np.quantile(ganancias, 1 - nivel_confianza)
+        escenario_var = np.argmin(np.abs(ganancias - umbral))
+        resultados[dias] = {
+            'ganancias': ganancias,
+            'fechas': fechas[dias:],
+            'var': -umbral,
+            'es': -ganancias[ganancias <= umbral].mean(),
+            'contribucion': cantidad * (precios[escenario_var] - precio_base)
+        }
+
+    return {'valor_actual': valor_actual, 'horizontes': resultados}
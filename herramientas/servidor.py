@@ -0,0 +1,28 @@
+"""Arranca el servidor de Streamlit con el precalentamiento ya en marcha.
+
+Uso (desde la raíz del proyecto), con las mismas opciones de `streamlit run`:
+
+    python -m herramientas.servidor --server.port 8501
+
+El precalentamiento corre en un hilo de fondo del mismo proceso del servidor mientras Streamlit
+arranca, así que las importaciones y cachés quedan listas antes de la primera sesión. Con
+`streamlit run app.py` se puede obtener lo mismo (desde la primera sesión) con PRECALENTAR=1.
+"""
+import os
+import sys
+
+from utils.precalentamiento import iniciar_precalentamiento, informar_consola
+
+RUTA_APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+
+
+def main(argumentos=None):
+    iniciar_precalentamiento(informar_consola)
+
+    from streamlit.web import cli
+    sys.argv = ['streamlit', 'run', RUTA_APP, *(sys.argv[1:] if argumentos is None else argumentos)]
+    cli.main()
+
+
+if __name__ == '__main__':
+    main()
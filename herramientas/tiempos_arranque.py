@@ -0,0 +1,154 @@
+"""Reporte de tiempos de arranque de la aplicación: importaciones en frío y primer render de cada módulo.
+
+Uso (desde la raíz del proyecto):
+
+    python -m herramientas.tiempos_arranque --presupuesto-importacion-ms 1500 --presupuesto-render-ms 4000
+
+Cada medición corre en un proceso nuevo, así que refleja un arranque en frío del servidor. Las
+importaciones se miden con `python -X importtime` sobre las importaciones de nivel superior de
+app.py y se resumen por paquete; el render se mide con el AppTest de Streamlit. Si se indica un
+presupuesto y se supera, el comando termina con código 1 (útil en integración continua).
+"""
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUTA_APP = os.path.join(RAIZ, 'app.py')
+
+# Dependencias que solo deberían cargarse tras una acción del usuario (correo, Gemini). reportlab no
+# está aquí: los botones de descarga necesitan el PDF ya generado, así que se carga con los resultados
+DEPENDENCIAS_DIFERIDAS = ('utils.email', 'utils.gemini', 'google.generativeai', 'smtplib')
+
+CODIGO_RENDER = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+
+app = AppTest.from_file({ruta!r}, default_timeout=600)
+tiempos = {{}}
+inicio = time.perf_counter()
+app.run()
+radio = app.sidebar.radio[0]
+tiempos[radio.value] = time.perf_counter() - inicio
+for opcion in radio.options:
+    if opcion not in tiempos:
+        inicio = time.perf_counter()
+        app.sidebar.radio[0].set_value(opcion)
+        app.run()
+        tiempos[opcion] = time.perf_counter() - inicio
+
+cargadas = [m for m in {diferidas!r} if m in sys.modules]
+print(json.dumps({{'tiempos': tiempos, 'cargadas': cargadas, 'excepciones': [e.value for e in app.exception]}}))
+"""
+
+
+def importaciones_app(ruta=RUTA_APP):
+    """Módulos que app.py importa en su nivel superior (los que se cargan en cada arranque)"""
+    with open(ruta, encoding='utf-8') as archivo:
+        arbol = ast.parse(archivo.read())
+
+    modulos = []
+    for nodo in arbol.body:
+        if isinstance(nodo, ast.Import):
+            modulos.extend(alias.name for alias in nodo.names)
+        elif isinstance(nodo, ast.ImportFrom) and nodo.module:
+            modulos.append(nodo.module)
+    return list(dict.fromkeys(modulos))
+
+
+def medir_importaciones(modulos):
+    """Ejecuta `python -X importtime` en un proceso nuevo y devuelve [(propio_us, acumulado_us, nivel, modulo)]"""
+    proceso = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', '; '.join(f"import {m}" for m in modulos)],
+        cwd=RAIZ, capture_output=True, text=True
+    )
+    if proceso.returncode != 0:
+        raise SystemExit(f"❌ Error al importar los módulos de app.py:\n{proceso.stderr[-2000:]}")
+
+    registros = []
+    for linea in proceso.stderr.splitlines():
+        if not linea.startswith('import time:') or 'self [us]' in linea:
+            continue
+        propio, acumulado, nombre = linea[len('import time:'):].split('|')
+        nivel = (len(nombre) - len(nombre.lstrip())) // 2
+        registros.append((int(propio), int(acumulado), nivel, nombre.strip()))
+    return registros
+
+
+def resumir_importaciones(registros, modulos_app):
+    """Total en frío, tiempo acumulado de cada importación de app.py y tiempo propio por paquete"""
+    nivel_raiz = min(nivel for _, _, nivel, _ in registros)
+    total = sum(acumulado for _, acumulado, nivel, _ in registros if nivel == nivel_raiz)
+
+    acumulado_app = {nombre: acumulado for _, acumulado, nivel, nombre in registros
+                     if nivel == nivel_raiz and nombre in modulos_app}
+
+    por_paquete = defaultdict(int)
+    for propio, _, _, nombre in registros:
+        por_paquete[nombre.split('.')[0]] += propio
+
+    return {
+        'total_ms': total / 1000,
+        'modulos_app': {m: acumulado_app.get(m, 0) / 1000 for m in modulos_app},
+        'paquetes': sorted(((p, t / 1000) for p, t in por_paquete.items()), key=lambda x: -x[1])
+    }
+
+
+def medir_render():
+    """Tiempo del primer render de cada módulo del menú, en un proceso nuevo"""
+    proceso = subprocess.run(
+        [sys.executable, '-c', CODIGO_RENDER.format(ruta=RUTA_APP, diferidas=DEPENDENCIAS_DIFERIDAS)],
+        cwd=RAIZ, capture_output=True, text=True
+    )
+    if proceso.returncode != 0:
+        raise SystemExit(f"❌ Error al renderizar la aplicación:\n{proceso.stderr[-2000:]}")
+    return json.loads(proceso.stdout.strip().splitlines()[-1])
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Reporte de tiempos de arranque de la aplicación")
+    parser.add_argument('--top', type=int, default=15, help="Paquetes a mostrar, por tiempo propio (por defecto 15)")
+    parser.add_argument('--sin-render', action='store_true', help="Medir solo las importaciones")
+    parser.add_argument('--presupuesto-importacion-ms', type=float, default=None,
+                        help="Tiempo máximo de importación en frío de app.py")
+    parser.add_argument('--presupuesto-render-ms', type=float, default=None,
+                        help="Tiempo máximo del primer render de cualquier módulo")
+    args = parser.parse_args(argumentos)
+
+    modulos = importaciones_app()
+    resumen = resumir_importaciones(medir_importaciones(modulos), modulos)
+    excedidos = []
+
+    print(f"⏱️  Importación en frío de app.py: {resumen['total_ms']:,.0f} ms")
+    for modulo, ms in resumen['modulos_app'].items():
+        print(f"    {ms:9,.1f} ms  {modulo}")
+    print(f"\n📦 Paquetes con mayor tiempo propio de importación:")
+    for paquete, ms in resumen['paquetes'][:args.top]:
+        print(f"    {ms:9,.1f} ms  {paquete}")
+    if args.presupuesto_importacion_ms is not None and resumen['total_ms'] > args.presupuesto_importacion_ms:
+        excedidos.append(f"importación {resumen['total_ms']:,.0f} ms > {args.presupuesto_importacion_ms:,.0f} ms")
+
+    if not args.sin_render:
+        render = medir_render()
+        print(f"\n🖥️  Primer render por módulo (incluye sus importaciones diferidas):")
+        for modulo, segundos in render['tiempos'].items():
+            print(f"    {segundos * 1000:9,.0f} ms  {modulo}")
+            if args.presupuesto_render_ms is not None and segundos * 1000 > args.presupuesto_render_ms:
+                excedidos.append(f"render de {modulo} {segundos * 1000:,.0f} ms > {args.presupuesto_render_ms:,.0f} ms")
+        if render['excepciones']:
+            excedidos.append(f"{len(render['excepciones'])} excepciones al renderizar")
+        if render['cargadas']:
+            print(f"\n⚠️  Dependencias diferidas cargadas sin acción del usuario: {', '.join(render['cargadas'])}")
+
+    if excedidos:
+        print(f"\n❌ Presupuesto excedido: {'; '.join(excedidos)}")
+        sys.exit(1)
+    print("\n✅ Dentro del presupuesto")
+
+
+if __name__ == '__main__':
+    main()
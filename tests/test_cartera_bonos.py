@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from core.cartera_bonos import validar_cartera, valorar_cartera
+from core.valoracion_bonos import valorar_bono
+
+BONOS = [(1000.0, 6.0, 'Semestral', 5, 7.0), (500.0, 0.0, 'Anual', 3, 4.0),
+         (1000.0, 8.0, 'Mensual', 10, 3.5), (2000.0, 5.0, 'Trimestral', 2, 9.0)]
+
+
+def test_valorar_cartera_coincide_con_valorar_bono():
+    valor_nominal, tasa_cupon, frecuencia, plazo, tea = (np.array(columna) for columna in zip(*BONOS))
+    cantidad = np.array([1.0, 10.0, 2.0, 0.5])
+
+    valoracion = valorar_cartera(valor_nominal, tasa_cupon, frecuencia, plazo, tea, cantidad)
+    bonos = valoracion['bonos']
+
+    for i, bono in enumerate(BONOS):
+        individual = valorar_bono(*bono)
+        assert bonos['precio'][i] == pytest.approx(individual['valor_presente_total'], rel=1e-10)
+        for medida in ('duracion_macaulay', 'duracion_modificada', 'convexidad', 'dv01'):
+            assert bonos[medida][i] == pytest.approx(individual[medida], rel=1e-10)
+
+    np.testing.assert_allclose(bonos['valor_posicion'], cantidad * bonos['precio'])
+    assert valoracion['cartera']['valor_presente'] == pytest.approx((cantidad * bonos['precio']).sum())
+    assert valoracion['calendario']['flujo'].sum() == pytest.approx(
+        sum(c * valorar_bono(*bono)['flujos'].sum() for c, bono in zip(cantidad, BONOS)))
+
+
+def test_validar_cartera_devuelve_los_periodos():
+    periodos = validar_cartera(np.array(['Semestral', 'Mensual', 'Anual']), np.array([2.5, 1, 3]))
+    assert periodos.tolist() == [5, 12, 3]
+
+
+def test_validar_cartera_rechaza_frecuencias_desconocidas():
+    with pytest.raises(ValueError, match=r"Frecuencia desconocida \(Quincenal\) en las filas 2"):
+        validar_cartera(np.array(['Anual', 'Quincenal']), np.array([1, 1]))
+
+
+@pytest.mark.parametrize('plazo', [0, -1, np.nan])
+def test_validar_cartera_rechaza_plazos_no_positivos(plazo):
+    with pytest.raises(ValueError, match="mayor que cero"):
+        validar_cartera(np.array(['Anual', 'Anual']), np.array([1, plazo]))
+
+
+def test_validar_cartera_rechaza_periodos_fraccionarios():
+    # 2.3 años con pagos semestrales son 4.6 pagos
+    with pytest.raises(ValueError, match="número entero de pagos"):
+        validar_cartera(np.array(['Semestral', 'Anual']), np.array([2.3, 2]))
@@ -0,0 +1,39 @@
+import pandas as pd
+import pyarrow.parquet as pq
+
+from batch.proyectar_clientes import proyectar_archivo
+
+
+def _clientes(tea, monto):
+    return pd.DataFrame({
+        'edad': [30, 40], 'monto_inicial': monto, 'aporte': [500, 200], 'frecuencia': ['Mensual', 'Anual'],
+        'tea': tea, 'plazo': [30, 20], 'impuesto': [0.05, 0.295]
+    })
+
+
+def test_bloques_con_enteros_y_decimales(tmp_path):
+    # El primer bloque solo trae enteros en las columnas numéricas y el segundo trae decimales
+    entrada = tmp_path / 'clientes.csv'
+    _clientes([8, 6], [10000, 5000]).to_csv(entrada, index=False)
+    _clientes([8.5, 6.25], [10000.5, 5000.75]).to_csv(entrada, mode='a', header=False, index=False)
+
+    for salida in (tmp_path / 'resultados.parquet', tmp_path / 'resultados.csv'):
+        filas, rechazadas, _ = proyectar_archivo(str(entrada), str(salida), tamano_bloque=2)
+        assert (filas, rechazadas) == (4, 0)
+
+    resultado = pq.read_table(tmp_path / 'resultados.parquet').to_pandas()
+    assert resultado['tea'].tolist() == [8.0, 6.0, 8.5, 6.25]
+    assert resultado['saldo_final'].notna().all()
+
+
+def test_filas_invalidas_se_rechazan(tmp_path):
+    entrada = tmp_path / 'clientes.csv'
+    clientes = _clientes([8.0, 6.0], [10000.0, 5000.0])
+    pd.concat([clientes, clientes.assign(frecuencia=['Quincenal', 'Anual'], impuesto=[0.05, 5.0])]).to_csv(entrada, index=False)
+
+    filas, rechazadas, _ = proyectar_archivo(str(entrada), str(tmp_path / 'resultados.csv'))
+    resultado = pd.read_csv(tmp_path / 'resultados.csv', keep_default_na=False)
+
+    assert (filas, rechazadas) == (4, 2)
+    assert resultado['error'].tolist()[2:] == ['frecuencia desconocida', 'impuesto fuera de [0, 1] (debe ser fracción)']
+    assert (resultado['saldo_final'].iloc[2:] == '').all()
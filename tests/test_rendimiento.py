@@ -0,0 +1,52 @@
+import numpy as np
+
+from core.rendimiento import calcular_ytm, resolver_raices
+from core.tasas import convertir_tea_a_periodica
+from core.valoracion_bonos import PERIODOS_BONO, precio_bono
+
+
+def _precio(valor_nominal, tasa_cupon, frecuencia, plazo, tea):
+    cupon = valor_nominal * convertir_tea_a_periodica(tasa_cupon, frecuencia)
+    return precio_bono(valor_nominal, cupon, plazo * PERIODOS_BONO[frecuencia],
+                       convertir_tea_a_periodica(tea, frecuencia))
+
+
+def test_ytm_invierte_el_precio():
+    bonos = [(1000.0, 6.0, 'Semestral', 5, 7.0), (1000.0, 8.0, 'Mensual', 10, 3.5),
+             (500.0, 0.0, 'Anual', 3, 4.0), (1000.0, 5.0, 'Trimestral', 2, -1.0)]
+    valor_nominal, tasa_cupon, frecuencia, plazo, tea = (np.array(columna) for columna in zip(*bonos))
+    precios = [_precio(*bono) for bono in bonos]
+
+    ytm, _ = calcular_ytm(precios, valor_nominal, tasa_cupon, plazo, frecuencia)
+
+    np.testing.assert_allclose(ytm, tea, atol=1e-8)
+
+
+def test_ytm_escalar_coincide_con_el_vectorizado():
+    ytm, _ = calcular_ytm(_precio(1000.0, 6.0, 'Semestral', 5, 7.0), 1000.0, 6.0, 5, 'Semestral')
+    assert abs(float(ytm) - 7.0) < 1e-8
+
+
+def test_ytm_cero():
+    # Bono cupón cero al valor nominal: rendimiento nulo (rama de tasa casi cero de la derivada)
+    ytm, _ = calcular_ytm([1000.0, _precio(1000.0, 0.0, 'Semestral', 4, 0.0)], [1000.0, 1000.0],
+                          [0.0, 0.0], [4, 4], np.array(['Semestral', 'Semestral']))
+    np.testing.assert_allclose(ytm, [0.0, 0.0], atol=1e-8)
+
+
+def test_ytm_sin_raiz_es_nan():
+    # Un precio no positivo o menor que el valor a 1000% por período no tiene rendimiento en el intervalo
+    ytm, _ = calcular_ytm([0.0, -10.0, 0.01, 950.0], 1000.0, 6.0, 5, 'Semestral')
+    assert np.isnan(ytm[:3]).all()
+    assert np.isfinite(ytm[3])
+
+
+def test_resolver_raices_respeta_el_intervalo():
+    # f(x) = 2 - x es decreciente; raíz en 2 dentro de [0, 5] y fuera de [3, 5]
+    def funcion(x):
+        return 2 - x, -np.ones_like(x)
+
+    raices, iteraciones = resolver_raices(funcion, [1.0, 4.0], [0.0, 3.0], [5.0, 5.0])
+    assert raices[0] == 2.0
+    assert np.isnan(raices[1])
+    assert iteraciones >= 1
@@ -100,7 +100,7 @@ def show_sidebar():
         # --- SELECCIÓN DE MÓDULO ---
         modulo = st.radio(
             "Seleccione un módulo:",
-            ["📈 Inversiones", "📊 Bonos"]
+            ["📈 Inversiones", "📊 Bonos", "💼 Cartera de Bonos"]
         )
 
         return modulo, nombre, email
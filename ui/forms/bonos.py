@@ -1,22 +1,28 @@
-from utils.utils import convertir_tea_a_periodica, formato_moneda, mostrar_ayuda
+from core.tasas import convertir_tea_a_periodica
+from utils.utils import formato_moneda, mostrar_ayuda
 from ui.results.res_mod_c import (
     mostrar_resultados_completos,
     comparacion_escenarios,
-    grafico_sensibilidad
+    grafico_sensibilidad,
+    grafico_duraciones_clave
 )
+from core.valoracion_bonos import (
+    PERIODOS_BONO, factores_descuento, flujos_bono, valorar_bono, curva_sensibilidad, duracion_convexidad
+)
+from core.rendimiento import calcular_ytm, rendimiento_horizonte
+from core.cartera_bonos import validar_cartera
+from core.curva import PLAZOS_CLAVE, curva_local, precio_con_curva, duraciones_clave
+from core.arbol_tasas import valorar_bono_con_opcion
+from core.flujos_caja import generar_cronograma
+from core.tasas_estocasticas import simular_precios_bono
+from core.riesgo_credito import probabilidades_supervivencia, precio_con_riesgo_credito, calcular_z_spread
+from core.bonos_indexados import cargar_ipc, inflacion_anual, valorar_bono_indexado
+import numpy as np
 import pandas as pd
 import streamlit as st
 import plotly.graph_objects as go
 from datetime import datetime
-from reportlab.lib.pagesizes import letter
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image, PageBreak
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
 import io
-import plotly.io as pio
-from utils.email import crear_template_email, enviar_email_con_pdf_gmail
 
 
 
@@ -26,8 +32,15 @@ def guardar_grafico_como_imagen(fig):
 
 def generar_pdf_bonos(valor_nominal, tasa_cupon, frecuencia_bono, plazo_bono,
                       tea_bono, df_flujos, valor_presente_total, cupon,
-                      tasa_cupon_periodica, tasa_descuento_periodica):
+                      tasa_cupon_periodica, tasa_descuento_periodica, riesgo=None):
     """Genera un PDF profesional SIN GRÁFICOS con el reporte de valoración del bono"""
+    # reportlab se importa al generar el primer PDF, no al cargar la aplicación
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image, PageBreak
+    from reportlab.lib.enums import TA_CENTER, TA_LEFT
 
     buffer = io.BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.5 * inch, bottomMargin=0.5 * inch)
@@ -131,6 +144,14 @@ def generar_pdf_bonos(valor_nominal, tasa_cupon, frecuencia_bono, plazo_bono,
         ['Tipo de Bono', tipo_bono]
     ]
 
+    if riesgo is not None:
+        resumen_data += [
+            ['Duración de Macaulay', f"{riesgo['duracion_macaulay']:.4f} años"],
+            ['Duración Modificada', f"{riesgo['duracion_modificada']:.4f}"],
+            ['Convexidad', f"{riesgo['convexidad']:.4f}"],
+            ['DV01 (1 pb de TEA)', formato_moneda(riesgo['dv01'])]
+        ]
+
     tabla_resumen = Table(resumen_data, colWidths=[3 * inch, 2 * inch])
     tabla_resumen.setStyle(TableStyle([
         ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#10b981')),
@@ -270,64 +291,320 @@ def generar_pdf_bonos(valor_nominal, tasa_cupon, frecuencia_bono, plazo_bono,
 
 def calcular_valoracion_bono(valor_nominal, tasa_cupon, frecuencia_bono, plazo_bono, tea_bono):
     """Función para calcular la valoración del bono con período 0 = Año 1"""
-    periodos_bono = {
-        'Mensual': 12, 'Bimestral': 6, 'Trimestral': 4,
-        'Cuatrimestral': 3, 'Semestral': 2, 'Anual': 1
+    valoracion = valorar_bono(valor_nominal, tasa_cupon, frecuencia_bono, plazo_bono, tea_bono)
+    total_periodos_bono = valoracion['total_periodos_bono']
+    periodos = np.arange(total_periodos_bono)
+
+    df_flujos = pd.DataFrame({
+        'Periodo': periodos,
+        'Año': np.round(valoracion['anios'], 2),
+        'Flujo': valoracion['flujos'],
+        'Valor Presente': valoracion['valores_presentes'],
+        'Es_Total': False
+    })
+
+    # FILA FINAL - Solo con el total del valor presente
+    # Usar NaN para mantener el tipo numérico de la columna Año
+    df_flujos.loc[total_periodos_bono] = {
+        'Periodo': total_periodos_bono,
+        'Año': float('nan'),
+        'Flujo': float('nan'),
+        'Valor Presente': valoracion['valor_presente_total'],
+        'Es_Total': True
     }
 
-    num_periodos_bono = periodos_bono[frecuencia_bono]
-    total_periodos_bono = plazo_bono * num_periodos_bono
+    return {
+        'df_flujos': df_flujos,
+        **{clave: valor for clave, valor in valoracion.items() if clave not in ('anios', 'flujos', 'valores_presentes')}
+    }
 
-    tasa_cupon_periodica = convertir_tea_a_periodica(tasa_cupon, frecuencia_bono)
-    tasa_descuento_periodica = convertir_tea_a_periodica(tea_bono, frecuencia_bono)
 
-    cupon = valor_nominal * tasa_cupon_periodica
+def calcular_valoracion_bono_con_opcion(valor_nominal, tasa_cupon, frecuencia_bono, plazo_bono, tea_bono,
+                                        volatilidad, tipo_opcion, precio_ejercicio, anios_proteccion,
+                                        precio_mercado=None, modelo='ho_lee'):
+    """Valoración de un bono rescatable o con opción de venta sobre un árbol binomial de tasas"""
+    num_periodos_bono = PERIODOS_BONO[frecuencia_bono]
+    cupon = valor_nominal * convertir_tea_a_periodica(tasa_cupon, frecuencia_bono)
 
-    # Calcular flujos y valor presente
-    flujos = []
-    valor_presente_total = 0
+    return valorar_bono_con_opcion(
+        valor_nominal, cupon, num_periodos_bono, plazo_bono * num_periodos_bono, tea_bono,
+        volatilidad, tipo_opcion, precio_ejercicio, anios_proteccion, precio_mercado, modelo
+    )
 
-    # Períodos 0 a n-1 (flujos normales)
-    for i in range(total_periodos_bono):
-        if i == total_periodos_bono - 1:  # Último período
-            flujo = cupon + valor_nominal  # Cupón + principal
-        else:
-            flujo = cupon  # Períodos intermedios: solo cupón
 
-        # El período i corresponde al año (i + 1) / num_periodos_bono
-        año = (i + 1) / num_periodos_bono
-        vp = flujo / ((1 + tasa_descuento_periodica) ** (i + 1))
-        valor_presente_total += vp
+def mostrar_tasas_estocasticas(valor_nominal, cupon, num_periodos_bono, total_periodos_bono, tea_bono):
+    """Distribución del valor del bono al horizonte con tasas cortas simuladas, VaR y pérdida esperada"""
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        modelo = st.selectbox("Modelo", ["Vasicek", "CIR"], key="modelo_tasa_corta")
+        horizonte = st.number_input("Horizonte (años)", min_value=0.1, max_value=float(total_periodos_bono / num_periodos_bono),
+                                    value=min(1.0, total_periodos_bono / num_periodos_bono), step=0.25,
+                                    key="horizonte_tasa_corta")
+    with col2:
+        tasa_largo_plazo = st.number_input("Tasa de largo plazo (%)", min_value=0.0, max_value=50.0,
+                                           value=round(float(np.log1p(tea_bono / 100) * 100), 2), step=0.25,
+                                           key="media_tasa_corta",
+                                           help="Nivel al que revierte la tasa corta (composición continua)")
+        velocidad = st.number_input("Velocidad de reversión", min_value=0.01, max_value=5.0, value=0.2, step=0.05,
+                                    key="velocidad_tasa_corta")
+    with col3:
+        volatilidad = st.number_input(
+            "Volatilidad (%)", min_value=0.01, max_value=50.0, value=1.0 if modelo == "Vasicek" else 5.0, step=0.25,
+            help="Vasicek: volatilidad absoluta anual de la tasa. CIR: se multiplica por la raíz de la tasa",
+            key=f"volatilidad_tasa_corta_{modelo}"
+        )
+        nivel_confianza = st.selectbox("Nivel de confianza", [0.95, 0.99], format_func=lambda x: f"{x:.0%}",
+                                       key="confianza_tasa_corta")
+    with col4:
+        num_trayectorias = st.number_input("Número de trayectorias", min_value=1000, max_value=100000,
+                                           value=100000, step=10000, key="trayectorias_tasa_corta")
+        semilla = st.number_input("Semilla aleatoria", min_value=0, value=42, step=1, key="semilla_tasa_corta")
+
+    if not st.checkbox("▶️ Ejecutar simulación", key="ejecutar_tasas_estocasticas"):
+        return
+
+    with st.spinner("🎲 Simulando tasas cortas..."):
+        simulacion = simular_precios_bono(
+            valor_nominal, cupon, num_periodos_bono, total_periodos_bono, modelo.lower(),
+            tasa_inicial=np.log1p(tea_bono / 100), velocidad=velocidad, media=tasa_largo_plazo / 100,
+            volatilidad=volatilidad / 100, horizonte=horizonte, num_trayectorias=int(num_trayectorias),
+            nivel_confianza=nivel_confianza, semilla=int(semilla)
+        )
 
-        flujos.append({
-            'Periodo': i,  # 0, 1, 2, ..., 14
-            'Año': round(año, 2),
-            'Flujo': flujo,
-            'Valor Presente': vp,
-            'Es_Total': False
-        })
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("💎 Precio Actual (modelo)", formato_moneda(simulacion['precio_actual']))
+    with col2:
+        st.metric("📊 Valor Esperado al Horizonte", formato_moneda(simulacion['valor_esperado']),
+                  help="Precio al horizonte más los cupones cobrados y capitalizados a la tasa corta")
+    with col3:
+        st.metric(f"📉 VaR {nivel_confianza:.0%}", formato_moneda(simulacion['var']),
+                  help="Pérdida frente al valor esperado al horizonte que no se supera con el nivel de confianza indicado")
+    with col4:
+        st.metric(f"⚠️ Pérdida Esperada (ES) {nivel_confianza:.0%}", formato_moneda(simulacion['es']),
+                  help="Pérdida promedio en los escenarios peores que el VaR")
+
+    fig = go.Figure()
+    fig.add_trace(go.Histogram(
+        x=simulacion['ganancia'],
+        nbinsx=80,
+        marker_color='#6366f1',
+        name='Ganancia / Pérdida',
+        hovertemplate='<b>G/P:</b> %{x:$,.2f}<br><b>Trayectorias:</b> %{y:,}<extra></extra>'
+    ))
+    fig.add_vline(x=simulacion['valor_esperado'] - simulacion['var'] - simulacion['precio_actual'],
+                  line_dash="dash", line_color="red",
+                  annotation_text=f"VaR {nivel_confianza:.0%}")
+    fig.update_layout(
+        title=f"Distribución de Ganancias y Pérdidas a {horizonte:g} años ({int(num_trayectorias):,} trayectorias)",
+        xaxis_title="Ganancia / Pérdida (USD)",
+        yaxis_title="Trayectorias",
+        height=400,
+        template='plotly_white',
+        showlegend=False
+    )
+    st.plotly_chart(fig, use_container_width=True, key="grafico_tasas_estocasticas")
+
+
+def mostrar_riesgo_credito(valor_nominal, resultados, tea_bono, precio_mercado):
+    """Valor con probabilidad de default y recuperación, y Z-spreads del modelo y de mercado"""
+    if not st.checkbox("▶️ Calcular valoración", key="calcular_riesgo_credito"):
+        return
+
+    col_cr1, col_cr2 = st.columns([2, 1])
+    with col_cr1:
+        df_hazard = st.data_editor(
+            pd.DataFrame({'Hasta el año': [1.0, 3.0, 5.0, 10.0], 'Tasa de default anual (%)': [1.0, 1.5, 2.0, 2.5]}),
+            num_rows="dynamic", use_container_width=True, hide_index=True, key="tabla_hazard_bonos"
+        ).dropna().sort_values('Hasta el año')
+    with col_cr2:
+        recuperacion = st.slider("Tasa de recuperación (%)", min_value=0, max_value=100, value=40, step=5,
+                                 key="recuperacion_bonos")
+
+    if df_hazard.empty or (df_hazard['Hasta el año'] <= 0).any() or df_hazard['Hasta el año'].duplicated().any():
+        st.warning("⚠️ Ingresa plazos positivos y distintos para la estructura de tasas de default")
+    else:
+        anios_flujos = np.arange(1, resultados['total_periodos_bono'] + 1) / resultados['num_periodos_bono']
+        flujos_credito = flujos_bono(valor_nominal, resultados['cupon'], resultados['total_periodos_bono'])
+        supervivencia = probabilidades_supervivencia(anios_flujos, df_hazard['Hasta el año'].to_numpy(),
+                                                     df_hazard['Tasa de default anual (%)'].to_numpy() / 100)
+        credito = precio_con_riesgo_credito(
+            flujos_credito, anios_flujos,
+            factores_descuento(resultados['tasa_descuento_periodica'], resultados['total_periodos_bono']),
+            supervivencia, valor_nominal, recuperacion / 100
+        )
 
-    # FILA FINAL - Solo con el total del valor presente
-    # Usar NaN para mantener el tipo numérico de la columna Año
-    flujos.append({
-        'Periodo': total_periodos_bono,  # 15
-        'Año': float('nan'),  # Usar NaN en lugar de string
-        'Flujo': float('nan'),  # Usar NaN en lugar de string
-        'Valor Presente': valor_presente_total,
-        'Es_Total': True
-    })
+        try:
+            tasas_cero = curva_local().tasa_cero(anios_flujos) / 100
+            referencia_z = "curva cero local"
+        except OSError:
+            tasas_cero = np.full(len(anios_flujos), tea_bono / 100)
+            referencia_z = "TEA requerida"
+        z_spread = calcular_z_spread([credito['precio'], precio_mercado], flujos_credito, anios_flujos, tasas_cero)
+
+        col_m1, col_m2, col_m3, col_m4 = st.columns(4)
+        with col_m1:
+            st.metric("💎 Valor con Riesgo de Crédito", formato_moneda(credito['precio']),
+                      delta=formato_moneda(credito['precio'] - credito['precio_sin_riesgo']))
+        with col_m2:
+            st.metric("⚠️ Prob. de Default al Vencimiento", f"{credito['prob_default_total'] * 100:.2f}%")
+        with col_m3:
+            st.metric("📏 Z-spread del Modelo", f"{z_spread[0] * 10000:.1f} pb",
+                      help=f"Spread sobre la {referencia_z} que reproduce el valor con riesgo de crédito")
+        with col_m4:
+            if np.isnan(z_spread[1]):
+                st.warning("⚠️ No existe un Z-spread razonable para el precio de mercado")
+            else:
+                st.metric("📊 Z-spread de Mercado", f"{z_spread[1] * 10000:.1f} pb",
+                          help=f"Spread sobre la {referencia_z} que iguala los flujos al precio de mercado "
+                               f"({formato_moneda(precio_mercado)})")
+
+        fig_credito = go.Figure()
+        fig_credito.add_trace(go.Scatter(
+            x=anios_flujos,
+            y=supervivencia * 100,
+            mode='lines+markers',
+            name='Supervivencia',
+            line=dict(color='#10B981', width=3),
+            hovertemplate='<b>Año:</b> %{x:.2f}<br><b>Supervivencia:</b> %{y:.2f}%<extra></extra>'
+        ))
+        fig_credito.add_trace(go.Bar(
+            x=anios_flujos,
+            y=credito['prob_default'] * 100,
+            name='Prob. de default en el período',
+            marker_color='#EF4444',
+            yaxis='y2',
+            hovertemplate='<b>Año:</b> %{x:.2f}<br><b>Default:</b> %{y:.3f}%<extra></extra>'
+        ))
+        fig_credito.update_layout(
+            xaxis_title="Año",
+            yaxis=dict(title="Probabilidad de supervivencia (%)"),
+            yaxis2=dict(title="Prob. de default (%)", overlaying='y', side='right'),
+            height=400,
+            template='plotly_white',
+            hovermode='x unified'
+        )
+        st.plotly_chart(fig_credito, use_container_width=True, key="grafico_credito_bonos")
 
-    df_flujos = pd.DataFrame(flujos)
 
-    return {
-        'df_flujos': df_flujos,
-        'valor_presente_total': valor_presente_total,
-        'cupon': cupon,
-        'tasa_cupon_periodica': tasa_cupon_periodica,
-        'tasa_descuento_periodica': tasa_descuento_periodica,
-        'num_periodos_bono': num_periodos_bono,
-        'total_periodos_bono': total_periodos_bono
-    }
+def mostrar_bono_indexado(valor_nominal, frecuencia_bono, plazo_bono, tea_bono):
+    """Valoración del mismo bono indexado a inflación (VAC) con la serie local del índice de precios"""
+    if not st.checkbox("▶️ Calcular valoración", key="calcular_bono_vac"):
+        return
+
+    try:
+        fechas_ipc, valores_ipc = cargar_ipc()
+    except OSError:
+        st.error("❌ No se encontró la serie de inflación `data/ipc.csv`")
+    else:
+        st.markdown(f"Principal y cupones se ajustan por el índice de precios (`data/ipc.csv`, último dato "
+                    f"{fechas_ipc[-1]}: {valores_ipc[-1]:.2f}); los flujos se descuentan con la tasa real.")
+        inflacion_reciente = inflacion_anual(valores_ipc)
+
+        col_v1, col_v2, col_v3, col_v4 = st.columns(4)
+        with col_v1:
+            opciones_base = [str(f) for f in fechas_ipc[::-1]]
+            fecha_base = st.selectbox("Fecha base (emisión)", opciones_base, index=min(36, len(opciones_base) - 1),
+                                      key="fecha_base_vac")
+        with col_v2:
+            inflacion_esperada = st.number_input("Inflación esperada (% anual)", min_value=-5.0, max_value=50.0,
+                                                 value=round(float(inflacion_reciente), 2), step=0.25,
+                                                 help=f"Por defecto, la inflación de los últimos 12 meses ({inflacion_reciente:.2f}%)",
+                                                 key="inflacion_esperada_vac")
+        with col_v3:
+            cupon_real = st.number_input("Cupón real (% TEA)", min_value=0.0, max_value=30.0, value=3.0, step=0.25,
+                                         key="cupon_real_vac")
+        with col_v4:
+            tea_real = st.number_input("Tasa real requerida (% TEA)", min_value=-5.0, max_value=30.0,
+                                       value=round(((1 + tea_bono / 100) / (1 + inflacion_esperada / 100) - 1) * 100, 2),
+                                       step=0.25, help="Por defecto, la TEA requerida del bono deflactada por la inflación esperada",
+                                       key="tea_real_vac")
+
+        ipc_base = valores_ipc[::-1][opciones_base.index(fecha_base)]
+        vac = valorar_bono_indexado(valor_nominal, cupon_real, frecuencia_bono, plazo_bono, tea_real,
+                                    inflacion_esperada, ipc_base, valores_ipc[-1])
+
+        col_m1, col_m2, col_m3, col_m4 = st.columns(4)
+        with col_m1:
+            st.metric("💎 Valor Presente (VAC)", formato_moneda(vac['precio']))
+        with col_m2:
+            st.metric("📊 Factor de Indexación Actual", f"{vac['factor_actual']:.4f}",
+                      help=f"Índice actual / índice base ({ipc_base:.2f})")
+        with col_m3:
+            st.metric("⏳ Duración Real", f"{vac['duracion_modificada']:.4f}",
+                      help="Sensibilidad del precio a la tasa real")
+        with col_m4:
+            st.metric("⚖️ Inflación de Equilibrio", f"{((1 + tea_bono / 100) / (1 + tea_real / 100) - 1) * 100:.2f}%",
+                      help="Inflación que iguala el rendimiento del bono VAC con la TEA nominal requerida")
+
+        fig_vac = go.Figure()
+        fig_vac.add_trace(go.Bar(x=vac['anios'], y=vac['flujos_reales'], name='Flujo real', marker_color='#93C5FD'))
+        fig_vac.add_trace(go.Bar(x=vac['anios'], y=vac['flujos_indexados'], name='Flujo indexado', marker_color='#3B82F6'))
+        fig_vac.add_trace(go.Bar(x=vac['anios'], y=vac['valores_presentes'], name='Valor presente', marker_color='#10B981'))
+        fig_vac.update_layout(
+            xaxis_title="Año",
+            yaxis_title="Valor (USD)",
+            yaxis_type='log',
+            barmode='group',
+            height=400,
+            template='plotly_white',
+            hovermode='x unified'
+        )
+        st.plotly_chart(fig_vac, use_container_width=True, key="grafico_vac_bonos")
+
+
+def mostrar_bono_con_opcion(valor_nominal, tasa_cupon, frecuencia_bono, plazo_bono, tea_bono, precio_mercado):
+    """Valor, OAS y medidas efectivas del bono con opción de rescate o de venta sobre el árbol de tasas"""
+    if not st.checkbox("▶️ Calcular valoración", key="calcular_bono_con_opcion"):
+        return
+
+    col_op1, col_op2, col_op3 = st.columns(3)
+    with col_op1:
+        tipo_opcion = st.radio("Tipo de opción", ["Call (rescatable)", "Put (con opción de venta)"],
+                               key="tipo_opcion_bonos")
+        modelo_arbol = st.selectbox("Modelo de tasas", ["Ho-Lee", "Black-Derman-Toy"], key="modelo_arbol_bonos")
+    with col_op2:
+        precio_ejercicio = st.number_input(
+            "Precio de Ejercicio (USD)", min_value=0.01, value=float(valor_nominal), step=10.0,
+            key="precio_ejercicio_bonos"
+        )
+        anios_proteccion = st.number_input(
+            "Ejercible desde el año", min_value=0.0, max_value=float(plazo_bono), value=float(plazo_bono // 2),
+            step=0.5, help="Período de protección durante el cual la opción no puede ejercerse",
+            key="anios_proteccion_bonos"
+        )
+    with col_op3:
+        es_ho_lee = modelo_arbol == "Ho-Lee"
+        volatilidad = st.number_input(
+            "Volatilidad de la Tasa Corta (%)", min_value=0.0, max_value=100.0,
+            value=1.0 if es_ho_lee else 20.0, step=0.5,
+            help="Ho-Lee: volatilidad absoluta anual de la tasa (p. ej. 1%). BDT: volatilidad proporcional (p. ej. 20%)",
+            key=f"volatilidad_arbol_bonos_{'ho_lee' if es_ho_lee else 'bdt'}"
+        )
+        usar_precio_mercado = st.checkbox("Calcular OAS con el precio de mercado", value=True, key="usar_oas_bonos",
+                                          help=f"Usa el precio de mercado de la sección YTM ({formato_moneda(precio_mercado)})")
+
+    opcion = calcular_valoracion_bono_con_opcion(
+        valor_nominal, tasa_cupon, frecuencia_bono, plazo_bono, tea_bono, volatilidad / 100,
+        'call' if tipo_opcion.startswith("Call") else 'put', precio_ejercicio, anios_proteccion,
+        precio_mercado if usar_precio_mercado else None, 'ho_lee' if es_ho_lee else 'bdt'
+    )
+
+    col_r1, col_r2, col_r3, col_r4 = st.columns(4)
+    with col_r1:
+        st.metric("💎 Valor con Opción (OAS = 0)", formato_moneda(opcion['precio_modelo']))
+    with col_r2:
+        st.metric("🔒 Valor de la Opción", formato_moneda(opcion['valor_opcion']),
+                  help=f"Diferencia frente al bono sin opción valorado en el mismo árbol ({formato_moneda(opcion['precio_sin_opcion'])})")
+    with col_r3:
+        if usar_precio_mercado and np.isnan(opcion['oas_pb']):
+            st.warning("⚠️ No existe un OAS razonable para ese precio")
+        else:
+            st.metric("📏 OAS", f"{opcion['oas_pb']:.1f} pb" if usar_precio_mercado else "—",
+                      help="Spread constante sobre el árbol que iguala el valor del bono al precio de mercado")
+    with col_r4:
+        st.metric("⏳ Duración Efectiva", f"{opcion['duracion_efectiva']:.4f}",
+                  delta=f"Convexidad efectiva: {opcion['convexidad_efectiva']:.2f}", delta_color="off")
 
 
 def show_bonos(nombre):
@@ -439,7 +716,8 @@ def show_bonos(nombre):
         valor_nominal, tasa_cupon, frecuencia_bono, plazo_bono,
         tea_bono, resultados['df_flujos'], resultados['valor_presente_total'],
         resultados['cupon'], resultados['tasa_cupon_periodica'],
-        resultados['tasa_descuento_periodica'], resultados['num_periodos_bono']
+        resultados['tasa_descuento_periodica'], resultados['num_periodos_bono'],
+        riesgo=resultados
     )
 
     # PREPARAR DATOS PARA GRÁFICOS
@@ -556,18 +834,39 @@ def show_bonos(nombre):
     st.divider()
     st.subheader("📉 Análisis de Sensibilidad a Tasas de Interés")
 
-    # Generar datos para el gráfico de sensibilidad
-    tasas_rango = [i / 10 for i in range(10, 201, 5)]  # 1% a 20%
-    valores_sensibilidad = []
+    col_sens1, col_sens2 = st.columns(2)
+    with col_sens1:
+        rango_sensibilidad = st.radio(
+            "Rango de tasas",
+            ["Rango amplio (1% - 20%)", "Zoom ±50 pb", "Personalizado"],
+            horizontal=True,
+            key="rango_sensibilidad_bonos"
+        )
+    with col_sens2:
+        mostrar_aproximacion = st.checkbox(
+            "Mostrar aproximación por duración y convexidad",
+            value=True,
+            key="aprox_sensibilidad_bonos"
+        )
 
-    for tasa in tasas_rango:
-        tasa_per = convertir_tea_a_periodica(tasa, frecuencia_bono)
-        vp = sum([
-            (resultados['cupon'] if i < resultados['total_periodos_bono'] else resultados['cupon'] + valor_nominal) /
-            ((1 + tasa_per) ** i)
-            for i in range(1, resultados['total_periodos_bono'] + 1)
-        ])
-        valores_sensibilidad.append(vp)
+    if rango_sensibilidad == "Zoom ±50 pb":
+        tasa_min, tasa_max = max(tea_bono - 0.5, 0.0), tea_bono + 0.5
+    elif rango_sensibilidad == "Personalizado":
+        tasa_min, tasa_max = st.slider(
+            "Tasas de descuento (%)",
+            min_value=0.0, max_value=50.0, value=(max(tea_bono - 5.0, 0.0), tea_bono + 5.0), step=0.05,
+            key="slider_sensibilidad_bonos"
+        )
+    else:
+        tasa_min, tasa_max = 1.0, 20.0
+
+    # Generar datos para el gráfico de sensibilidad (precio exacto por fórmula cerrada)
+    sensibilidad = curva_sensibilidad(
+        valor_nominal, resultados['cupon'], resultados['total_periodos_bono'], frecuencia_bono,
+        tea_bono, tasa_min, tasa_max
+    )
+    tasas_rango = sensibilidad['tasas']
+    valores_sensibilidad = sensibilidad['precios']
 
     fig_sensibilidad = go.Figure()
 
@@ -578,12 +877,31 @@ def show_bonos(nombre):
         mode='lines',
         name='Valor del Bono',
         line=dict(color='#6366f1', width=3),
-        fill='tozeroy',
+        # Sin relleno al hacer zoom para que el eje Y no se fuerce a cero
+        fill='tozeroy' if rango_sensibilidad == "Rango amplio (1% - 20%)" else None,
         fillcolor='rgba(99, 102, 241, 0.2)',
         hovertemplate='<b>Tasa:</b> %{x:.2f}%<br><b>Valor:</b> $%{y:,.2f}<extra></extra>',
         showlegend=True
     ))
 
+    if mostrar_aproximacion:
+        fig_sensibilidad.add_trace(go.Scatter(
+            x=tasas_rango,
+            y=sensibilidad['aprox_duracion'],
+            mode='lines',
+            name='Aproximación por Duración',
+            line=dict(color='#f59e0b', width=2, dash='dash'),
+            hovertemplate='<b>Tasa:</b> %{x:.2f}%<br><b>Duración:</b> $%{y:,.2f}<extra></extra>'
+        ))
+        fig_sensibilidad.add_trace(go.Scatter(
+            x=tasas_rango,
+            y=sensibilidad['aprox_convexidad'],
+            mode='lines',
+            name='Duración + Convexidad',
+            line=dict(color='#ec4899', width=2, dash='dot'),
+            hovertemplate='<b>Tasa:</b> %{x:.2f}%<br><b>Dur. + Conv.:</b> $%{y:,.2f}<extra></extra>'
+        ))
+
     # Línea de referencia del Valor Nominal
     fig_sensibilidad.add_trace(go.Scatter(
         x=[min(tasas_rango), max(tasas_rango)],
@@ -682,6 +1000,319 @@ def show_bonos(nombre):
                    "si las condiciones del mercado mejoran (tasa baja) o empeoran (tasa alta). "
                    "Esto te ayuda a evaluar el riesgo de tasa de interés.")
 
+    # RENDIMIENTO AL VENCIMIENTO DESDE PRECIO DE MERCADO
+    st.divider()
+    st.subheader("🔁 Rendimiento al Vencimiento (YTM) desde Precio de Mercado")
+
+    col_ytm1, col_ytm2 = st.columns(2)
+    with col_ytm1:
+        precio_mercado = st.number_input(
+            "Precio de Mercado (USD)",
+            min_value=0.01, value=round(float(resultados['valor_presente_total']), 2), step=1.0,
+            help="Precio al que cotiza el bono; se calcula la TEA que iguala el valor presente a este precio",
+            key="precio_mercado_bonos"
+        )
+
+    ytm_tea, _ = calcular_ytm(precio_mercado, valor_nominal, tasa_cupon, plazo_bono, frecuencia_bono)
+    with col_ytm2:
+        if np.isnan(ytm_tea):
+            st.warning("⚠️ No existe un rendimiento razonable para ese precio")
+        else:
+            st.metric(
+                "📊 YTM (% TEA)",
+                f"{ytm_tea:.4f}%",
+                delta=f"{(ytm_tea - tea_bono) * 100:+.1f} pb vs tasa requerida",
+                delta_color="off"
+            )
+
+    with st.expander("📂 Calcular YTM para un inventario de bonos (CSV)", expanded=False):
+        st.markdown("El archivo debe tener las columnas `precio`, `valor_nominal`, `tasa_cupon` (% TEA), "
+                    "`plazo` (años) y `frecuencia` (Mensual, Bimestral, Trimestral, Cuatrimestral, Semestral, Anual).")
+        archivo_ytm = st.file_uploader("Inventario de bonos", type=["csv"], key="archivo_ytm_bonos")
+
+        if archivo_ytm is not None:
+            df_inventario = pd.read_csv(archivo_ytm)
+            columnas = ['precio', 'valor_nominal', 'tasa_cupon', 'plazo', 'frecuencia']
+            faltantes = [c for c in columnas if c not in df_inventario.columns]
+
+            if faltantes:
+                st.error(f"❌ Faltan columnas en el archivo: {', '.join(faltantes)}")
+            else:
+                try:
+                    validar_cartera(df_inventario['frecuencia'].to_numpy(), df_inventario['plazo'].to_numpy())
+                except ValueError as e:
+                    st.error(f"❌ Inventario no válido: {e}")
+                else:
+                    df_inventario['ytm_tea'], iteraciones = calcular_ytm(
+                        df_inventario['precio'].to_numpy(), df_inventario['valor_nominal'].to_numpy(),
+                        df_inventario['tasa_cupon'].to_numpy(), df_inventario['plazo'].to_numpy(),
+                        df_inventario['frecuencia'].to_numpy()
+                    )
+                    st.caption(f"✅ {len(df_inventario):,} bonos resueltos en {iteraciones} iteraciones vectorizadas")
+                    st.dataframe(df_inventario, use_container_width=True, hide_index=True)
+                    st.download_button(
+                        label="📥 Descargar YTM (CSV)",
+                        data=df_inventario.to_csv(index=False).encode('utf-8'),
+                        file_name=f"ytm_inventario_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                        mime="text/csv",
+                        key="descargar_ytm_bonos"
+                    )
+
+    # RENDIMIENTO AL HORIZONTE
+    st.divider()
+    st.subheader("🔄 Rendimiento al Horizonte y Riesgo de Reinversión")
+    st.markdown("Capitaliza cada cupón a una tasa de reinversión hasta el fin del período de tenencia y vende "
+                "los flujos restantes a la TEA de venta; el resultado es el rendimiento compuesto realizado.")
+
+    col_h1, col_h2, col_h3 = st.columns(3)
+    with col_h1:
+        horizonte = st.number_input("Horizonte de tenencia (años)", min_value=0.5, max_value=float(plazo_bono),
+                                    value=float(plazo_bono), step=0.5, key="horizonte_tenencia_bonos")
+    with col_h2:
+        tasa_reinversion = st.number_input("Tasa de reinversión (% TEA)", min_value=0.0, max_value=50.0,
+                                           value=float(tea_bono), step=0.25, key="tasa_reinversion_bonos")
+    with col_h3:
+        tea_venta = st.number_input("TEA de venta al horizonte (%)", min_value=0.0, max_value=50.0,
+                                    value=float(tea_bono), step=0.25, key="tea_venta_bonos",
+                                    help="Tasa a la que se valoran los flujos pendientes si el horizonte es anterior al vencimiento")
+
+    anios_flujos = np.arange(1, resultados['total_periodos_bono'] + 1) / resultados['num_periodos_bono']
+    flujos_horizonte = flujos_bono(valor_nominal, resultados['cupon'], resultados['total_periodos_bono'])
+    tasas_grilla = np.linspace(0, max(20.0, 2 * tasa_reinversion), 401)
+    horizonte_grilla = rendimiento_horizonte(flujos_horizonte, anios_flujos, precio_mercado, horizonte,
+                                             np.append(tasas_grilla, tasa_reinversion), tea_venta)
+    rcy_grilla, rcy = horizonte_grilla['rendimiento_realizado'][:-1], horizonte_grilla['rendimiento_realizado'][-1]
+
+    col_h1, col_h2, col_h3, col_h4 = st.columns(4)
+    with col_h1:
+        st.metric("📈 Rendimiento Realizado", f"{rcy:.4f}% TEA",
+                  delta=f"{(rcy - ytm_tea) * 100:+.1f} pb vs YTM" if not np.isnan(ytm_tea) else None, delta_color="off")
+    with col_h2:
+        st.metric("💰 Valor al Horizonte", formato_moneda(horizonte_grilla['valor_horizonte'][-1]),
+                  help=f"Invirtiendo {formato_moneda(precio_mercado)} (precio de mercado) al inicio")
+    with col_h3:
+        st.metric("🔁 Intereses sobre Cupones", formato_moneda(horizonte_grilla['intereses_sobre_intereses'][-1]))
+    with col_h4:
+        st.metric("🏷️ Precio de Venta", formato_moneda(horizonte_grilla['precio_venta']))
+
+    fig_horizonte = go.Figure()
+    fig_horizonte.add_trace(go.Scatter(
+        x=tasas_grilla,
+        y=rcy_grilla,
+        mode='lines',
+        name='Rendimiento realizado',
+        line=dict(color='#6366f1', width=3),
+        hovertemplate='<b>Reinversión:</b> %{x:.2f}%<br><b>Rendimiento:</b> %{y:.4f}%<extra></extra>'
+    ))
+    fig_horizonte.add_trace(go.Scatter(
+        x=[tasa_reinversion],
+        y=[rcy],
+        mode='markers',
+        name='Escenario elegido',
+        marker=dict(size=12, color='#ef4444')
+    ))
+    if not np.isnan(ytm_tea):
+        fig_horizonte.add_hline(y=ytm_tea, line_dash="dash", line_color="green",
+                                annotation_text=f"YTM: {ytm_tea:.2f}%")
+    fig_horizonte.update_layout(
+        title=f"Rendimiento Compuesto Realizado a {horizonte:g} años vs Tasa de Reinversión",
+        xaxis_title="Tasa de Reinversión (% TEA)",
+        yaxis_title="Rendimiento Realizado (% TEA)",
+        height=400,
+        template='plotly_white',
+        hovermode='x unified'
+    )
+    st.plotly_chart(fig_horizonte, use_container_width=True, key="grafico_horizonte_bonos")
+
+    # VALORACIÓN CON CURVA DE TASAS
+    st.divider()
+    st.subheader("📈 Valoración con Curva de Tasas")
+    st.markdown("Descuenta cada flujo con la tasa cero de su plazo, obtenida por *bootstrapping* "
+                "de la tabla local de tasas de depósito y tasas par (`data/curva_tasas.csv`).")
+
+    metodo_curva = st.radio(
+        "Interpolación de la curva",
+        ["Lineal", "Cúbica monótona"],
+        horizontal=True,
+        key="metodo_curva_bonos"
+    )
+
+    try:
+        curva = curva_local('lineal' if metodo_curva == "Lineal" else 'cubica_monotona')
+    except OSError:
+        st.error("❌ No se encontró la tabla de tasas `data/curva_tasas.csv`")
+    else:
+        precio_curva = precio_con_curva(curva, valor_nominal, resultados['cupon'], frecuencia_bono,
+                                        resultados['total_periodos_bono'])
+        ytm_curva, _ = calcular_ytm(precio_curva, valor_nominal, tasa_cupon, plazo_bono, frecuencia_bono)
+
+        col_c1, col_c2, col_c3 = st.columns(3)
+        with col_c1:
+            st.metric("💎 Precio con Curva", formato_moneda(precio_curva))
+        with col_c2:
+            st.metric("📊 Precio con TEA Plana", formato_moneda(resultados['valor_presente_total']),
+                      delta=formato_moneda(resultados['valor_presente_total'] - precio_curva), delta_color="off")
+        with col_c3:
+            st.metric("🔁 Rendimiento Equivalente", f"{ytm_curva:.4f}% TEA",
+                      help="TEA única que reproduce el precio obtenido con la curva")
+
+        plazos_grafico = np.linspace(0, max(curva.plazos[-1], plazo_bono), 600)
+        fig_curva = go.Figure()
+        fig_curva.add_trace(go.Scatter(
+            x=plazos_grafico,
+            y=curva.tasa_cero(plazos_grafico),
+            mode='lines',
+            name='Tasa Cero',
+            line=dict(color='#3B82F6', width=3),
+            hovertemplate='<b>Plazo:</b> %{x:.2f} años<br><b>Tasa cero:</b> %{y:.4f}%<extra></extra>'
+        ))
+        fig_curva.add_trace(go.Scatter(
+            x=curva.plazos,
+            y=curva.tasas_cero,
+            mode='markers',
+            name='Nodos',
+            marker=dict(size=8, color='#1E40AF'),
+            hovertemplate='<b>Plazo:</b> %{x:.2f} años<br><b>Tasa cero:</b> %{y:.4f}%<extra></extra>'
+        ))
+        fig_curva.add_hline(y=tea_bono, line_dash="dash", line_color="red",
+                            annotation_text=f"TEA requerida: {tea_bono}%")
+        fig_curva.update_layout(
+            xaxis_title="Plazo (años)",
+            yaxis_title="Tasa Cero (% TEA)",
+            height=400,
+            template='plotly_white',
+            hovermode='x unified'
+        )
+        st.plotly_chart(fig_curva, use_container_width=True, key="grafico_curva_bonos")
+
+        # DURACIONES CLAVE: todos los desplazamientos de la curva en una sola operación
+        total_periodos_bono = resultados['total_periodos_bono']
+        krd = duraciones_clave(
+            curva, np.zeros(total_periodos_bono, dtype=int),
+            np.arange(1, total_periodos_bono + 1) / PERIODOS_BONO[frecuencia_bono],
+            flujos_bono(valor_nominal, resultados['cupon'], total_periodos_bono)
+        )
+        st.plotly_chart(grafico_duraciones_clave(krd['duraciones'][0], PLAZOS_CLAVE),
+                        use_container_width=True, key="grafico_duraciones_clave_bonos")
+        st.caption("💡 Cada barra mide la variación porcentual del precio ante un movimiento de 1% de la "
+                   "curva cero concentrado en ese plazo; la suma equivale a la duración efectiva.")
+
+    # RIESGO DE CRÉDITO
+    st.divider()
+    with st.expander("🏦 Valoración con Riesgo de Crédito", expanded=False):
+        st.markdown("Ajusta el valor del bono por la probabilidad de default (estructura de tasas de default por plazo) "
+                    "y la tasa de recuperación, y calcula el Z-spread implícito en el precio de mercado.")
+        mostrar_riesgo_credito(valor_nominal, resultados, tea_bono, precio_mercado)
+
+    # BONO INDEXADO A INFLACIÓN
+    st.divider()
+    with st.expander("🧾 Bono Indexado a Inflación (VAC)", expanded=False):
+        mostrar_bono_indexado(valor_nominal, frecuencia_bono, plazo_bono, tea_bono)
+
+    # BONO CON OPCIÓN INCORPORADA
+    st.divider()
+    with st.expander("🛡️ Bono con Opción de Rescate o de Venta", expanded=False):
+        st.markdown("Valora el mismo bono con una opción de rescate anticipado del emisor (*call*) o de venta "
+                    "del tenedor (*put*) mediante un árbol binomial recombinante de tasas cortas calibrado a la TEA.")
+        mostrar_bono_con_opcion(valor_nominal, tasa_cupon, frecuencia_bono, plazo_bono, tea_bono, precio_mercado)
+
+    # TASAS ESTOCÁSTICAS
+    st.divider()
+    with st.expander("🎲 Tasas Estocásticas: Distribución de Precios, VaR y ES", expanded=False):
+        st.markdown("Simula la tasa corta con Vasicek o CIR y revalúa el bono en cada trayectoria al horizonte elegido.")
+        mostrar_tasas_estocasticas(valor_nominal, resultados['cupon'], resultados['num_periodos_bono'],
+                                   resultados['total_periodos_bono'], tea_bono)
+
+    # ESTRUCTURAS DE FLUJOS DE CAJA
+    st.divider()
+    st.subheader("🧮 Estructuras de Flujos de Caja")
+    st.markdown("Genera el cronograma de bonos amortizables, con fondo de amortización, step-up o flotantes "
+                "y valóralos con la misma TEA requerida.")
+
+    col_e1, col_e2 = st.columns(2)
+    with col_e1:
+        tipo_cupon = st.selectbox("Tipo de cupón", ["Fijo", "Step-up", "Flotante"], key="tipo_cupon_estructura")
+        estructura = st.selectbox(
+            "Amortización del principal",
+            ["Bullet", "Cuota constante (francés)", "Amortización constante (alemán)", "Fondo de amortización"],
+            key="amortizacion_estructura"
+        )
+    with col_e2:
+        parametros = {}
+        if tipo_cupon == "Fijo":
+            parametros['tasa_cupon'] = tasa_cupon
+            st.info(f"💡 Se usa la tasa cupón del bono: {tasa_cupon}% TEA")
+        elif tipo_cupon == "Step-up":
+            incremento = st.number_input("Incremento del cupón (% TEA)", min_value=0.0, max_value=10.0,
+                                         value=0.5, step=0.25, key="incremento_step_up")
+            cada_anios = st.number_input("Cada cuántos años", min_value=1, max_value=max(1, plazo_bono),
+                                         value=min(2, plazo_bono), step=1, key="cada_anios_step_up")
+            parametros['escalones'] = [(anio, tasa_cupon + incremento * k)
+                                       for k, anio in enumerate(range(0, plazo_bono, cada_anios))]
+        else:
+            parametros['spread_pb'] = st.number_input("Spread sobre el índice (pb)", min_value=-500.0, max_value=2000.0,
+                                                      value=150.0, step=10.0, key="spread_flotante",
+                                                      help="El índice proyectado se lee de data/indice_tasas.csv")
+
+        if estructura == "Fondo de amortización":
+            parametros['anio_inicio_fondo'] = st.number_input("Retiros desde el año", min_value=1, max_value=max(1, plazo_bono),
+                                                              value=min(2, plazo_bono), step=1, key="inicio_fondo")
+            parametros['porcentaje_fondo'] = st.number_input("Retiro anual (% del nominal)", min_value=0.0, max_value=100.0,
+                                                             value=10.0, step=5.0, key="porcentaje_fondo")
+
+    amortizacion = {
+        "Bullet": 'bullet',
+        "Cuota constante (francés)": 'cuota_constante',
+        "Amortización constante (alemán)": 'amortizacion_constante',
+        "Fondo de amortización": 'fondo_amortizacion'
+    }[estructura]
+
+    try:
+        cronograma = generar_cronograma(valor_nominal, frecuencia_bono, plazo_bono, amortizacion=amortizacion, **parametros)
+    except OSError:
+        st.error("❌ No se encontró la tabla del índice `data/indice_tasas.csv`")
+    else:
+        riesgo_estructura = duracion_convexidad(cronograma['flujo'], cronograma['anios'], tea_bono)
+
+        col_m1, col_m2, col_m3, col_m4 = st.columns(4)
+        with col_m1:
+            st.metric("💎 Valor Presente", formato_moneda(riesgo_estructura['precio']))
+        with col_m2:
+            st.metric("⏳ Duración de Macaulay", f"{riesgo_estructura['duracion_macaulay']:.4f} años")
+        with col_m3:
+            st.metric("🌀 Convexidad", f"{riesgo_estructura['convexidad']:.4f}")
+        with col_m4:
+            st.metric("🎯 DV01", formato_moneda(riesgo_estructura['dv01']))
+
+        df_cronograma = pd.DataFrame({
+            'Periodo': cronograma['periodo'],
+            'Año': np.round(cronograma['anios'], 2),
+            'Saldo Inicial': cronograma['saldo_inicial'],
+            'Tasa Periódica (%)': cronograma['tasa_periodica'] * 100,
+            'Interés': cronograma['interes'],
+            'Amortización': cronograma['amortizacion'],
+            'Flujo': cronograma['flujo'],
+            'Saldo Final': cronograma['saldo_final']
+        }).round(4)
+
+        fig_cronograma = go.Figure()
+        fig_cronograma.add_trace(go.Bar(x=df_cronograma['Año'], y=df_cronograma['Interés'], name='Interés',
+                                        marker_color='#3B82F6'))
+        fig_cronograma.add_trace(go.Bar(x=df_cronograma['Año'], y=df_cronograma['Amortización'], name='Amortización',
+                                        marker_color='#10B981'))
+        fig_cronograma.update_layout(
+            xaxis_title="Año",
+            yaxis_title="Flujo (USD)",
+            barmode='stack',
+            height=400,
+            template='plotly_white',
+            hovermode='x unified'
+        )
+        st.plotly_chart(fig_cronograma, use_container_width=True, key="grafico_cronograma_bonos")
+
+        with st.expander("📋 Ver cronograma completo", expanded=False):
+            st.dataframe(df_cronograma, use_container_width=True, hide_index=True)
+
     # SECCIÓN: EXPORTACIÓN
     st.divider()
 
@@ -706,7 +1337,7 @@ def show_bonos(nombre):
                 valor_nominal, tasa_cupon, frecuencia_bono, plazo_bono,
                 tea_bono, resultados['df_flujos'], resultados['valor_presente_total'],
                 resultados['cupon'], resultados['tasa_cupon_periodica'],
-                resultados['tasa_descuento_periodica']
+                resultados['tasa_descuento_periodica'], riesgo=resultados
             )
 
             st.download_button(
@@ -747,6 +1378,7 @@ def show_bonos(nombre):
                 pdf_buffer_email = io.BytesIO(pdf_buffer.getvalue())
 
                 with st.spinner("📤 Enviando reporte..."):
+                    from utils.email import enviar_email_con_pdf_gmail
                     exito, resultado = enviar_email_con_pdf_gmail(
                         email_dest,
                         nombre_dest,
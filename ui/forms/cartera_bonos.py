@@ -0,0 +1,320 @@
+from utils.utils import formato_moneda
+from core.cartera_bonos import COLUMNAS_CARTERA, valorar_cartera, cartera_ejemplo, duraciones_clave_cartera
+from core.curva import PLAZOS_CLAVE, curva_local
+from core.var_historico import HORIZONTES_VAR, var_historico
+from core.inmunizacion import analitica_pasivos, inmunizar
+from ui.results.res_mod_c import grafico_duraciones_clave
+import pandas as pd
+import streamlit as st
+import plotly.graph_objects as go
+from datetime import datetime
+
+
+def cargar_cartera(archivo):
+    """Lee la cartera desde un archivo CSV o Parquet"""
+    if archivo.name.lower().endswith('.parquet'):
+        return pd.read_parquet(archivo)
+    return pd.read_csv(archivo)
+
+
+def mostrar_var_historico(curva, df_cartera):
+    """VaR y pérdida esperada históricos a 1 y 10 días con el histograma de ganancias y pérdidas"""
+    nivel_confianza = st.radio("Nivel de confianza", [0.95, 0.99], index=1, horizontal=True,
+                               format_func=lambda x: f"{x:.0%}", key="confianza_var_historico")
+
+    try:
+        var = var_historico(
+            curva, df_cartera['valor_nominal'].to_numpy(), df_cartera['tasa_cupon'].to_numpy(),
+            df_cartera['frecuencia'].to_numpy(), df_cartera['plazo'].to_numpy(),
+            df_cartera['cantidad'].to_numpy() if 'cantidad' in df_cartera.columns else None,
+            nivel_confianza=nivel_confianza
+        )
+    except OSError:
+        st.error("❌ No se encontró el histórico de tasas `data/historico_tasas.csv`")
+        return
+
+    columnas = st.columns(2 * len(HORIZONTES_VAR))
+    for i, dias in enumerate(HORIZONTES_VAR):
+        horizonte = var['horizontes'][dias]
+        with columnas[2 * i]:
+            st.metric(f"📉 VaR {dias} día{'s' if dias > 1 else ''}", formato_moneda(horizonte['var']),
+                      delta=f"{horizonte['var'] / var['valor_actual'] * 100:.2f}% de la cartera", delta_color="off")
+        with columnas[2 * i + 1]:
+            st.metric(f"⚠️ ES {dias} día{'s' if dias > 1 else ''}", formato_moneda(horizonte['es']),
+                      help="Pérdida promedio en los escenarios peores que el VaR")
+
+    dias = st.radio("Horizonte del gráfico", HORIZONTES_VAR, horizontal=True,
+                    format_func=lambda d: f"{d} día{'s' if d > 1 else ''}", key="horizonte_var_historico")
+    horizonte = var['horizontes'][dias]
+
+    fig = go.Figure()
+    fig.add_trace(go.Histogram(
+        x=horizonte['ganancias'],
+        nbinsx=80,
+        marker_color='#3B82F6',
+        hovertemplate='<b>G/P:</b> %{x:$,.0f}<br><b>Escenarios:</b> %{y:,}<extra></extra>'
+    ))
+    fig.add_vline(x=-horizonte['var'], line_dash="dash", line_color="red",
+                  annotation_text=f"VaR {nivel_confianza:.0%}")
+    fig.update_layout(
+        title=f"Ganancias y Pérdidas Históricas a {dias} día{'s' if dias > 1 else ''} "
+              f"({len(horizonte['ganancias']):,} escenarios)",
+        xaxis_title="Ganancia / Pérdida (USD)",
+        yaxis_title="Escenarios",
+        height=400,
+        template='plotly_white',
+        showlegend=False
+    )
+    st.plotly_chart(fig, use_container_width=True, key="grafico_var_historico")
+
+
+def mostrar_inmunizacion(df_cartera, bonos):
+    """Optimiza los montos por bono que inmunizan un flujo de pasivos y muestra la cartera resultante"""
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        df_pasivos = st.data_editor(
+            pd.DataFrame({'Año': [float(a) for a in range(1, 11)], 'Monto': [100000.0] * 10}),
+            num_rows="dynamic", use_container_width=True, hide_index=True, key="tabla_pasivos"
+        ).dropna()
+    with col2:
+        tea_pasivos = st.number_input("TEA de descuento de pasivos (%)", min_value=0.0, max_value=50.0,
+                                      value=6.0, step=0.25, key="tea_pasivos")
+        peso_maximo = st.number_input("Peso máximo por bono (%)", min_value=0.1, max_value=100.0, value=5.0,
+                                      step=0.5, key="peso_maximo_inmunizacion")
+        preferencia = st.slider("Preferencia por rendimiento", min_value=0.0, max_value=5.0, value=0.0, step=0.5,
+                                help="0 = cartera más diversificada; valores mayores favorecen bonos de mayor TEA",
+                                key="preferencia_inmunizacion")
+        igualar_convexidad = st.checkbox("Igualar convexidad exactamente", value=False, key="igualar_convexidad")
+
+    df_pasivos = df_pasivos[df_pasivos['Año'] > 0]
+    if df_pasivos.empty:
+        st.warning("⚠️ Ingresa al menos un pasivo con plazo positivo")
+        return
+
+    pasivos = analitica_pasivos(df_pasivos['Monto'].to_numpy(), df_pasivos['Año'].to_numpy(), tea_pasivos)
+    solucion = inmunizar(
+        bonos['precio'], bonos['duracion_modificada'], bonos['convexidad'], pasivos,
+        rendimiento=df_cartera['tea'].to_numpy(), peso_maximo=peso_maximo / 100,
+        preferencia_rendimiento=preferencia, igualar_convexidad=igualar_convexidad
+    )
+
+    if not solucion['convergio']:
+        st.error("❌ No existe una combinación de los bonos cargados que cumpla las restricciones. "
+                 "Prueba con un peso máximo mayor o con pasivos de duración dentro del rango de los bonos.")
+        return
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("💎 VP de Pasivos", formato_moneda(pasivos['precio']),
+                  delta=f"Activos: {formato_moneda(solucion['valor_presente'])}", delta_color="off")
+    with col2:
+        st.metric("📐 Duración Modificada", f"{solucion['duracion_modificada']:.4f}",
+                  delta=f"Pasivos: {pasivos['duracion_modificada']:.4f}", delta_color="off")
+    with col3:
+        st.metric("🌀 Convexidad", f"{solucion['convexidad']:.4f}",
+                  delta=f"Pasivos: {pasivos['convexidad']:.4f}", delta_color="off")
+    with col4:
+        st.metric("📦 Bonos Seleccionados", f"{solucion['num_bonos']:,} de {len(df_cartera):,}")
+
+    df_inmunizacion = df_cartera[COLUMNAS_CARTERA].assign(
+        precio=bonos['precio'],
+        duracion_modificada=bonos['duracion_modificada'],
+        peso=solucion['pesos'] * 100,
+        monto=solucion['montos'],
+        unidades=solucion['unidades']
+    )[solucion['pesos'] > 1e-9].sort_values('monto', ascending=False)
+
+    st.dataframe(df_inmunizacion.round(4), use_container_width=True, hide_index=True)
+    st.download_button(
+        label="📥 Descargar Cartera Inmunizada (CSV)",
+        data=df_inmunizacion.to_csv(index=False).encode('utf-8'),
+        file_name=f"cartera_inmunizada_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+        mime="text/csv",
+        key="descargar_inmunizacion"
+    )
+
+
+def show_cartera_bonos(nombre):
+    st.header("💼 Cartera de Bonos")
+    st.markdown("Valora cientos o miles de bonos a la vez y obtén el calendario agregado de flujos de tu cartera.")
+
+    with st.expander("📖 Formato del archivo", expanded=False):
+        st.markdown("""
+        El archivo (CSV o Parquet) debe tener una fila por posición con las columnas:
+
+        - **valor_nominal**: Valor nominal del bono (USD)
+        - **tasa_cupon**: Tasa cupón (% TEA)
+        - **frecuencia**: Mensual, Bimestral, Trimestral, Cuatrimestral, Semestral o Anual
+        - **plazo**: Años hasta el vencimiento
+        - **tea**: Tasa de retorno requerida (% TEA)
+        - **cantidad** *(opcional)*: Número de bonos de la posición (por defecto 1)
+        """)
+
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        archivo = st.file_uploader("📂 Cargar cartera", type=["csv", "parquet"], key="archivo_cartera_bonos")
+    with col2:
+        usar_ejemplo = st.checkbox("Usar cartera de ejemplo", value=True, key="ejemplo_cartera_bonos",
+                                   help="Se usa solo mientras no se haya cargado un archivo")
+
+    if archivo is not None:
+        df_cartera = cargar_cartera(archivo)
+    elif usar_ejemplo:
+        df_cartera = pd.DataFrame(cartera_ejemplo())
+    else:
+        st.info("💡 Carga un archivo o activa la cartera de ejemplo para comenzar.")
+        return
+
+    faltantes = [c for c in COLUMNAS_CARTERA if c not in df_cartera.columns]
+    if faltantes:
+        st.error(f"❌ Faltan columnas en el archivo: {', '.join(faltantes)}")
+        return
+
+    # VALORACIÓN VECTORIZADA DE TODA LA CARTERA
+    try:
+        valoracion = valorar_cartera(
+            df_cartera['valor_nominal'].to_numpy(), df_cartera['tasa_cupon'].to_numpy(),
+            df_cartera['frecuencia'].to_numpy(), df_cartera['plazo'].to_numpy(),
+            df_cartera['tea'].to_numpy(),
+            df_cartera['cantidad'].to_numpy() if 'cantidad' in df_cartera.columns else None
+        )
+    except ValueError as e:
+        st.error(f"❌ Cartera no válida: {e}")
+        return
+    total = valoracion['cartera']
+    bonos = valoracion['bonos']
+
+    st.divider()
+    st.subheader(f"📊 Resumen de la Cartera ({len(df_cartera):,} posiciones)")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("💎 Valor Presente Total", formato_moneda(total['valor_presente']))
+    with col2:
+        st.metric("📄 Valor Nominal Total", formato_moneda(total['valor_nominal']))
+    with col3:
+        st.metric("🎯 DV01 de la Cartera", formato_moneda(total['dv01']),
+                  help="Variación del valor de la cartera ante 1 punto básico de todas las TEAs")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("⏳ Duración de Macaulay", f"{total['duracion_macaulay']:.4f} años")
+    with col2:
+        st.metric("📐 Duración Modificada", f"{total['duracion_modificada']:.4f}")
+    with col3:
+        st.metric("🌀 Convexidad", f"{total['convexidad']:.4f}")
+
+    # CALENDARIO AGREGADO DE FLUJOS
+    st.divider()
+    st.subheader("📅 Calendario Agregado de Flujos")
+
+    calendario = valoracion['calendario']
+    df_calendario = pd.DataFrame({
+        'Mes': calendario['mes'],
+        'Año': calendario['anio'].round(2),
+        'Flujo': calendario['flujo'],
+        'Valor Presente': calendario['valor_presente']
+    })
+
+    agrupar_anual = st.radio("Agrupar por", ["Año", "Mes"], horizontal=True, key="agrupar_calendario_bonos") == "Año"
+    if agrupar_anual:
+        df_grafico = (df_calendario.assign(Año=(df_calendario['Mes'] - 1) // 12 + 1)
+                      .groupby('Año', as_index=False)[['Flujo', 'Valor Presente']].sum())
+    else:
+        df_grafico = df_calendario
+
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=df_grafico['Año'],
+        y=df_grafico['Flujo'],
+        name='Flujo Nominal',
+        marker_color='#3B82F6',
+        hovertemplate='<b>Año:</b> %{x}<br><b>Flujo:</b> $%{y:,.2f}<extra></extra>'
+    ))
+    fig.add_trace(go.Bar(
+        x=df_grafico['Año'],
+        y=df_grafico['Valor Presente'],
+        name='Valor Presente',
+        marker_color='#10B981',
+        hovertemplate='<b>Año:</b> %{x}<br><b>VP:</b> $%{y:,.2f}<extra></extra>'
+    ))
+    fig.update_layout(
+        xaxis_title="Año",
+        yaxis_title="Valor (USD)",
+        barmode='group',
+        height=450,
+        template='plotly_white',
+        hovermode='x unified'
+    )
+    st.plotly_chart(fig, use_container_width=True, key="grafico_calendario_cartera")
+
+    # DURACIONES CLAVE DE LA CARTERA
+    st.divider()
+    st.subheader("🔑 Duraciones Clave (Curva de Tasas)")
+    st.markdown("Sensibilidad de la cartera a movimientos de la curva cero local en cada plazo clave, "
+                "con todas las posiciones y desplazamientos evaluados en una sola operación.")
+
+    try:
+        curva = curva_local()
+    except OSError:
+        st.error("❌ No se encontró la tabla de tasas `data/curva_tasas.csv`")
+        krd = None
+    else:
+        krd = duraciones_clave_cartera(
+            curva, df_cartera['valor_nominal'].to_numpy(), df_cartera['tasa_cupon'].to_numpy(),
+            df_cartera['frecuencia'].to_numpy(), df_cartera['plazo'].to_numpy(),
+            df_cartera['cantidad'].to_numpy() if 'cantidad' in df_cartera.columns else None
+        )
+        st.plotly_chart(grafico_duraciones_clave(krd['cartera'], PLAZOS_CLAVE, "Duraciones Clave de la Cartera"),
+                        use_container_width=True, key="grafico_duraciones_clave_cartera")
+
+    # VAR HISTÓRICO
+    st.divider()
+    st.subheader("📉 VaR Histórico")
+    st.markdown("Aplica cada cambio histórico de tasas (`data/historico_tasas.csv`) a la curva actual y "
+                "revalúa toda la cartera en cada escenario.")
+
+    if krd is not None:
+        mostrar_var_historico(curva, df_cartera)
+
+    # INMUNIZACIÓN DE PASIVOS
+    st.divider()
+    st.subheader("🛡️ Inmunización de Pasivos")
+    st.markdown("Elige, entre los bonos cargados, la cartera que iguala el valor presente y la duración de un "
+                "flujo de pasivos con convexidad al menos igual (programa cuadrático sobre todos los candidatos).")
+    mostrar_inmunizacion(df_cartera, bonos)
+
+    # DETALLE POR POSICIÓN
+    st.divider()
+    st.subheader("📋 Detalle por Posición")
+
+    df_detalle = df_cartera.assign(
+        precio=bonos['precio'],
+        valor_posicion=bonos['valor_posicion'],
+        duracion_modificada=bonos['duracion_modificada'],
+        convexidad=bonos['convexidad'],
+        dv01=bonos['dv01']
+    )
+    if krd is not None:
+        df_detalle = df_detalle.assign(**{f"krd_{plazo}a": krd['duraciones'][:, i] for i, plazo in enumerate(PLAZOS_CLAVE)})
+    st.dataframe(df_detalle, use_container_width=True, hide_index=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            label="📥 Descargar Valoración (CSV)",
+            data=df_detalle.to_csv(index=False).encode('utf-8'),
+            file_name=f"valoracion_cartera_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+            mime="text/csv",
+            use_container_width=True,
+            key="descargar_valoracion_cartera"
+        )
+    with col2:
+        st.download_button(
+            label="📥 Descargar Calendario (CSV)",
+            data=df_calendario.to_csv(index=False).encode('utf-8'),
+            file_name=f"calendario_cartera_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+            mime="text/csv",
+            use_container_width=True,
+            key="descargar_calendario_cartera"
+        )
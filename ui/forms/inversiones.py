@@ -1,19 +1,22 @@
-from utils.utils import convertir_tea_a_periodica, formato_moneda
-import pandas as pd 
+from utils.utils import formato_moneda
+from core.proyeccion import (
+    PERIODOS_POR_ANIO,
+    proyectar_cartera,
+    evaluar_escenarios,
+    barrido_edad_jubilacion,
+    edad_minima_para_meta,
+    grilla_tea_plazo
+)
+import numpy as np
+import pandas as pd
 import streamlit as st
 import plotly.graph_objects as go
 from datetime import datetime
 import io
-from utils.email import enviar_email_con_pdf_gmail
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.units import inch
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_LEFT
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from utils.gemini import generar_analisis_inversiones
-
-st.markdown("""
+from core.montecarlo import simular_montecarlo
+
+# Estilos del módulo: se aplican en cada render (no al importar, que ocurre una sola vez por proceso)
+ESTILOS_INVERSIONES = """
 <style>
 /* Contenedor principal de métricas */
 .metric-container .stMetric {
@@ -38,9 +41,10 @@ st.markdown("""
     background-color: #059669 !important;  /* Verde más intenso al pasar el mouse */
 }
 </style>
-""", unsafe_allow_html=True)
+"""
 
 def show_inversiones(nombre):
+    st.markdown(ESTILOS_INVERSIONES, unsafe_allow_html=True)
     st.divider()
     st.markdown("<br><h2>📈 Inversiones</h2>"
                 "Calcula y vea cómo crece su capital en dólares según sus aportes e inversiones para el futuro."
@@ -135,55 +139,16 @@ def show_inversiones(nombre):
         st.warning("⚠️ Debes ingresar un monto inicial o un aporte periódico.")
     else:
         # Cálculos
-        periodos_por_anio = {'Mensual': 12, 'Bimestral': 6, 'Trimestral': 4, 'Cuatrimestral': 3, 'Semestral': 2, 'Anual': 1}
-        num_periodos = periodos_por_anio[frecuencia]
+        num_periodos = PERIODOS_POR_ANIO[frecuencia]
         total_periodos = plazo_anios * num_periodos
-        tasa_periodica = convertir_tea_a_periodica(tea_cartera, frecuencia)
-        
-        # Simulación período a período
-        saldo = monto_inicial
-        saldo_inicial = monto_inicial
-        datos = []
-        
-        datos.append({
-            'Periodo': 0,
-            'Edad': edad_actual,
-            'Saldo Inicial': monto_inicial,
-            'Intereses': 0,
-            'Aporte': 0,
-            'Saldo Final': monto_inicial,
-            'Aportes Acumulados': monto_inicial
-        })
-
-        for i in range(1, total_periodos + 1):
-            # valor futuro del monto inicial
-            vf_inicial = saldo * (1 + tasa_periodica)**(i)
-
-            # valor futuro de los aportes periodicos
-            vf_aportes = aporte_periodico * ((1 + tasa_periodica)**(i) - 1) / tasa_periodica
-
-            # ingresos totales
-            saldo_final = vf_inicial + vf_aportes
-
-            # costos totales
-            aporte_acumulado = saldo + (aporte_periodico * i)
-
-            # Intereses = Saldo final - aportes acumulados
-            intereses = saldo_final - aporte_acumulado
-
-            datos.append({
-                'Periodo': i,
-                'Edad': edad_actual + i // num_periodos,
-                'Saldo Inicial': round(saldo_inicial, 2),
-                'Intereses': round(intereses, 2),
-                'Aporte': round(aporte_periodico, 2),
-                'Saldo Final': round(saldo_final, 2),
-                'Aportes Acumulados': round(aporte_acumulado, 2)
-            })
-        
-        df_cartera = pd.DataFrame(datos)
 
-        costos_totales = saldo + (aporte_periodico * total_periodos)
+        # Proyección completa del fondo (todos los períodos en una sola pasada)
+        proyeccion = proyectar_cartera(monto_inicial, aporte_periodico, tea_cartera, frecuencia, plazo_anios, edad_actual)
+        saldo_final = float(proyeccion['Saldo Final'][-1])
+
+        df_cartera = pd.DataFrame(proyeccion).round(2)
+
+        costos_totales = monto_inicial + (aporte_periodico * total_periodos)
         ganancia_total = saldo_final - costos_totales
         impuesto = ganancia_total*valor_impuesto
 
@@ -326,6 +291,7 @@ def show_inversiones(nombre):
                     'cobro_mensual_bruto': dividendo_bruto_anual if tipo_retiro == 'Pensión Mensual' else None,
                 }
                 
+                from utils.gemini import generar_analisis_inversiones
                 analisis = generar_analisis_inversiones(datos_analisis)
                 
                 # Mostrar análisis en un acordeón
@@ -384,6 +350,13 @@ def show_inversiones(nombre):
         st.plotly_chart(fig, use_container_width=True)
 
 
+        # Simulación estocástica
+        st.divider()
+        st.subheader("🎲 Simulación Monte Carlo")
+        with st.expander("Simular rendimientos variables en lugar de una TEA constante", expanded=False):
+            mostrar_montecarlo(monto_inicial, aporte_periodico, tea_cartera, frecuencia, edad_actual, plazo_anios, saldo_final)
+
+
         st.divider()
 
         st.subheader("🔄 Comparación de Escenarios")
@@ -391,7 +364,9 @@ def show_inversiones(nombre):
             "Deseo comparar",
             [
                 "Comparar con otra edad de jubilación",
-                "Comparar con otra Tasa Efectiva Anual (%)"
+                "Comparar con otra Tasa Efectiva Anual (%)",
+                "Curva completa por edad de jubilación",
+                "Mapa de calor TEA × plazo"
             ], horizontal=True
         )
 
@@ -410,7 +385,7 @@ def show_inversiones(nombre):
                     min_value=edad_actual+1, max_value=100, step=1
                 )
 
-        else:
+        elif comparar == "Comparar con otra Tasa Efectiva Anual (%)":
             col1, col2 = st.columns(2)
             with col1:
                 tasa_1 = st.number_input(
@@ -424,171 +399,47 @@ def show_inversiones(nombre):
                     min_value=1.0, max_value=50.0, value=8.0, step=0.1
                 )
 
-
-
-        def simulacion_calcular_cobroTotal(monto_inicial, num_periodos, edad_jubilacion, edad_actual, valor_impuesto, aporte_periodico, tea_cartera, frecuencia):
-            plazo_anios = edad_jubilacion - edad_actual
-            total_periodos = plazo_anios * num_periodos
-            tasa_periodica = convertir_tea_a_periodica(tea_cartera, frecuencia)
-            saldo = monto_inicial
-            saldo_final = monto_inicial
-
-            datos = []
-        
-            datos.append({
-                'Periodo': 0,
-                'Edad': edad_actual,
-                'Saldo Inicial': monto_inicial,
-                'Intereses': 0,
-                'Aporte': 0,
-                'Saldo Final': monto_inicial,
-                'Aportes Acumulados': monto_inicial
-            })
-
-
-            for i in range(1, total_periodos + 1):
-
-                vf_inicial = saldo * (1 + tasa_periodica) ** i
-
-                vf_aportes = aporte_periodico * ((1 + tasa_periodica) ** i - 1) / tasa_periodica
-
-                # ingresos totales
-                saldo_final = vf_inicial + vf_aportes
-
-            # Cálculos finales de impuestos y métricas
-            costos_totales = saldo + (aporte_periodico * total_periodos)
-            ganancia_total = saldo_final - costos_totales
-            impuesto = ganancia_total * valor_impuesto
-            cobro_total = ganancia_total - impuesto
-
-            return cobro_total
-        
-
-
-        def simulacion_calcular_pensionMensual(monto_inicial, num_periodos, edad_jubilacion, edad_actual, valor_impuesto, aporte_periodico, tea_cartera, frecuencia, tea_retiro):
-            plazo_anios = edad_jubilacion - edad_actual
-            total_periodos = plazo_anios * num_periodos
-            tasa_periodica = convertir_tea_a_periodica(tea_cartera, frecuencia)
-            saldo = monto_inicial
-            saldo_final = monto_inicial
-
-            datos = []
-        
-            datos.append({
-                'Periodo': 0,
-                'Edad': edad_actual,
-                'Saldo Inicial': monto_inicial,
-                'Intereses': 0,
-                'Aporte': 0,
-                'Saldo Final': monto_inicial,
-                'Aportes Acumulados': monto_inicial
-            })
-
-
-            for i in range(1, total_periodos + 1):
-
-                vf_inicial = saldo * (1 + tasa_periodica) ** i
-
-                vf_aportes = aporte_periodico * ((1 + tasa_periodica) ** i - 1) / tasa_periodica
-
-                # ingresos totales
-                saldo_final = vf_inicial + vf_aportes
-
-
-            tasa_cobro_mensual = 0.5 * (tea_retiro/100)
-            dividendo_bruto_anual = saldo_final * tasa_cobro_mensual
-            dividendos_neto_anual = dividendo_bruto_anual - dividendo_bruto_anual*valor_impuesto
-            pension_mensual = dividendos_neto_anual / 12
-
-            return pension_mensual
-
-
-
         # Mostrar resultados lado a lado
         st.divider()
         st.markdown("### 📈 Resultados comparativos")
 
-        if comparar == "Comparar con otra edad de jubilación":
-            if tipo_retiro == "Cobro total":
-                cobro_total_1 = simulacion_calcular_cobroTotal(monto_inicial, num_periodos, edad_comp_1, edad_actual, valor_impuesto, aporte_periodico, tea_cartera, frecuencia)
-
-                cobro_total_2 = simulacion_calcular_cobroTotal(monto_inicial, num_periodos, edad_comp_2, edad_actual, valor_impuesto, aporte_periodico, tea_cartera, frecuencia)
-
-                c1, c2 = st.columns(2)
-                with c1:
-                    st.markdown(f"**Opción A**")
-                    st.metric(" Cobro total a retirar", formato_moneda(cobro_total_1))
+        if comparar == "Curva completa por edad de jubilación":
+            mostrar_curva_edad_jubilacion(monto_inicial, aporte_periodico, tea_cartera, frecuencia, edad_actual,
+                                          plazo_anios, valor_impuesto, tipo_retiro, tea_retiro)
 
-                with c2:
-                    st.markdown(f"**Opción B**")
-                    st.metric(" Cobro total a retirar", formato_moneda(cobro_total_2))
-                    
-                # Comparación simple: cuál conviene más
-                mejor = "A" if cobro_total_1 > cobro_total_2 else "B"
-                diferencia = abs(cobro_total_1 - cobro_total_2)
-                st.markdown(f"**Conclusión:** La mejor opción es **{mejor}** — Diferencia neta: {formato_moneda(diferencia)}")
+        elif comparar == "Mapa de calor TEA × plazo":
+            mostrar_mapa_tea_plazo(monto_inicial, aporte_periodico, tea_cartera, frecuencia, plazo_anios, valor_impuesto)
 
+        else:
+            # Ambas opciones se evalúan en una sola llamada vectorizada
+            if comparar == "Comparar con otra edad de jubilación":
+                escenarios = evaluar_escenarios(monto_inicial, aporte_periodico, tea_cartera, frecuencia, edad_actual,
+                                                np.array([edad_comp_1, edad_comp_2]), valor_impuesto, tea_retiro)
             else:
-                pension_mensual_1 = simulacion_calcular_pensionMensual(monto_inicial, num_periodos, edad_comp_1, edad_actual, valor_impuesto, aporte_periodico, tea_cartera, frecuencia, tea_retiro)
-
-                pension_mensual_2 = simulacion_calcular_pensionMensual(monto_inicial, num_periodos, edad_comp_2, edad_actual, valor_impuesto, aporte_periodico, tea_cartera, frecuencia, tea_retiro)
-
-
-                c1, c2 = st.columns(2)
-                with c1:
-                    st.markdown(f"**Opción A**")
-                    st.metric("🎁🤑 Pensión mensual a cobrar", formato_moneda(pension_mensual_1))
-
-                with c2:
-                    st.markdown(f"**Opción B**")
-                    st.metric("🎁🤑 Pensión mensual a cobrar", formato_moneda(pension_mensual_2))
-
-                # Comparación simple: cuál conviene más
-                mejor = "A" if pension_mensual_1 > pension_mensual_2 else "B"
-                diferencia = abs(pension_mensual_1 - pension_mensual_2)
-                st.markdown(f"**Conclusión:** La mejor opción es **{mejor}** — Diferencia neta: {formato_moneda(diferencia)}")
-
+                escenarios = evaluar_escenarios(monto_inicial, aporte_periodico, np.array([tasa_1, tasa_2]), frecuencia, edad_actual,
+                                                edad_actual + plazo_anios, valor_impuesto, tea_retiro)
 
-        else:
             if tipo_retiro == "Cobro total":
-                cobro_total_3 = simulacion_calcular_cobroTotal(monto_inicial, num_periodos, edad_actual + plazo_anios, edad_actual, valor_impuesto, aporte_periodico, tasa_1, frecuencia)
-
-                cobro_total_4 = simulacion_calcular_cobroTotal(monto_inicial, num_periodos, edad_actual + plazo_anios, edad_actual, valor_impuesto, aporte_periodico, tasa_2, frecuencia)
-
-
-                c1, c2 = st.columns(2)
-                with c1:
-                    st.markdown(f"**Opción A**")
-                    st.metric("🎁🤑 Cobro total a retirar", formato_moneda(cobro_total_3))
-
-                with c2:
-                    st.markdown(f"**Opción B**")
-                    st.metric("🎁🤑 Cobro total a retirar", formato_moneda(cobro_total_4))
-
-                # Comparación simple: cuál conviene más
-                mejor = "A" if cobro_total_3 > cobro_total_4 else "B"
-                diferencia = abs(cobro_total_3 - cobro_total_4)
-                st.markdown(f"**Conclusión:** La mejor opción es **{mejor}** — Diferencia neta: {formato_moneda(diferencia)}")
-
+                etiqueta = " Cobro total a retirar"
+                valor_a, valor_b = escenarios['cobro_total']
             else:
-                pension_mensual_3 = simulacion_calcular_pensionMensual(monto_inicial, num_periodos, edad_actual + plazo_anios, edad_actual, valor_impuesto, aporte_periodico, tasa_1, frecuencia, tea_retiro)
+                etiqueta = "🎁🤑 Pensión mensual a cobrar"
+                valor_a, valor_b = escenarios['pension_mensual']
 
-                pension_mensual_4 = simulacion_calcular_pensionMensual(monto_inicial, num_periodos, edad_actual + plazo_anios, edad_actual, valor_impuesto, aporte_periodico, tasa_2, frecuencia, tea_retiro)
+            c1, c2 = st.columns(2)
+            with c1:
+                st.markdown(f"**Opción A**")
+                st.metric(etiqueta, formato_moneda(valor_a))
 
-                c1, c2 = st.columns(2)
-                with c1:
-                    st.markdown(f"**Opción A**")
-                    st.metric("🎁🤑 Pensión mensual a cobrar", formato_moneda(pension_mensual_3))
+            with c2:
+                st.markdown(f"**Opción B**")
+                st.metric(etiqueta, formato_moneda(valor_b))
 
-                with c2:
-                    st.markdown(f"**Opción B**")
-                    st.metric("🎁🤑 Pensión mensual a cobrar", formato_moneda(pension_mensual_4))
+            # Comparación simple: cuál conviene más
+            mejor = "A" if valor_a > valor_b else "B"
+            diferencia = abs(valor_a - valor_b)
+            st.markdown(f"**Conclusión:** La mejor opción es **{mejor}** — Diferencia neta: {formato_moneda(diferencia)}")
 
-                # Comparación simple: cuál conviene más
-                mejor = "A" if pension_mensual_3 > pension_mensual_4 else "B"
-                diferencia = abs(pension_mensual_3 - pension_mensual_3)
-                st.markdown(f"**Conclusión:** La mejor opción es **{mejor}** — Diferencia neta: {formato_moneda(diferencia)}")
-            
         st.divider()
 
         d1, d2, d3 = st.columns(3)
@@ -622,6 +473,7 @@ def show_inversiones(nombre):
                     pdf_buffer_email = io.BytesIO(buffer_pdf.getvalue())
 
                     with st.spinner("📤 Enviando reporte..."):
+                        from utils.email import enviar_email_con_pdf_gmail
                         exito, resultado = enviar_email_con_pdf_gmail(
                             email_dest,
                             nombre_dest,
@@ -639,6 +491,205 @@ def show_inversiones(nombre):
 
 
 
+def mostrar_montecarlo(monto_inicial, aporte_periodico, tea_cartera, frecuencia, edad_actual, plazo_anios, saldo_final):
+    """Gráfico de abanico P5/P50/P95 y probabilidad de alcanzar una meta con rendimientos aleatorios"""
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        volatilidad = st.number_input(
+            "Volatilidad anual (%)",
+            min_value=0.0, max_value=60.0, value=15.0, step=0.5,
+            help="Desviación estándar anual de los rendimientos (ej: 15% para renta variable diversificada)"
+        )
+    with col2:
+        num_trayectorias = st.number_input(
+            "Número de trayectorias",
+            min_value=1000, max_value=100000, value=10000, step=1000
+        )
+    with col3:
+        semilla = st.number_input(
+            "Semilla aleatoria",
+            min_value=0, value=42, step=1,
+            help="Con la misma semilla se obtienen los mismos resultados"
+        )
+    with col4:
+        meta = st.number_input(
+            "Saldo meta (USD)",
+            min_value=0.0, value=round(saldo_final, -3), step=1000.0
+        )
+
+    if not st.checkbox("▶️ Ejecutar simulación", key="ejecutar_montecarlo"):
+        return
+
+    with st.spinner("🎲 Simulando trayectorias..."):
+        simulacion = simular_montecarlo(
+            monto_inicial, aporte_periodico, tea_cartera, volatilidad, frecuencia, plazo_anios,
+            num_trayectorias=int(num_trayectorias), semilla=int(semilla), meta=meta
+        )
+
+    edades = edad_actual + simulacion['anios']
+    p5, p50, p95 = (simulacion['percentiles'][p] for p in (5, 50, 95))
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Escenario pesimista (P5)", formato_moneda(p5[-1]))
+    with col2:
+        st.metric("Escenario central (P50)", formato_moneda(p50[-1]))
+    with col3:
+        st.metric("Escenario optimista (P95)", formato_moneda(p95[-1]))
+    with col4:
+        st.metric("Probabilidad de alcanzar la meta", f"{simulacion['prob_meta'] * 100:.1f}%")
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=edades, y=p95,
+        mode='lines',
+        name='P95',
+        line=dict(color='rgba(16, 185, 129, 0.4)', width=1)
+    ))
+    fig.add_trace(go.Scatter(
+        x=edades, y=p5,
+        mode='lines',
+        name='P5',
+        fill='tonexty',
+        fillcolor='rgba(16, 185, 129, 0.2)',
+        line=dict(color='rgba(16, 185, 129, 0.4)', width=1)
+    ))
+    fig.add_trace(go.Scatter(
+        x=edades, y=p50,
+        mode='lines',
+        name='Mediana (P50)',
+        line=dict(color='#10B981', width=3)
+    ))
+    fig.add_hline(y=meta, line_dash="dash", line_color="red", annotation_text="Meta")
+
+    fig.update_layout(
+        xaxis_title="Edad (años)",
+        yaxis_title="Saldo de la cartera (USD)",
+        hovermode='x unified',
+        height=450,
+        template='plotly_white'
+    )
+
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption(f"💡 **Interpretación:** En el 90% de las {int(num_trayectorias):,} trayectorias simuladas el saldo final queda "
+               f"entre {formato_moneda(p5[-1])} y {formato_moneda(p95[-1])}. La TEA ingresada se usa como rendimiento medio.")
+
+
+def mostrar_curva_edad_jubilacion(monto_inicial, aporte_periodico, tea_cartera, frecuencia, edad_actual,
+                                  plazo_anios, valor_impuesto, tipo_retiro, tea_retiro):
+    """Grafica el cobro total y la pensión mensual para todas las edades de jubilación posibles"""
+    barrido = barrido_edad_jubilacion(monto_inicial, aporte_periodico, tea_cartera, frecuencia, edad_actual,
+                                      valor_impuesto, tea_retiro)
+    edades = barrido['edad_jubilacion']
+    if len(edades) == 0:
+        st.info(f"💡 No hay edades de jubilación posibles después de los {edad_actual} años para graficar.")
+        return
+
+    if tipo_retiro == "Cobro total":
+        clave, nombre_serie, color = 'cobro_total', 'Cobro total a retirar', '#10B981'
+    else:
+        clave, nombre_serie, color = 'pension_mensual', 'Pensión mensual a cobrar', '#6366f1'
+
+    meta = st.number_input(
+        f"Meta de {nombre_serie.lower()} (USD)",
+        min_value=0.0, value=0.0, step=1000.0,
+        help="Opcional: muestra la edad mínima de jubilación con la que se alcanza esta meta",
+        key="meta_curva_jubilacion"
+    )
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=edades,
+        y=barrido[clave],
+        mode='lines',
+        name=nombre_serie,
+        line=dict(color=color, width=3),
+        hovertemplate='<b>Edad:</b> %{x}<br><b>Valor:</b> $%{y:,.2f}<extra></extra>'
+    ))
+
+    if tipo_retiro == "Cobro total" and 'pension_mensual' in barrido:
+        fig.add_trace(go.Scatter(
+            x=edades,
+            y=barrido['pension_mensual'],
+            mode='lines',
+            name='Pensión mensual a cobrar',
+            line=dict(color='#6366f1', width=2, dash='dot'),
+            yaxis='y2'
+        ))
+    elif tipo_retiro != "Cobro total":
+        fig.add_trace(go.Scatter(
+            x=edades,
+            y=barrido['cobro_total'],
+            mode='lines',
+            name='Cobro total a retirar',
+            line=dict(color='#10B981', width=2, dash='dot'),
+            yaxis='y2'
+        ))
+
+    fig.add_vline(
+        x=edad_actual + plazo_anios,
+        line_dash="dot",
+        line_color="orange",
+        annotation_text="Plan actual"
+    )
+
+    if meta > 0:
+        fig.add_hline(y=meta, line_dash="dash", line_color="red", annotation_text="Meta")
+
+    fig.update_layout(
+        xaxis_title="Edad de jubilación (años)",
+        yaxis_title=f"{nombre_serie} (USD)",
+        yaxis2=dict(overlaying='y', side='right', showgrid=False),
+        hovermode='x unified',
+        height=450,
+        template='plotly_white'
+    )
+
+    st.plotly_chart(fig, use_container_width=True)
+
+    if meta > 0:
+        edad_meta = edad_minima_para_meta(edades, barrido[clave], meta)
+        if edad_meta is None:
+            st.warning(f"⚠️ Ninguna edad de jubilación hasta los {edades[-1]} años alcanza la meta de {formato_moneda(meta)}")
+        else:
+            st.markdown(f"**Conclusión:** La meta de {formato_moneda(meta)} se alcanza jubilándose a partir de los **{edad_meta} años**")
+
+
+def mostrar_mapa_tea_plazo(monto_inicial, aporte_periodico, tea_cartera, frecuencia, plazo_anios, valor_impuesto):
+    """Mapa de calor del cobro total neto para TEAs de 1% a 50% y plazos de 1 a 70 años"""
+    teas, plazos, cobros = grilla_tea_plazo(monto_inicial, aporte_periodico, frecuencia, valor_impuesto)
+
+    fig = go.Figure(go.Heatmap(
+        x=plazos,
+        y=teas,
+        z=cobros,
+        colorscale='Viridis',
+        colorbar=dict(title="Cobro total (USD)"),
+        hovertemplate='<b>Plazo:</b> %{x} años<br><b>TEA:</b> %{y:.1f}%<br><b>Cobro total:</b> $%{z:,.2f}<extra></extra>'
+    ))
+
+    # Punto actual
+    fig.add_trace(go.Scatter(
+        x=[plazo_anios],
+        y=[tea_cartera],
+        mode='markers',
+        name='Plan actual',
+        marker=dict(color='orange', size=12, symbol='star'),
+        hovertemplate='<b>Plan actual</b><extra></extra>'
+    ))
+
+    fig.update_layout(
+        xaxis_title="Plazo (años)",
+        yaxis_title="Tasa Efectiva Anual (%)",
+        height=550,
+        template='plotly_white'
+    )
+
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption("💡 **Interpretación:** Cada celda muestra el cobro total neto de impuestos para una combinación de TEA y plazo. "
+               "La estrella marca los parámetros ingresados.")
+
+
 def generar_pdf_inversion(
     monto_inicial: float,
     aporte_periodico: float,
@@ -658,6 +709,13 @@ def generar_pdf_inversion(
     df_cartera=None,
     autor: str = "Calculadora de Inversiones Financieras"
 ) -> io.BytesIO:
+    # reportlab se importa al generar el primer PDF, no al cargar la aplicación
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_LEFT
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 
     buffer = io.BytesIO()
     doc = SimpleDocTemplate(
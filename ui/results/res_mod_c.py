@@ -3,7 +3,7 @@ import plotly.graph_objects as go
 import pandas as pd
 from datetime import datetime
 from utils.utils import formato_moneda
-from utils.gemini import generar_analisis_bono
+from core.valoracion_bonos import precio_bono_tea, curva_sensibilidad
 
 
 def mostrar_metricas_bono(valor_presente_total, valor_nominal, cupon):
@@ -33,6 +33,27 @@ def mostrar_metricas_bono(valor_presente_total, valor_nominal, cupon):
         st.metric("Tipo de Bono", tipo, delta=formato_moneda(diferencia))
 
 
+def mostrar_metricas_riesgo(riesgo):
+    """Muestra la duración, duración modificada, convexidad y DV01 del bono"""
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric("⏳ Duración de Macaulay", f"{riesgo['duracion_macaulay']:.4f} años",
+                  help="Plazo promedio ponderado de los flujos descontados")
+
+    with col2:
+        st.metric("📐 Duración Modificada", f"{riesgo['duracion_modificada']:.4f}",
+                  help="Variación porcentual aproximada del precio ante un cambio de 1% en la TEA")
+
+    with col3:
+        st.metric("🌀 Convexidad", f"{riesgo['convexidad']:.4f}",
+                  help="Curvatura de la relación precio-tasa (corrección de segundo orden)")
+
+    with col4:
+        st.metric("🎯 DV01", formato_moneda(riesgo['dv01']),
+                  help="Variación del precio ante 1 punto básico (0.01%) de la TEA")
+
+
 def mostrar_interpretacion(valor_presente_total, valor_nominal, tea_bono, tasa_cupon):
     """Muestra la interpretación del resultado de valoración"""
     diferencia = abs(valor_presente_total - valor_nominal)
@@ -170,30 +191,11 @@ def comparacion_escenarios(tasa_escenario1, tasa_escenario2, tea_bono,
                            valor_nominal, cupon, total_periodos_bono,
                            frecuencia_bono, convertir_tea_a_periodica):
     """Muestra la comparación de escenarios con diferentes tasas de forma visual"""
-    from utils.utils import convertir_tea_a_periodica
-
-    # Calcular escenarios
-    tasa_esc1_periodica = convertir_tea_a_periodica(tasa_escenario1, frecuencia_bono)
-    tasa_esc2_periodica = convertir_tea_a_periodica(tasa_escenario2, frecuencia_bono)
-    tasa_actual_periodica = convertir_tea_a_periodica(tea_bono, frecuencia_bono)
-
-    vp_esc1 = sum([
-        (cupon if i < total_periodos_bono else cupon + valor_nominal) /
-        ((1 + tasa_esc1_periodica) ** i)
-        for i in range(1, total_periodos_bono + 1)
-    ])
-
-    vp_esc2 = sum([
-        (cupon if i < total_periodos_bono else cupon + valor_nominal) /
-        ((1 + tasa_esc2_periodica) ** i)
-        for i in range(1, total_periodos_bono + 1)
-    ])
-
-    vp_actual = sum([
-        (cupon if i < total_periodos_bono else cupon + valor_nominal) /
-        ((1 + tasa_actual_periodica) ** i)
-        for i in range(1, total_periodos_bono + 1)
-    ])
+    # Calcular los tres escenarios en una sola llamada vectorizada
+    vp_esc1, vp_actual, vp_esc2 = precio_bono_tea(
+        valor_nominal, cupon, total_periodos_bono, frecuencia_bono,
+        [tasa_escenario1, tea_bono, tasa_escenario2]
+    )
 
     # Mostrar comparación en columnas
     st.markdown("### Comparación de Valores Presentes")
@@ -231,33 +233,36 @@ def comparacion_escenarios(tasa_escenario1, tasa_escenario2, tea_bono,
 
 
 def grafico_sensibilidad(valor_nominal, cupon, total_periodos_bono,
-                         frecuencia_bono, tea_bono, convertir_tea_a_periodica):
-    """Genera el gráfico de análisis de sensibilidad"""
-    from utils.utils import convertir_tea_a_periodica
-
-    # Gráfica de sensibilidad
-    tasas_rango = [i / 10 for i in range(10, 201, 5)]  # 1% a 20%
-    valores_sensibilidad = []
-
-    for tasa in tasas_rango:
-        tasa_per = convertir_tea_a_periodica(tasa, frecuencia_bono)
-        vp = sum([
-            (cupon if i < total_periodos_bono else cupon + valor_nominal) /
-            ((1 + tasa_per) ** i)
-            for i in range(1, total_periodos_bono + 1)
-        ])
-        valores_sensibilidad.append(vp)
+                         frecuencia_bono, tea_bono, convertir_tea_a_periodica,
+                         tasa_min=1.0, tasa_max=20.0):
+    """Genera el gráfico de análisis de sensibilidad con las aproximaciones de duración y convexidad"""
+    sensibilidad = curva_sensibilidad(valor_nominal, cupon, total_periodos_bono, frecuencia_bono,
+                                      tea_bono, tasa_min, tasa_max)
 
     fig = go.Figure()
 
     fig.add_trace(go.Scatter(
-        x=tasas_rango,
-        y=valores_sensibilidad,
+        x=sensibilidad['tasas'],
+        y=sensibilidad['precios'],
         mode='lines',
         name='Valor del Bono',
-        line=dict(color='#6366f1', width=3),
-        fill='tozeroy',
-        fillcolor='rgba(99, 102, 241, 0.2)'
+        line=dict(color='#6366f1', width=3)
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=sensibilidad['tasas'],
+        y=sensibilidad['aprox_duracion'],
+        mode='lines',
+        name='Aproximación por Duración',
+        line=dict(color='#f59e0b', width=2, dash='dash')
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=sensibilidad['tasas'],
+        y=sensibilidad['aprox_convexidad'],
+        mode='lines',
+        name='Duración + Convexidad',
+        line=dict(color='#ec4899', width=2, dash='dot')
     ))
 
     fig.add_hline(
@@ -285,11 +290,36 @@ def grafico_sensibilidad(valor_nominal, cupon, total_periodos_bono,
     return fig
 
 
+def grafico_duraciones_clave(duraciones, plazos_clave, titulo="Duraciones Clave"):
+    """Genera el gráfico de barras de duraciones clave por plazo de la curva"""
+    etiquetas = [f"{plazo}a" for plazo in plazos_clave]
+
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=etiquetas,
+        y=duraciones,
+        marker_color='#6366f1',
+        text=[f"{d:.3f}" for d in duraciones],
+        textposition='outside',
+        hovertemplate='<b>Plazo clave:</b> %{x}<br><b>Duración:</b> %{y:.4f}<extra></extra>'
+    ))
+
+    fig.update_layout(
+        title=f"{titulo} (suma: {sum(duraciones):.4f})",
+        xaxis_title="Plazo Clave",
+        yaxis_title="Duración (variación % del precio por 1% de tasa)",
+        height=400,
+        template='plotly_white'
+    )
+
+    return fig
+
+
 def mostrar_resultados_completos(valor_nominal, tasa_cupon, frecuencia_bono,
                                  plazo_bono, tea_bono, df_flujos,
                                  valor_presente_total, cupon,
                                  tasa_cupon_periodica, tasa_descuento_periodica,
-                                 num_periodos_bono):
+                                 num_periodos_bono, riesgo=None):
     """Función principal que muestra todos los resultados de forma concisa"""
     total_periodos_bono = plazo_bono * num_periodos_bono
 
@@ -297,6 +327,11 @@ def mostrar_resultados_completos(valor_nominal, tasa_cupon, frecuencia_bono,
     st.subheader("📊 Resultados de la Valoración")
     mostrar_metricas_bono(valor_presente_total, valor_nominal, cupon)
 
+    # Medidas de riesgo de tasa
+    if riesgo is not None:
+        st.subheader("📐 Medidas de Riesgo de Tasa de Interés")
+        mostrar_metricas_riesgo(riesgo)
+
     # Interpretación
     st.divider()
     mostrar_interpretacion(valor_presente_total, valor_nominal, tea_bono, tasa_cupon)
@@ -334,7 +369,15 @@ def mostrar_resultados_completos(valor_nominal, tasa_cupon, frecuencia_bono,
                 'valor_presente': valor_presente_total,
                 'cupon_periodico': cupon
             }
-
+            if riesgo is not None:
+                datos_analisis_bono.update({
+                    'duracion_macaulay': riesgo['duracion_macaulay'],
+                    'duracion_modificada': riesgo['duracion_modificada'],
+                    'convexidad': riesgo['convexidad'],
+                    'dv01': riesgo['dv01']
+                })
+
+            from utils.gemini import generar_analisis_bono
             analisis_bono = generar_analisis_bono(datos_analisis_bono)
 
             # Mostrar análisis en un acordeón
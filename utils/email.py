@@ -1,9 +1,4 @@
 import base64
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from email.mime.base import MIMEBase
-from email import encoders
 from datetime import datetime
 import streamlit as st
 
@@ -130,6 +125,13 @@ def enviar_email_con_pdf_gmail(email_destino, nombre_usuario, pdf_buffer,
     Returns:
         tuple: (exito: bool, mensaje: str)
     """
+    # smtplib y email.mime solo se cargan al enviar el primer correo
+    import smtplib
+    from email.mime.text import MIMEText
+    from email.mime.multipart import MIMEMultipart
+    from email.mime.base import MIMEBase
+    from email import encoders
+
     try:
         # Obtener credenciales desde Streamlit secrets
         gmail_user = st.secrets["gmail"]["user"]
@@ -185,4 +187,4 @@ def enviar_email_con_pdf_gmail(email_destino, nombre_usuario, pdf_buffer,
     except smtplib.SMTPException as e:
         return False, f"Error SMTP: {str(e)}"
     except Exception as e:
-        return False, f"Error inesperado: {str(e)}"
\ No newline at end of file
+        return False, f"Error inesperado: {str(e)}"
@@ -1,5 +1,4 @@
 from datetime import datetime
-import google.generativeai as genai
 import os
 import streamlit as st
 
@@ -7,6 +6,9 @@ import streamlit as st
 def configurar_gemini():
     """Configura la API de Gemini"""
     try:
+        # google.generativeai tarda cerca de un segundo en importarse: solo se carga al pedir un análisis
+        import google.generativeai as genai
+
         api_key = st.secrets["GEMINI_API_KEY"]
         if not api_key:
             st.error("🔑 API key de Gemini no encontrada. Configura la variable de entorno GEMINI_API_KEY")
@@ -143,6 +145,7 @@ Analizarás la valoración de bonos y proporcionarás recomendaciones de inversi
 - Valor Nominal
 - Cupón Periódico
 - Tipo de Bono (Descuento/Prima/Par)
+- Duración de Macaulay, Duración Modificada, Convexidad y DV01
 
 **ANÁLISIS REQUERIDO:**
 
@@ -163,7 +166,7 @@ Analizarás la valoración de bonos y proporcionarás recomendaciones de inversi
 
 4. **SENSIBILIDAD Y RIESGO:**
    - Sensibilidad a cambios en tasas de interés
-   - Duración implícita del bono
+   - Interpretación de la duración, convexidad y DV01 calculados
    - Riesgo de reinversión de cupones
 
 5. **RECOMENDACIONES ESTRATÉGICAS:**
@@ -217,6 +220,10 @@ def generar_analisis_bono(datos_bono):
 - 📄 Valor Nominal: ${datos_bono['valor_nominal']:,.2f}
 - 💰 Cupón Periódico: ${datos_bono['cupon_periodico']:,.2f}
 - 🔻 Tipo de Bono: {tipo_bono_detalle}
+{f"- ⏳ Duración de Macaulay: {datos_bono['duracion_macaulay']:.4f} años" if datos_bono.get('duracion_macaulay') is not None else ""}
+{f"- 📐 Duración Modificada: {datos_bono['duracion_modificada']:.4f}" if datos_bono.get('duracion_modificada') is not None else ""}
+{f"- 🌀 Convexidad: {datos_bono['convexidad']:.4f}" if datos_bono.get('convexidad') is not None else ""}
+{f"- 🎯 DV01: ${datos_bono['dv01']:,.4f} por punto básico" if datos_bono.get('dv01') is not None else ""}
 
 **MÉTRICAS CALCULADAS:**
 - Diferencia Valor: ${datos_bono['valor_presente'] - datos_bono['valor_nominal']:+.2f}
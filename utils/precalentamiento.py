@@ -0,0 +1,141 @@
+import os
+import sys
+import threading
+import time
+
+# Valores por defecto de los formularios (ui/forms/inversiones.py y ui/forms/bonos.py)
+ESCENARIO_INVERSIONES = {
+    'edad_actual': 30, 'monto_inicial': 10000.0, 'aporte_periodico': 500.0, 'tea_cartera': 8.0,
+    'frecuencia': 'Mensual', 'plazo_anios': 30, 'tipo_impuesto': 'Bolsa Local (5%)', 'valor_impuesto': 0.05
+}
+ESCENARIO_BONOS = {
+    'valor_nominal': 1000.0, 'tasa_cupon': 6.0, 'frecuencia_bono': 'Semestral', 'plazo_bono': 5, 'tea_bono': 7.0
+}
+
+estado = {'iniciado': False, 'terminado': False, 'pasos': {}, 'errores': {}}
+_candado = threading.Lock()
+
+
+def _importar_dependencias():
+    """Carga las librerías pesadas que la interfaz importa de forma diferida"""
+    import pandas
+    import plotly.graph_objects
+    import plotly.io
+    import reportlab.platypus
+    import reportlab.lib.styles
+    import smtplib
+    import email.mime.multipart
+    import google.generativeai
+    import ui.forms.inversiones
+    import ui.forms.bonos
+    import ui.forms.cartera_bonos
+
+
+def _grafico_base():
+    """Construye y serializa una figura con los tipos de traza de la app (inicializa los validadores de plotly)"""
+    import plotly.graph_objects as go
+    import plotly.io as pio
+
+    fig = go.Figure([go.Scatter(x=[0, 1], y=[0, 1], mode='lines+markers'), go.Bar(x=[0, 1], y=[1, 2]),
+                     go.Histogram(x=[0, 1, 1]), go.Heatmap(z=[[0, 1], [1, 0]])])
+    fig.update_layout(title="Precalentamiento", xaxis_title="x", yaxis_title="y", template='plotly_white', height=300)
+    pio.to_json(fig)
+
+
+def _escenario_inversiones():
+    """Proyección, tabla y PDF del escenario por defecto de show_inversiones"""
+    import pandas as pd
+    from core.proyeccion import PERIODOS_POR_ANIO, proyectar_cartera
+    from ui.forms.inversiones import generar_pdf_inversion
+
+    e = ESCENARIO_INVERSIONES
+    proyeccion = proyectar_cartera(e['monto_inicial'], e['aporte_periodico'], e['tea_cartera'], e['frecuencia'],
+                                   e['plazo_anios'], e['edad_actual'])
+    saldo_final = float(proyeccion['Saldo Final'][-1])
+    df_cartera = pd.DataFrame(proyeccion).round(2)
+    df_cartera.to_csv(index=False)
+
+    costos_totales = e['monto_inicial'] + e['aporte_periodico'] * e['plazo_anios'] * PERIODOS_POR_ANIO[e['frecuencia']]
+    ganancia_total = saldo_final - costos_totales
+    impuesto = ganancia_total * e['valor_impuesto']
+    generar_pdf_inversion(e['monto_inicial'], e['aporte_periodico'], e['edad_actual'], e['plazo_anios'], e['frecuencia'],
+                          e['tea_cartera'], e['tipo_impuesto'], e['valor_impuesto'], 'Cobro total', saldo_final,
+                          costos_totales, ganancia_total, impuesto, cobro_total=ganancia_total - impuesto,
+                          pension_mensual=0, df_cartera=df_cartera)
+
+
+def _escenario_bonos():
+    """Valoración, PDF y datos compartidos (curva, IPC, índice) del escenario por defecto de show_bonos"""
+    from core.curva import curva_local, precio_con_curva
+    from core.bonos_indexados import cargar_ipc
+    from core.flujos_caja import cargar_tabla_indice
+    from ui.forms.bonos import calcular_valoracion_bono, generar_pdf_bonos
+
+    e = ESCENARIO_BONOS
+    resultados = calcular_valoracion_bono(e['valor_nominal'], e['tasa_cupon'], e['frecuencia_bono'],
+                                          e['plazo_bono'], e['tea_bono'])
+    generar_pdf_bonos(e['valor_nominal'], e['tasa_cupon'], e['frecuencia_bono'], e['plazo_bono'], e['tea_bono'],
+                      resultados['df_flujos'], resultados['valor_presente_total'], resultados['cupon'],
+                      resultados['tasa_cupon_periodica'], resultados['tasa_descuento_periodica'], riesgo=resultados)
+
+    # Llena las cachés de curva, factores de descuento, IPC e índice de referencia
+    precio_con_curva(curva_local(), e['valor_nominal'], resultados['cupon'], e['frecuencia_bono'],
+                     resultados['total_periodos_bono'])
+    cargar_ipc()
+    cargar_tabla_indice()
+
+
+def _datos_cartera():
+    """Histórico de tasas del VaR (la primera lectura convierte el CSV a .npy).
+
+    La conversión es atómica y está protegida por un candado en core.var_historico, así que puede
+    coincidir con la primera sesión sin que ninguna lea un archivo a medio escribir.
+    """
+    from core.var_historico import cargar_historico
+    cargar_historico()
+
+
+PASOS = (
+    ('importaciones', _importar_dependencias),
+    ('graficos', _grafico_base),
+    ('inversiones', _escenario_inversiones),
+    ('bonos', _escenario_bonos),
+    ('cartera', _datos_cartera),
+)
+
+
+def precalentar(informar=None):
+    """Ejecuta los pasos de precalentamiento; un paso que falla se registra y no detiene a los demás"""
+    for nombre, paso in PASOS:
+        inicio = time.perf_counter()
+        try:
+            paso()
+            estado['pasos'][nombre] = time.perf_counter() - inicio
+        except Exception as e:
+            estado['errores'][nombre] = repr(e)
+        if informar is not None:
+            detalle = estado['errores'].get(nombre) or f"{estado['pasos'][nombre] * 1000:,.0f} ms"
+            informar(f"🔥 Precalentamiento {nombre}: {detalle}")
+    estado['terminado'] = True
+
+
+def iniciar_precalentamiento(informar=None):
+    """Lanza el precalentamiento en un hilo de fondo, una sola vez por proceso del servidor"""
+    with _candado:
+        if estado['iniciado']:
+            return None
+        estado['iniciado'] = True
+
+    hilo = threading.Thread(target=precalentar, args=(informar,), name='precalentamiento', daemon=True)
+    hilo.start()
+    return hilo
+
+
+def precalentamiento_activado():
+    """El precalentamiento es opcional: se activa con la variable de entorno PRECALENTAR=1"""
+    return os.getenv('PRECALENTAR', '').strip().lower() in ('1', 'true', 'si', 'sí')
+
+
+def informar_consola(mensaje):
+    """Muestra el avance del precalentamiento en la consola del servidor"""
+    print(mensaje, file=sys.stderr)
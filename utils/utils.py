@@ -1,15 +1,8 @@
 import streamlit as st
 
-# Funciones auxiliares
-def convertir_tea_a_periodica(tea, frecuencia):
-    """Convierte TEA a tasa periódica"""
-    periodos = {
-        'Mensual': 30, 'Bimestral': 60, 'Trimestral': 90,
-        'Cuatrimestral': 120, 'Semestral': 180, 'Anual': 360
-    }
-    n = periodos.get(frecuencia, 30)
-    return (1 + tea/100)**(n / 360) - 1
+from core.tasas import convertir_tea_a_periodica
 
+# Funciones auxiliares
 def formato_moneda(valor):
     """Formatea valores en dólares"""
     return f"${valor:,.2f}"